@@ -0,0 +1,79 @@
+"""
+    Compares the memory used by match player rows kept as dicts and as
+    :class:`smite.models.MatchPlayer` models.
+
+    Usage: python benchmarks/models_memory.py [number of matches]
+"""
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from smite.models import Match  # noqa: E402
+
+# Field names of a getmatchdetails row. Most are counters, the rest short strings.
+STRING_FIELDS = ['Entry_Datetime', 'Item_Active_1', 'Item_Active_2', 'Item_Purch_1', 'Item_Purch_2', 'Item_Purch_3',
+                 'Item_Purch_4', 'Item_Purch_5', 'Item_Purch_6', 'Map_Game', 'Reference_Name', 'Region', 'Skin',
+                 'Win_Status', 'name', 'playerName', 'hz_player_name', 'hz_gamer_tag', 'Ban1', 'Ban2', 'Ban3', 'Ban4',
+                 'Ban5', 'Ban6', 'Ban7', 'Ban8', 'Ban9', 'Ban10', 'First_Ban_Side', 'Platform', 'ret_msg']
+NUMBER_FIELDS = ['Account_Level', 'ActiveId1', 'ActiveId2', 'Assists', 'Camps_Cleared', 'Conquest_Losses',
+                 'Conquest_Points', 'Conquest_Tier', 'Conquest_Wins', 'Damage_Bot', 'Damage_Done_In_Hand',
+                 'Damage_Done_Magical', 'Damage_Done_Physical', 'Damage_Mitigated', 'Damage_Player', 'Damage_Taken',
+                 'Damage_Taken_Magical', 'Damage_Taken_Physical', 'Deaths', 'Distance_Traveled', 'Duel_Losses',
+                 'Duel_Points', 'Duel_Tier', 'Duel_Wins', 'Final_Match_Level', 'Gold_Earned', 'Gold_Per_Minute',
+                 'Healing', 'Healing_Bot', 'Healing_Player_Self', 'ItemId1', 'ItemId2', 'ItemId3', 'ItemId4', 'ItemId5',
+                 'ItemId6', 'Joust_Losses', 'Joust_Points', 'Joust_Tier', 'Joust_Wins', 'Killing_Spree',
+                 'Kills_Bot', 'Kills_Double', 'Kills_Fire_Giant', 'Kills_First_Blood', 'Kills_Gold_Fury',
+                 'Kills_Penta', 'Kills_Phoenix', 'Kills_Player', 'Kills_Quadra', 'Kills_Siege_Juggernaut',
+                 'Kills_Single', 'Kills_Triple', 'Kills_Wild_Juggernaut', 'Mastery_Level', 'Match',
+                 'Match_Duration', 'Minutes', 'Multi_kill_Max', 'Objective_Assists', 'PartyId', 'Rank_Stat_Conquest',
+                 'Rank_Stat_Duel', 'Rank_Stat_Joust', 'Structure_Damage', 'Surrendered', 'TaskForce',
+                 'Team1Score', 'Team2Score', 'TeamId', 'Time_In_Match_Seconds', 'Towers_Destroyed',
+                 'Wards_Placed', 'GodId', 'SkinId', 'match_queue_id', 'playerId', 'playerPortalId']
+
+
+def make_payload(matches):
+    rows = []
+    for match in range(matches):
+        for player in range(10):
+            row = {field: random.randint(0, 100000) for field in NUMBER_FIELDS}
+            row.update({field: 'value-{}'.format(random.randint(0, 1000)) for field in STRING_FIELDS})
+            row['Match'] = 1000000 + match
+            rows.append(row)
+    return json.dumps(rows)
+
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    payload = make_payload(matches)
+
+    def as_dicts():
+        return json.loads(payload)
+
+    def as_models():
+        rows = json.loads(payload)
+        return [Match(rows[i]['Match'], rows[i:i + 10]) for i in range(0, len(rows), 10)]
+
+    dicts, dict_size = measure(as_dicts)
+    del dicts
+    models, model_size = measure(as_models)
+    rows = matches * 10
+    print('{} match player rows with {} fields'.format(rows, len(STRING_FIELDS) + len(NUMBER_FIELDS)))
+    print('dicts:  {:10.1f} MiB  {:6.0f} bytes/row'.format(dict_size / 2 ** 20, dict_size / rows))
+    print('models: {:10.1f} MiB  {:6.0f} bytes/row'.format(model_size / 2 ** 20, model_size / rows))
+    print('ratio:  {:10.2f}x'.format(dict_size / model_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+    Measures the time it takes to import smite and the client's own
+    overhead per call, with the different ways logging can be set up.
+
+    The import is timed in fresh interpreters started in an empty
+    directory, which also shows whether importing creates any files. Calls
+    are answered in memory by a transport that never touches the network,
+    so what is left is the time spent in the client itself:
+
+    - default: the ``smitepython`` logger isn't configured
+    - log-to-file: :func:`smite.log_to_file` is called, as every import used to
+    - log-to-file-quiet: the same, with a client created with ``quiet=True``
+
+    Usage: python benchmarks/overhead.py [--calls 20000] [--imports 20]
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import smite  # noqa: E402
+from smite import SmiteClient, Transport  # noqa: E402
+
+SESSION = b'{"ret_msg": "Approved", "session_id": "0123456789ABCDEF", "timestamp": "1/1/2017 12:00:00 AM"}'
+PLAYER = b'[{"Id": 1, "Name": "Player", "Level": 30, "ret_msg": null}]'
+
+
+class MemoryTransport(Transport):
+    """
+    Answers every request instantly with a canned response.
+    """
+
+    def get(self, url):
+        return SESSION if '/createsession' in url else PLAYER
+
+
+def time_imports(count, statement):
+    code = 'import sys, time; start = time.perf_counter(); sys.path.insert(0, {!r}); {}; ' \
+           'print(time.perf_counter() - start)'.format(os.path.abspath(ROOT), statement)
+    timings = []
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(count):
+            output = subprocess.check_output([sys.executable, '-c', code], cwd=directory)
+            timings.append(float(output))
+        created = sorted(os.listdir(directory))
+    return statistics.median(timings), created
+
+
+def time_calls(count, quiet):
+    client = SmiteClient(1004, '23DF3C7E9BD14D84BF892AD206B6755C', transport=MemoryTransport(), quiet=quiet)
+    client.get_player('Player')
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get_player('Player')
+    return (time.perf_counter() - start) / count
+
+
+def reset_logger(handler=None):
+    if handler is not None:
+        smite.logger.removeHandler(handler)
+        handler.close()
+    smite.logger.setLevel(logging.NOTSET)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--calls', type=int, default=20000, help='number of calls timed in each mode')
+    parser.add_argument('--imports', type=int, default=20, help='number of interpreters the import is timed in')
+    options = parser.parse_args()
+
+    print('{:20} {:>12} {}'.format('import', 'median ms', 'files created'))
+    for name, statement in [('import smite', 'import smite'),
+                            ('+ log_to_file()', 'import smite; smite.log_to_file()')]:
+        median, created = time_imports(options.imports, statement)
+        print('{:20} {:12.1f} {}'.format(name, median * 1000, ', '.join(created) or '-'))
+
+    print()
+    print('{:20} {:>12} {:>12}'.format('mode', 'us/call', 'calls/s'))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'recent.log')
+        for name, log, quiet in [('default', False, False), ('log-to-file', True, False),
+                                 ('log-to-file-quiet', True, True)]:
+            handler = smite.log_to_file(path) if log else None
+            try:
+                per_call = time_calls(options.calls, quiet)
+            finally:
+                reset_logger(handler)
+            print('{:20} {:12.2f} {:12.0f}'.format(name, per_call * 10 ** 6, 1 / per_call))
+
+
+if __name__ == '__main__':
+    main()
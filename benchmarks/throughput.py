@@ -0,0 +1,207 @@
+"""
+    Measures the throughput and latency of each way of fetching match
+    details, against a local :class:`smite.mockserver.MockSmiteServer`.
+
+    For every mode the same match IDs are fetched with a new client, and
+    the following is reported:
+
+    - HTTP requests per second received by the server
+    - p50 and p99 latency of the client calls
+    - HTTP requests per match returned
+    - peak memory traced while the mode runs
+
+    Usage: python benchmarks/throughput.py [--matches 200] [--latency 0.02] [--error-rate 0] [--modes ...]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from smite import ResponseCache, RetryPolicy, SmiteError  # noqa: E402
+from smite.aio import AsyncSmiteClient  # noqa: E402
+from smite.mockserver import MockSmiteServer  # noqa: E402
+
+BATCH_SIZE = 10
+
+
+def timed(latencies, call, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return call(*args, **kwargs)
+    finally:
+        latencies.append(time.perf_counter() - start)
+
+
+async def timed_async(latencies, call, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return await call(*args, **kwargs)
+    finally:
+        latencies.append(time.perf_counter() - start)
+
+
+def run_async(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def chunks(ids):
+    return [ids[i:i + BATCH_SIZE] for i in range(0, len(ids), BATCH_SIZE)]
+
+
+def sync_sequential(server, ids, latencies, options):
+    client = server.client(retry_policy=options.retry_policy)
+    return sum(1 for match_id in ids if timed(latencies, client.get_match_details, match_id))
+
+
+def sync_threads(server, ids, latencies, options):
+    client = server.client(retry_policy=options.retry_policy)
+    with concurrent.futures.ThreadPoolExecutor(options.workers) as executor:
+        results = list(executor.map(lambda match_id: timed(latencies, client.get_match_details, match_id), ids))
+    return sum(1 for rows in results if rows)
+
+
+def sync_batch(server, ids, latencies, options):
+    client = server.client(retry_policy=options.retry_policy)
+    return sum(1 for chunk in chunks(ids) for rows in timed(latencies, client.get_match_details_batch, chunk).values()
+               if rows)
+
+
+def sync_batch_threads(server, ids, latencies, options):
+    client = server.client(retry_policy=options.retry_policy)
+    with concurrent.futures.ThreadPoolExecutor(options.workers) as executor:
+        results = list(executor.map(lambda chunk: timed(latencies, client.get_match_details_batch, chunk, 1),
+                                    chunks(ids)))
+    return sum(1 for result in results for rows in result.values() if rows)
+
+
+def sync_stream(server, ids, latencies, options):
+    client = server.client(retry_policy=options.retry_policy)
+    return sum(1 for chunk in chunks(ids)
+               for _, rows in timed(latencies, lambda: list(client.iter_match_details_batch(chunk))) if rows)
+
+
+def sync_models(server, ids, latencies, options):
+    client = server.client(retry_policy=options.retry_policy, models=True)
+    return sum(1 for chunk in chunks(ids) for match in timed(latencies, client.get_match_details_batch, chunk).values()
+               if match)
+
+
+def sync_cached(server, ids, latencies, options):
+    # Every match is asked for twice, the second time is answered by the cache
+    client = server.client(retry_policy=options.retry_policy, cache=ResponseCache(maxsize=len(ids)))
+    return sum(1 for match_id in ids + ids if timed(latencies, client.get_match_details, match_id))
+
+
+def async_gather(server, ids, latencies, options):
+    async def fetch():
+        client = server.client(AsyncSmiteClient, retry_policy=options.retry_policy, max_concurrency=options.workers)
+        try:
+            results = await asyncio.gather(*[timed_async(latencies, client.get_match_details, match_id)
+                                             for match_id in ids])
+        finally:
+            client.close()
+        return sum(1 for rows in results if rows)
+    return run_async(fetch())
+
+
+def async_batch(server, ids, latencies, options):
+    async def fetch():
+        client = server.client(AsyncSmiteClient, retry_policy=options.retry_policy, max_concurrency=options.workers)
+        try:
+            results = await asyncio.gather(*[timed_async(latencies, client.get_match_details_batch, chunk)
+                                             for chunk in chunks(ids)])
+        finally:
+            client.close()
+        return sum(1 for result in results for rows in result.values() if rows)
+    return run_async(fetch())
+
+
+MODES = [
+    ('sync-sequential', sync_sequential),
+    ('sync-threads', sync_threads),
+    ('sync-batch', sync_batch),
+    ('sync-batch-threads', sync_batch_threads),
+    ('sync-stream', sync_stream),
+    ('sync-models', sync_models),
+    ('sync-cached', sync_cached),
+    ('async-gather', async_gather),
+    ('async-batch', async_batch),
+]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def run_mode(mode, server, ids, options):
+    server.reset()
+    latencies = []
+    start = time.perf_counter()
+    try:
+        results = mode(server, ids, latencies, options)
+    except SmiteError as e:
+        print('  failed: {!r}'.format(e))
+        results = 0
+    elapsed = time.perf_counter() - start
+    requests = server.requests()
+
+    peak = None
+    if options.memory:
+        server.reset()
+        tracemalloc.start()
+        try:
+            mode(server, ids, [], options)
+        except SmiteError:
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'requests': requests, 'results': results, 'elapsed': elapsed, 'latencies': latencies, 'peak': peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--matches', type=int, default=200, help='number of matches fetched by each mode')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds the server delays every response by')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random delay in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests failing with HTTP 503')
+    parser.add_argument('--workers', type=int, default=16, help='threads or concurrent requests of parallel modes')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='skip the memory measurement')
+    parser.add_argument('--modes', nargs='*', choices=[name for name, _ in MODES], help='the modes to run')
+    options = parser.parse_args()
+    options.retry_policy = RetryPolicy(retries=5, backoff=0.01, max_backoff=0.1)
+
+    ids = list(range(10 ** 8, 10 ** 8 + options.matches))
+    modes = [(name, mode) for name, mode in MODES if not options.modes or name in options.modes]
+    server = MockSmiteServer(latency=options.latency, jitter=options.jitter, error_rate=options.error_rate,
+                             daily_limit=None, session_cap=None).start()
+    print('{} matches, {:.0f} ms latency, {:.1%} errors'.format(options.matches, options.latency * 1000,
+                                                              options.error_rate))
+    print('{:20} {:>9} {:>9} {:>9} {:>9} {:>11} {:>9}'.format('mode', 'req/s', 'results/s', 'p50 ms', 'p99 ms',
+                                                            'req/result', 'peak MiB'))
+    try:
+        for name, mode in modes:
+            stats = run_mode(mode, server, ids, options)
+            elapsed = stats['elapsed'] or float('inf')
+            print('{:20} {:9.1f} {:9.1f} {:9.1f} {:9.1f} {:11.2f} {:>9}'.format(
+                name, stats['requests'] / elapsed, stats['results'] / elapsed,
+                percentile(stats['latencies'], 0.5) * 1000, percentile(stats['latencies'], 0.99) * 1000,
+                stats['requests'] / stats['results'] if stats['results'] else float('inf'),
+                '{:.2f}'.format(stats['peak'] / 2 ** 20) if stats['peak'] is not None else '-'))
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
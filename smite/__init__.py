@@ -0,0 +1,2177 @@
+"""
+    smite-python (github.com/jaydenkieran/smite-python)
+    Distributed under the MIT License by Jayden Bailey
+"""
+import bisect
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import hashlib
+import heapq
+import http.client
+import io
+import itertools
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+from enum import Enum
+
+import json
+import logging
+
+from datetime import datetime
+
+from smite._storage import dump_json_atomically
+from smite.models import God, Item, Match, Player
+from smite.streaming import iter_json_array
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+version = '1.0_rc2'
+
+# Initialise logging. Nothing is written anywhere unless the application configures
+# the 'smitepython' logger, or calls log_to_file().
+logger = logging.getLogger('smitepython')
+logger.addHandler(logging.NullHandler())
+
+
+def log_to_file(path='recent.log', level=logging.DEBUG):
+    """
+    Writes the library's log to a file, as every import of smite-python used to.
+
+    :param path: Path of the log file. It is appended to if it exists.
+    :param level: The lowest level of the messages written
+    :return: The :class:`logging.FileHandler` added to the ``smitepython`` logger
+    """
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(fmt='%(asctime)s [%(levelname)s]: %(message)s',
+                                           datefmt='%d/%m/%Y %I:%M:%S %p'))
+    logger.addHandler(handler)
+    if logger.level == logging.NOTSET or logger.level > level:
+        logger.setLevel(level)
+    logger.info('Loaded smite-python %s, github.com/jaydenkieran/smite-python', version)
+    return handler
+
+
+def _is_quota_message(ret_msg):
+    # The API reports used up daily limits as a successful response with only a message
+    ret_msg = ret_msg.lower()
+    return 'limit reached' in ret_msg or 'maximum number of' in ret_msg
+
+
+def _is_complete_response(rows):
+    # Errors, and matches the API hasn't finished processing, come back as a single row with only a message
+    return bool(rows) and isinstance(rows, list) and isinstance(rows[0], dict) and not rows[0].get('ret_msg')
+
+
+class SmiteError(Exception):
+    def __init__(self, *args, **kwargs):
+        Exception.__init__(self, *args, **kwargs)
+
+
+class NoResultError(SmiteError):
+    def __init__(self, *args, **kwargs):
+        SmiteError.__init__(self, *args, **kwargs)
+
+
+class QuotaExceededError(SmiteError):
+    def __init__(self, *args, **kwargs):
+        SmiteError.__init__(self, *args, **kwargs)
+
+
+class SessionError(SmiteError):
+    def __init__(self, *args, **kwargs):
+        SmiteError.__init__(self, *args, **kwargs)
+
+
+class CircuitOpenError(SmiteError):
+    def __init__(self, *args, **kwargs):
+        SmiteError.__init__(self, *args, **kwargs)
+
+
+class DeadlineExceededError(SmiteError):
+    def __init__(self, *args, **kwargs):
+        SmiteError.__init__(self, *args, **kwargs)
+
+
+class Endpoint(Enum):
+    """
+    Valid enums: PC, PS4, XBOX
+    """
+    PC = "http://api.smitegame.com/smiteapi.svc/"
+    PS4 = "http://api.ps4.smitegame.com/smiteapi.svc/"
+    XBOX = "http://api.xbox.smitegame.com/smiteapi.svc/"
+
+
+class ConnectionPool(object):
+    """
+    A pool of persistent HTTP/1.1 connections to a single host.
+
+    Connections are handed out most recently used first, so that idle
+    connections at the bottom of the pool age out and are closed once they
+    have been unused for longer than ``idle_timeout``.
+
+    At most ``maxsize`` connections are open at once. Requests made while
+    all of them are in use wait for one to be returned. A streamed response
+    holds its connection until its body has been read to the end or its
+    generator is closed.
+    """
+
+    def __init__(self, host, port=None, scheme='http', maxsize=10, idle_timeout=60, connect_timeout=10,
+                 read_timeout=30):
+        """
+        :param host: The host to connect to
+        :param port: The port to connect to, defaults to the scheme's default port
+        :param scheme: Either ``http`` or ``https``
+        :param maxsize: The maximum number of connections open at once
+        :param idle_timeout: Number of seconds after which an idle connection is closed
+        :param connect_timeout: Number of seconds to wait for a connection to be established
+        :param read_timeout: Number of seconds to wait for data from the server
+        """
+        self.host = host
+        self.port = port
+        self.scheme = scheme
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._idle = collections.deque()
+        self._lock = threading.Lock()
+        # Every connection handed out holds a slot until it is put back or discarded
+        self._slots = threading.BoundedSemaphore(maxsize)
+
+    def _new_conn(self):
+        if self.scheme == 'https':
+            conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.connect_timeout)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        return conn
+
+    def _get_conn(self):
+        self._slots.acquire()
+        now = time.monotonic()
+        with self._lock:
+            while self._idle and now - self._idle[0][1] > self.idle_timeout:
+                self._idle.popleft()[0].close()
+            if self._idle:
+                return self._idle.pop()[0], True
+        try:
+            return self._new_conn(), False
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _put_conn(self, conn):
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+        self._slots.release()
+
+    def _discard_conn(self, conn):
+        conn.close()
+        self._slots.release()
+
+    def request(self, path):
+        """
+        :param path: The path and query string to request
+        :return: A ``(status, reason, headers, body)`` tuple
+        """
+        conn, reused = self._get_conn()
+        try:
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                if not reused:
+                    raise
+                # The server closed the idle connection, retry on a fresh one
+                conn.close()
+                conn = self._new_conn()
+                conn.request('GET', path)
+                response = conn.getresponse()
+            body = response.read()
+        except BaseException:
+            self._discard_conn(conn)
+            raise
+        if response.will_close:
+            self._discard_conn(conn)
+        else:
+            self._put_conn(conn)
+        return response.status, response.reason, response.msg, body
+
+    def stream(self, path, chunk_size=65536):
+        """
+        :param path: The path and query string to request
+        :param chunk_size: The maximum number of bytes read from the socket at once
+        :return: A ``(status, reason, headers, chunks)`` tuple, where chunks is a generator of the body's bytes.
+            The connection goes back to the pool once the body has been read to the end.
+        """
+        conn, reused = self._get_conn()
+        try:
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                if not reused:
+                    raise
+                conn.close()
+                conn = self._new_conn()
+                conn.request('GET', path)
+                response = conn.getresponse()
+        except BaseException:
+            self._discard_conn(conn)
+            raise
+        chunks = self._iter_body(conn, response, chunk_size)
+        next(chunks)
+        return response.status, response.reason, response.msg, chunks
+
+    def _iter_body(self, conn, response, chunk_size):
+        try:
+            # Started by stream() so that the connection is released even if the body is never read
+            yield
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            # The response closes itself once the whole body has been read
+            if response.isclosed() and not response.will_close:
+                self._put_conn(conn)
+            else:
+                self._discard_conn(conn)
+
+    def close(self):
+        """
+        Closes all idle connections in the pool.
+        """
+        with self._lock:
+            while self._idle:
+                self._idle.pop()[0].close()
+
+
+class Transport(object):
+    """
+    Base class for the ways requests reach the Smite API.
+
+    A client hands every request to its transport as a complete URL and
+    gets back the raw response body. Subclasses can send requests over the
+    network, like :class:`HTTPTransport`, or answer them some other way,
+    like the transports in :mod:`smite.replay`.
+    """
+
+    def get(self, url):
+        """
+        :param url: The URL to request
+        :return: The body of the response
+
+        Raises :class:`urllib.error.HTTPError` if the response status is an error.
+        """
+        raise NotImplementedError
+
+    def stream(self, url):
+        """
+        :param url: The URL to request
+        :return: An iterable of the bytes of the response body
+
+        Raises :class:`urllib.error.HTTPError` if the response status is an error.
+        """
+        return iter([self.get(url)])
+
+    def close(self):
+        """
+        Releases any resources held by the transport.
+        """
+        pass
+
+
+class HTTPTransport(Transport):
+    """
+    Sends requests to the Smite API over pooled keep-alive connections.
+
+    A :class:`ConnectionPool` is kept for each host, so each :class:`Endpoint`
+    gets its own pool. A transport is thread-safe and can be shared between
+    clients.
+    """
+
+    def __init__(self, pool_size=10, idle_timeout=60, connect_timeout=10, read_timeout=30):
+        """
+        :param pool_size: The maximum number of connections open at once per endpoint
+        :param idle_timeout: Number of seconds after which an idle connection is closed
+        :param connect_timeout: Number of seconds to wait for a connection to be established
+        :param read_timeout: Number of seconds to wait for data from the server
+        """
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _get_pool(self, scheme, host, port):
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = ConnectionPool(host, port, scheme, self.pool_size, self.idle_timeout,
+                                          self.connect_timeout, self.read_timeout)
+                    self._pools[key] = pool
+        return pool
+
+    def get(self, url):
+        """
+        :param url: The URL to request
+        :return: The body of the response
+
+        Raises :class:`urllib.error.HTTPError` if the response status is an error.
+        """
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        pool = self._get_pool(parts.scheme, parts.hostname, parts.port)
+        status, reason, headers, body = pool.request(path)
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, reason, headers, io.BytesIO(body))
+        return body
+
+    def stream(self, url):
+        """
+        :param url: The URL to request
+        :return: A generator of the bytes of the response body, read from the socket as they are needed
+
+        Raises :class:`urllib.error.HTTPError` if the response status is an error.
+        """
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        pool = self._get_pool(parts.scheme, parts.hostname, parts.port)
+        status, reason, headers, chunks = pool.stream(path)
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, reason, headers, io.BytesIO(b''.join(chunks)))
+        return chunks
+
+    def close(self):
+        """
+        Closes all idle connections held by the transport.
+        """
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+
+
+class RetryPolicy(object):
+    """
+    Decides how often and how long to wait before retrying a failed request.
+
+    Delays grow exponentially from ``backoff`` up to ``max_backoff``, with
+    full jitter so that many workers retrying at once are spread out.
+    """
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=10.0):
+        """
+        :param retries: The maximum number of times a request is retried
+        :param backoff: The base delay in seconds before the first retry
+        :param max_backoff: The maximum delay in seconds before any retry
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt):
+        """
+        :param attempt: The number of retries already made
+        :return: Number of seconds to wait before the next retry, or None if no retries are left
+        """
+        if attempt >= self.retries:
+            return None
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    @staticmethod
+    def is_retryable(error):
+        """
+        :param error: The exception a request failed with
+        :return: Whether the request may succeed if it is retried
+        """
+        if isinstance(error, urllib.error.HTTPError):
+            return error.code >= 500 or error.code == 429
+        return isinstance(error, (OSError, http.client.HTTPException))
+
+
+class CircuitBreaker(object):
+    """
+    Stops requests being sent to an endpoint that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit for that
+    endpoint opens and requests fail immediately with
+    :class:`CircuitOpenError`. After ``reset_timeout`` seconds a single
+    trial request is let through; if it succeeds the circuit closes again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        :param failure_threshold: Number of consecutive failures after which the circuit opens
+        :param reset_timeout: Number of seconds the circuit stays open before a trial request is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = {}
+        self._opened = {}
+        self._lock = threading.Lock()
+
+    def before_request(self, key):
+        """
+        :param key: The endpoint the request is sent to
+
+        Raises :class:`CircuitOpenError` if the circuit for the endpoint is open.
+        """
+        with self._lock:
+            opened = self._opened.get(key)
+            if opened is None:
+                return
+            remaining = opened + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError('{} is failing, requests are paused for another {:.0f} seconds'.format(
+                    key, remaining))
+            # Let one trial request through, failing fast again until it finishes
+            self._opened[key] = time.monotonic()
+
+    def record_success(self, key):
+        """
+        :param key: The endpoint the request was sent to
+        """
+        with self._lock:
+            self._failures.pop(key, None)
+            if self._opened.pop(key, None) is not None:
+                logger.info('Circuit for %s closed', key)
+
+    def record_failure(self, key):
+        """
+        :param key: The endpoint the request was sent to
+        """
+        with self._lock:
+            failures = self._failures.get(key, 0) + 1
+            self._failures[key] = failures
+            if failures >= self.failure_threshold:
+                if key not in self._opened:
+                    logger.warning('Circuit for %s opened after %d failures', key, failures)
+                self._opened[key] = time.monotonic()
+
+    def is_open(self, key):
+        """
+        :param key: The endpoint to check
+        :return: Whether requests to the endpoint are currently failing fast
+        """
+        with self._lock:
+            opened = self._opened.get(key)
+            return opened is not None and opened + self.reset_timeout > time.monotonic()
+
+
+class SessionStore(object):
+    """
+    Base class for places where sessions can be shared between clients.
+
+    A store maps a key (the developer ID) to the ID and creation time of a
+    session. Clients holding the store's lock for a key are the only ones
+    allowed to create a new session for it, so that a session is created
+    once and then reused by everyone sharing the store.
+    """
+
+    def get(self, key):
+        """
+        :param key: The key the session is stored under
+        :return: A ``(session_id, created)`` tuple, or None if no session is stored
+        """
+        raise NotImplementedError
+
+    def set(self, key, session_id, created):
+        """
+        :param key: The key to store the session under
+        :param session_id: The ID of the session
+        :param created: The UNIX timestamp the session was created at
+        """
+        raise NotImplementedError
+
+    def delete(self, key, session_id):
+        """
+        :param key: The key the session is stored under
+        :param session_id: The session to remove. If another session has replaced it, nothing is done.
+        """
+        raise NotImplementedError
+
+    def lock(self, key):
+        """
+        :param key: The key to lock
+        :return: A context manager holding an exclusive lock on key
+        """
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Keeps sessions in memory. Sessions are shared between clients in the
+    same process that are given the same store instance.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._locks = {}
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        return self._sessions.get(key)
+
+    def set(self, key, session_id, created):
+        self._sessions[key] = (session_id, created)
+
+    def delete(self, key, session_id):
+        with self._lock:
+            stored = self._sessions.get(key)
+            if stored and stored[0] == session_id:
+                del self._sessions[key]
+
+    def lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.RLock())
+
+
+class FileSessionStore(SessionStore):
+    """
+    Keeps sessions in a JSON file, allowing them to be shared between
+    processes on the same machine. Access to the file is serialised with an
+    exclusive lock on a ``.lock`` file next to it.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the file to store sessions in. It is created if it doesn't exist.
+        """
+        self.path = path
+        self._lock_path = path + '.lock'
+        self._thread_lock = threading.RLock()
+        self._lock_file = None
+
+    def __getstate__(self):
+        # Only the path is sent to other processes, which take their own locks
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write(self, sessions):
+        dump_json_atomically(sessions, self.path)
+
+    def get(self, key):
+        stored = self._read().get(key)
+        if not stored:
+            return None
+        return stored['session_id'], stored['created']
+
+    def set(self, key, session_id, created):
+        with self.lock(key):
+            sessions = self._read()
+            sessions[key] = {'session_id': session_id, 'created': created}
+            self._write(sessions)
+
+    def delete(self, key, session_id):
+        with self.lock(key):
+            sessions = self._read()
+            stored = sessions.get(key)
+            if stored and stored['session_id'] == session_id:
+                del sessions[key]
+                self._write(sessions)
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        with self._thread_lock:
+            if self._lock_file is not None:
+                # Re-entered from the thread already holding the file lock
+                yield
+                return
+            with open(self._lock_path, 'a') as f:
+                _lock_file(f)
+                self._lock_file = f
+                try:
+                    yield
+                finally:
+                    self._lock_file = None
+                    _unlock_file(f)
+
+
+def _lock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                pass
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SessionManager(object):
+    """
+    Tracks the lifetime of a SmiteAPI session.
+
+    Sessions are valid for 15 minutes after creation. Rather than testing the
+    session before every call, the manager assumes a session is valid until
+    it is close to expiring, and only creates a new one at that point or
+    when the API explicitly rejects it. Sessions are shared through a
+    :class:`SessionStore`, so clients using the same developer ID and store
+    reuse each other's sessions.
+    """
+    LIFETIME = 15 * 60
+    MARGIN = 60
+
+    def __init__(self, create, key, store=None, lifetime=LIFETIME, margin=MARGIN):
+        """
+        :param create: Callable returning the decoded response of a createsession call
+        :param key: The key sessions are shared under in the store, usually the developer ID
+        :param store: The :class:`SessionStore` to share sessions through. Defaults to a new :class:`MemorySessionStore`
+        :param lifetime: Number of seconds a session is valid for after creation
+        :param margin: Number of seconds before expiry at which a session is re-created
+        """
+        self._create = create
+        self.key = key
+        self.store = store if store is not None else MemorySessionStore()
+        self.lifetime = lifetime
+        self.margin = margin
+        # The session ID and its creation time are replaced together, so other threads never see half of an update
+        self._current = (None, None)
+
+    @property
+    def session_id(self):
+        return self._current[0]
+
+    @property
+    def created(self):
+        return self._current[1]
+
+    def _is_fresh(self, created):
+        return time.time() - created < self.lifetime - self.margin
+
+    def _valid_session(self):
+        session_id, created = self._current
+        return session_id if session_id is not None and self._is_fresh(created) else None
+
+    def is_valid(self):
+        """
+        :return: Whether the current session can be used without being re-created
+        """
+        return self._valid_session() is not None
+
+    def get(self):
+        """
+        :return: A session ID, creating a new session if the current one is missing or about to expire.
+            Threads that find the session expired at the same time wait for a single new session.
+        """
+        session_id = self._valid_session()
+        if session_id is not None:
+            return session_id
+        with self.store.lock(self.key):
+            session_id = self._valid_session()
+            if session_id is not None:
+                return session_id
+            stored = self.store.get(self.key)
+            if stored and self._is_fresh(stored[1]):
+                self._current = tuple(stored)
+                return stored[0]
+            return self.refresh()
+
+    def refresh(self):
+        """
+        :return: The ID of a newly created session
+        """
+        with self.store.lock(self.key):
+            logger.info('Creating new session with the SmiteAPI')
+            return self._accept(self._create())
+
+    def _accept(self, session):
+        session_id = session.get('session_id') if isinstance(session, dict) else None
+        if not session_id:
+            ret_msg = session.get('ret_msg') if isinstance(session, dict) else session
+            if isinstance(ret_msg, str) and _is_quota_message(ret_msg):
+                raise QuotaExceededError("Couldn't create session: {}".format(ret_msg))
+            raise SmiteError("Couldn't create session: {}".format(ret_msg))
+        self._current = (session_id, time.time())
+        self.store.set(self.key, session_id, self._current[1])
+        return session_id
+
+    def invalidate(self, session_id=None):
+        """
+        :param session_id: The session that was rejected. If it has already been replaced, nothing is done.
+        """
+        if session_id is None:
+            session_id = self.session_id
+        if session_id is None:
+            return
+        self.store.delete(self.key, session_id)
+        if session_id == self.session_id:
+            self._current = (None, None)
+
+
+class ResponseCache(object):
+    """
+    A bounded in-memory cache of API responses.
+
+    Each API method has its own time to live. Methods without a policy are
+    never cached. Methods cached :attr:`FOREVER` only keep complete
+    responses, not error messages or matches still being processed. When
+    the cache is full the least recently used response is evicted.
+
+    Note
+    -----
+    Cached responses are shared between callers and must not be modified.
+    """
+    FOREVER = None
+    DAY = 24 * 60 * 60
+    DEFAULT_TTLS = {
+        'getgods': DAY,
+        'getitems': DAY,
+        'getgodskins': DAY,
+        'getgodrecommendeditems': DAY,
+        'getleagueseasons': DAY,
+        'getmatchdetails': FOREVER,
+        'getplayerstatus': 10,
+    }
+
+    def __init__(self, maxsize=1024, ttls=None):
+        """
+        :param maxsize: The maximum number of responses kept
+        :param ttls: A dictionary mapping lowercase API method names to the number of seconds their responses are kept,
+            or :attr:`FOREVER`. Merged over :attr:`DEFAULT_TTLS`. Map a method to 0 to stop it being cached.
+        """
+        self.maxsize = maxsize
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_cached(self, methodname):
+        """
+        :param methodname: The API method name
+        :return: Whether responses of the method are cached
+        """
+        return self.ttls.get(methodname, 0) != 0
+
+    def get(self, key):
+        """
+        :param key: The key the response was stored under
+        :return: The cached response, or None if it is missing or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, methodname, key, value):
+        """
+        :param methodname: The API method the response belongs to
+        :param key: The key to store the response under
+        :param value: The decoded response
+        """
+        ttl = self.ttls.get(methodname, 0)
+        if ttl == 0 or ttl is self.FOREVER and not _is_complete_response(value):
+            return
+        expires = None if ttl is self.FOREVER else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Removes all cached responses.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        :return: A dictionary of the cache's size, hits, misses and evictions
+        """
+        return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class RequestCoalescer(object):
+    """
+    Shares one in-flight request between identical concurrent calls.
+
+    The first call for a key sends the request. Calls for the same key that
+    arrive while it is in flight wait for it and receive the same result, or
+    the same exception, instead of sending a request of their own.
+
+    Note
+    -----
+    Coalesced callers share the decoded response, which must not be modified.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def call(self, key, fetch):
+        """
+        :param key: Identifies the request, calls with equal keys are coalesced
+        :param fetch: Callable sending the request and returning its result
+        :return: The result of the request
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = concurrent.futures.Future()
+                self.requests += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            return future.result()
+        try:
+            result = fetch()
+        except BaseException as e:
+            self._forget(key)
+            future.set_exception(e)
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key):
+        with self._lock:
+            del self._calls[key]
+
+    def stats(self):
+        """
+        :return: A dictionary of the number of requests sent, calls coalesced into them and requests in flight
+        """
+        return {'requests': self.requests, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
+
+
+class RateLimiter(object):
+    """
+    A client-side token bucket that keeps requests within the API's limits.
+
+    Requests are spread out to at most ``rate`` per second. The daily request
+    and session budgets are seeded from :meth:`SmiteClient.get_data_used` and
+    refreshed every ``refresh_interval`` seconds. A budget whose limit is
+    reported as 0, or not reported, is left unknown and not enforced. Once
+    less than ``pace_threshold`` of the daily request budget is left, the
+    rate is lowered so the rest of the budget lasts until the daily reset
+    at midnight UTC. A limiter is thread-safe and can be shared by clients
+    using the same developer ID.
+    """
+
+    def __init__(self, rate=10, burst=None, refresh_interval=600, pace_threshold=0.2):
+        """
+        :param rate: The maximum number of requests per second
+        :param burst: The number of requests that can be sent at once after a quiet period. Defaults to ``rate``.
+        :param refresh_interval: Number of seconds between refreshes of the daily budgets
+        :param pace_threshold: Fraction of the daily request budget below which requests are paced until the reset
+        """
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self.refresh_interval = refresh_interval
+        self.pace_threshold = pace_threshold
+        self.request_limit = None
+        self.requests_remaining = None
+        self.session_limit = None
+        self.sessions_remaining = None
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._refreshed = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def seconds_until_reset():
+        """
+        :return: Number of seconds until the daily limits reset at midnight UTC
+        """
+        now = datetime.utcnow()
+        return 24 * 60 * 60 - (now.hour * 60 * 60 + now.minute * 60 + now.second + now.microsecond / 1e6)
+
+    def _current_rate(self):
+        if self.requests_remaining is None or not self.request_limit:
+            return self.rate
+        if self.requests_remaining > self.request_limit * self.pace_threshold:
+            return self.rate
+        return min(self.rate, self.requests_remaining / max(self.seconds_until_reset(), 1.0))
+
+    def reserve(self, session=False):
+        """
+        Takes a request from the budgets.
+
+        :param session: Whether the request creates a session
+        :return: Number of seconds to wait before sending the request
+
+        Raises :class:`QuotaExceededError` if a daily budget is used up.
+        """
+        with self._lock:
+            if self.requests_remaining is not None and self.requests_remaining <= 0:
+                raise QuotaExceededError('Daily request limit reached, resets in {:.0f} seconds'.format(
+                    self.seconds_until_reset()))
+            if session and self.sessions_remaining is not None and self.sessions_remaining <= 0:
+                raise QuotaExceededError('Daily session limit reached, resets in {:.0f} seconds'.format(
+                    self.seconds_until_reset()))
+            rate = self._current_rate()
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            self._tokens -= 1
+            if self.requests_remaining is not None:
+                self.requests_remaining -= 1
+            if session and self.sessions_remaining is not None:
+                self.sessions_remaining -= 1
+            return -self._tokens / rate if self._tokens < 0 else 0.0
+
+    def acquire(self, session=False):
+        """
+        Blocks until a request can be sent.
+
+        :param session: Whether the request creates a session
+        """
+        wait = self.reserve(session)
+        if wait > 0:
+            time.sleep(wait)
+
+    def begin_refresh(self):
+        """
+        :return: Whether the caller should refresh the budgets. Only one caller is told to at a time.
+        """
+        with self._lock:
+            if self._refreshing:
+                return False
+            if self._refreshed is not None and time.monotonic() - self._refreshed < self.refresh_interval:
+                return False
+            self._refreshing = True
+            return True
+
+    def finish_refresh(self, data_used=None):
+        """
+        :param data_used: The response of :meth:`SmiteClient.get_data_used`, or None if it couldn't be fetched
+        """
+        if isinstance(data_used, list) and data_used:
+            data_used = data_used[0]
+        with self._lock:
+            self._refreshing = False
+            self._refreshed = time.monotonic()
+            if not isinstance(data_used, dict):
+                return
+            # A limit of 0 or none at all means the limit is unknown, not that nothing may be sent
+            if data_used.get('Request_Limit_Daily'):
+                self.request_limit = data_used['Request_Limit_Daily']
+                self.requests_remaining = self.request_limit - (data_used.get('Total_Requests_Today') or 0)
+            if data_used.get('Session_Cap'):
+                self.session_limit = data_used['Session_Cap']
+                self.sessions_remaining = self.session_limit - (data_used.get('Total_Sessions_Today') or 0)
+
+    def reset(self):
+        """
+        Forgets the daily budgets, so they are fetched again before the next request.
+        """
+        with self._lock:
+            self.requests_remaining = None
+            self.sessions_remaining = None
+            self._refreshed = None
+
+    def remaining(self):
+        """
+        :return: A dictionary of the remaining daily ``requests`` and ``sessions``, None where not yet known,
+            and the number of seconds until they reset
+        """
+        with self._lock:
+            return {'requests': self.requests_remaining, 'sessions': self.sessions_remaining,
+                    'resets_in': self.seconds_until_reset()}
+
+
+# The priority and deadline set by RequestScheduler.prioritize() for the current thread or task
+_request_priority = contextvars.ContextVar('smite_request_priority', default=None)
+
+
+class RequestScheduler(object):
+    """
+    Decides the order in which competing requests are sent.
+
+    Clients sharing a scheduler send at most ``max_in_flight`` requests at
+    once, and at most ``rate`` per second if it is given. When more requests
+    are waiting, they are sent in order of priority class, then earliest
+    deadline, then arrival. Some in-flight slots can be reserved for the
+    more urgent classes, so a bulk crawl can use all the capacity left but
+    never delays interactive lookups by more than one request.
+
+    Each API method has a priority class, from :attr:`DEFAULT_PRIORITIES` or
+    ``priorities``. :meth:`prioritize` changes the class and sets a deadline
+    for the requests made inside a ``with`` block. A request that can't be
+    sent before its deadline raises :class:`DeadlineExceededError` without
+    using any quota.
+
+    Note
+    -----
+    When the client also has a :class:`RateLimiter`, give the scheduler the
+    rate to pace requests by, and the limiter a rate at least as high, so
+    the limiter only keeps track of the daily budgets.
+    """
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+    DEFAULT_PRIORITIES = {
+        'createsession': INTERACTIVE,
+        'testsession': INTERACTIVE,
+        'ping': INTERACTIVE,
+        'getdataused': INTERACTIVE,
+        'getplayer': INTERACTIVE,
+        'getplayerstatus': INTERACTIVE,
+        'getmatchplayerdetails': INTERACTIVE,
+        'getmatchdetails': BULK,
+        'getmatchdetailsbatch': BULK,
+        'getmatchidsbyqueue': BULK,
+        'getmatchhistory': BULK,
+        'getfriends': BULK,
+    }
+
+    def __init__(self, max_in_flight=8, rate=None, burst=1, reserved=None, priorities=None, default=NORMAL):
+        """
+        :param max_in_flight: The maximum number of requests sent at once
+        :param rate: The maximum number of requests sent per second, or None not to pace requests
+        :param burst: The number of requests that can be sent at once after a quiet period
+        :param reserved: A dictionary mapping priority classes to the number of in-flight slots that only
+            they and more urgent classes may use. Defaults to a quarter of ``max_in_flight`` for
+            :attr:`INTERACTIVE`. Every class can use at least one slot.
+        :param priorities: A dictionary mapping lowercase API method names to priority classes.
+            Merged over :attr:`DEFAULT_PRIORITIES`.
+        :param default: The priority class of methods not in ``priorities``
+        """
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = float(burst)
+        self.reserved = reserved if reserved is not None else {self.INTERACTIVE: max_in_flight // 4}
+        self.priorities = dict(self.DEFAULT_PRIORITIES)
+        if priorities:
+            self.priorities.update(priorities)
+        self.default = default
+        self.dispatched = 0
+        self.expired = 0
+        self._in_flight = 0
+        self._waiting = []
+        self._arrivals = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+
+    @contextlib.contextmanager
+    def prioritize(self, priority, timeout=None):
+        """
+        Sets the priority class of the requests made inside the ``with`` block by the current thread or task.
+
+        :param priority: The priority class, such as :attr:`INTERACTIVE`
+        :param timeout: Number of seconds from now within which the requests must be sent
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        token = _request_priority.set((priority, deadline))
+        try:
+            yield
+        finally:
+            _request_priority.reset(token)
+
+    def _capacity(self, priority):
+        # Slots reserved for more urgent classes can't be used, but every class can always send one request
+        return max(1, self.max_in_flight - sum(slots for reserved, slots in self.reserved.items() if reserved < priority))
+
+    def _enqueue(self, methodname):
+        context = _request_priority.get()
+        if context is not None:
+            priority, deadline = context
+        else:
+            priority, deadline = self.priorities.get(methodname, self.default), None
+        self._arrivals += 1
+        entry = (priority, deadline if deadline is not None else float('inf'), self._arrivals)
+        heapq.heappush(self._waiting, entry)
+        return entry
+
+    def _try_dispatch(self, entry):
+        """
+        :return: Whether the request was dispatched, and the number of seconds to wait before trying again,
+            or None to wait until another request finishes
+        """
+        now = time.monotonic()
+        if entry[1] <= now:
+            self.expired += 1
+            raise DeadlineExceededError('Request could not be sent before its deadline')
+        timeout = entry[1] - now if entry[1] != float('inf') else None
+        if self._waiting[0] is not entry or self._in_flight >= self._capacity(entry[0]):
+            return False, timeout
+        if self.rate is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                return False, wait if timeout is None else min(wait, timeout)
+            self._tokens -= 1
+        heapq.heappop(self._waiting)
+        self._in_flight += 1
+        self.dispatched += 1
+        return True, None
+
+    def _abandon(self, entry):
+        if entry in self._waiting:
+            self._waiting.remove(entry)
+            heapq.heapify(self._waiting)
+
+    def acquire(self, methodname):
+        """
+        Blocks until the request may be sent. Every call must be followed by a call to :meth:`release`.
+
+        :param methodname: The lowercase API method of the request
+
+        Raises :class:`DeadlineExceededError` if the deadline set with :meth:`prioritize` passes first.
+        """
+        with self._condition:
+            entry = self._enqueue(methodname)
+            try:
+                while True:
+                    dispatched, timeout = self._try_dispatch(entry)
+                    if dispatched:
+                        # The next request in line may be able to go as well
+                        self._condition.notify_all()
+                        return
+                    self._condition.wait(timeout)
+            except BaseException:
+                self._abandon(entry)
+                self._condition.notify_all()
+                raise
+
+    def release(self):
+        """
+        Marks a request sent after :meth:`acquire` as finished.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def stats(self):
+        """
+        :return: A dictionary of the number of requests dispatched, expired before their deadline and in flight,
+            and under ``waiting`` a dictionary mapping priority classes to the number of requests waiting in them
+        """
+        with self._condition:
+            return {'dispatched': self.dispatched, 'expired': self.expired, 'in_flight': self._in_flight,
+                    'waiting': dict(collections.Counter(entry[0] for entry in self._waiting))}
+
+
+class RequestInfo(object):
+    """
+    Describes one HTTP request made by a client, as passed to :class:`RequestHook` objects.
+
+    A call retried after a transient error makes one request per attempt.
+    Calls that fail before anything is sent, because the circuit breaker is
+    open, the rate limiter's daily budget is spent or the scheduler's
+    deadline passed, make none.
+
+    ``queue_time`` is the time the request waited before it was sent: for
+    its turn in the client's :class:`RequestScheduler`, for the rate limiter,
+    and before a retry for the back-off delay. ``network_time`` covers
+    sending the request and receiving the whole body. ``decode_time`` is the
+    time spent parsing the JSON body. All three are in seconds. ``error`` is
+    the exception the request failed with, or None. For streamed requests
+    the body is parsed while it is received, so all of their time counts as
+    network time.
+    """
+    __slots__ = ('method', 'endpoint', 'url', 'started', 'queue_time', 'network_time', 'decode_time', 'bytes',
+                 'error')
+
+    def __init__(self, method, endpoint, url):
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.started = None
+        self.queue_time = 0.0
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        self.bytes = 0
+        self.error = None
+
+    def __repr__(self):
+        return '<RequestInfo {} {} {:.1f} ms, {} bytes{}>'.format(
+            self.method, self.endpoint, (self.network_time + self.decode_time) * 1000, self.bytes,
+            ', {!r}'.format(self.error) if self.error is not None else '')
+
+
+class RequestHook(object):
+    """
+    Base class for objects notified of every HTTP request a client makes.
+
+    Hooks are called on the thread making the request, and must be quick
+    and thread-safe. Exceptions raised by hooks are passed on to the caller.
+    """
+
+    def before_request(self, request):
+        """
+        :param request: The :class:`RequestInfo` of the request about to be sent
+        """
+        pass
+
+    def after_request(self, request):
+        """
+        :param request: The :class:`RequestInfo` of the finished request, with its timings filled in
+        """
+        pass
+
+
+class _Histogram(object):
+    __slots__ = ('counts', 'sum')
+
+    # Upper bounds in seconds, spaced 1-2.5-5 from 0.1 ms to 10 s
+    BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.sum = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self.sum += value
+
+    def snapshot(self):
+        count = sum(self.counts)
+        cumulative = list(itertools.accumulate(self.counts))
+        return {'count': count, 'sum': self.sum,
+                'buckets': list(zip(self.BOUNDS + (float('inf'),), cumulative)),
+                'p50': self._quantile(cumulative, count, 0.5), 'p99': self._quantile(cumulative, count, 0.99)}
+
+    def _quantile(self, cumulative, count, fraction):
+        # The upper bound of the bucket the quantile falls in
+        if not count:
+            return None
+        i = bisect.bisect_left(cumulative, fraction * count)
+        return self.BOUNDS[i] if i < len(self.BOUNDS) else float('inf')
+
+
+class _MethodStats(object):
+    __slots__ = ('calls', 'errors', 'bytes', 'cache_hits', 'session_rejections', 'network', 'decode')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.session_rejections = 0
+        self.network = _Histogram()
+        self.decode = _Histogram()
+
+
+class Metrics(RequestHook):
+    """
+    Counters and latency histograms for each API method and endpoint.
+
+    Every client keeps one in its ``metrics`` attribute. For each method
+    and endpoint it counts the HTTP requests made, retries included, which
+    is what the daily quota is charged for, the requests that failed, the
+    bytes received, the calls answered by the client's caches and the
+    sessions the API rejected. Network and JSON decode times are kept as
+    histograms.
+    Session creation and testing show up as the ``createsession`` and
+    ``testsession`` methods.
+
+    A single instance can be shared by several clients. It is thread-safe.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        self.since = time.time()
+
+    def _get(self, method, endpoint):
+        stats = self._stats.get((method, endpoint))
+        if stats is None:
+            stats = self._stats[(method, endpoint)] = _MethodStats()
+        return stats
+
+    def after_request(self, request):
+        with self._lock:
+            stats = self._get(request.method, request.endpoint)
+            stats.calls += 1
+            stats.bytes += request.bytes
+            stats.network.add(request.network_time)
+            if request.error is not None:
+                stats.errors += 1
+            else:
+                stats.decode.add(request.decode_time)
+
+    def record_cache_hits(self, method, endpoint, hits=1):
+        """
+        :param method: The API method answered from a cache
+        :param endpoint: The endpoint URL the call was for
+        :param hits: The number of calls or matches answered
+        """
+        if hits:
+            with self._lock:
+                self._get(method, endpoint).cache_hits += hits
+
+    def record_session_rejected(self, method, endpoint):
+        """
+        :param method: The API method whose request was rejected for using an invalid session
+        :param endpoint: The endpoint URL of the request
+        """
+        with self._lock:
+            self._get(method, endpoint).session_rejections += 1
+
+    def snapshot(self):
+        """
+        :return: A dictionary with the time the metrics have been collected since, as a UNIX timestamp, under
+            ``since``, and a list of dictionaries under ``methods``, one per method and endpoint. Each has the keys
+            ``method``, ``endpoint``, ``calls``, ``errors``, ``bytes``, ``cache_hits`` and ``session_rejections``,
+            and the histograms ``network_time`` and ``decode_time``. A histogram is a dictionary of its ``count``,
+            ``sum`` in seconds, cumulative ``buckets`` as ``(upper bound, count)`` pairs, and the upper bounds of the
+            buckets holding its ``p50`` and ``p99``.
+        """
+        with self._lock:
+            return {'since': self.since, 'methods': [
+                {'method': method, 'endpoint': endpoint, 'calls': stats.calls, 'errors': stats.errors,
+                 'bytes': stats.bytes, 'cache_hits': stats.cache_hits, 'session_rejections': stats.session_rejections,
+                 'network_time': stats.network.snapshot(), 'decode_time': stats.decode.snapshot()}
+                for (method, endpoint), stats in sorted(self._stats.items())]}
+
+    def reset(self):
+        """
+        Sets every counter back to zero.
+        """
+        with self._lock:
+            self._stats.clear()
+            self.since = time.time()
+
+
+class SmiteClient(object):
+    """
+    Represents a connection to the Smite API.
+    This class is used to interact with the API and retrieve information in JSON.
+
+    Note
+    -----
+    Any player with Privacy Mode enabled in-game will return
+    a null dataset from methods that require a player name
+
+    Note
+    -----
+    A client can be shared between threads. Every API method takes an
+    optional ``endpoint`` argument to query a platform other than the
+    client's default one, and a separate session is kept for each endpoint.
+    """
+    _RESPONSE_FORMAT = 'Json'
+    _MATCH_BATCH_SIZE = 10
+    _MODELS = {'getgods': God, 'getitems': Item, 'getplayer': Player}
+
+    def __init__(self, dev_id, auth_key, lang=1, session_store=None, transport=None, cache=None, match_cache=None,
+                 rate_limiter=None, retry_policy=None, circuit_breaker=None, models=False, coalescer=None, quiet=False,
+                 metrics=None, hooks=(), scheduler=None):
+        """
+        :param dev_id: Your private developer ID supplied by Hi-rez. Can be requested here: https://fs12.formsite.com/HiRez/form48/secure_index.html
+        :param auth_key: Your authorization key
+        :param lang: the language code needed by some queries, default to english.
+        :param session_store: A :class:`SessionStore` to share sessions through, such as a :class:`FileSessionStore`
+            shared between worker processes. Defaults to a store private to this client.
+        :param transport: The :class:`Transport` used to send requests. Share an :class:`HTTPTransport` between
+            clients to share its connection pools. Defaults to an :class:`HTTPTransport` private to this client.
+        :param cache: A :class:`ResponseCache` to serve repeated requests from. Responses are not cached by default.
+        :param match_cache: A :class:`smite.matchcache.SQLiteMatchCache` to keep finished matches in. When set,
+            :meth:`get_match_details` and :meth:`get_match_details_batch` serve matches from it without any API calls.
+        :param rate_limiter: A :class:`RateLimiter` that requests are throttled by. Requests are not throttled by default.
+        :param retry_policy: The :class:`RetryPolicy` for requests that fail with a transient error.
+            Defaults to up to 3 retries. Session creation is never retried.
+        :param circuit_breaker: The :class:`CircuitBreaker` tracking failing endpoints. Defaults to one private to this client.
+        :param models: Whether to return gods, items, players and matches as the compact models of :mod:`smite.models`
+            instead of dictionaries.
+        :param coalescer: The :class:`RequestCoalescer` that identical concurrent requests are merged by.
+            Defaults to one private to this client. Pass your own to read its counters or to share it between clients.
+        :param quiet: Whether to skip logging every request URL, even when the ``smitepython`` logger is at DEBUG level.
+            Useful for high-throughput jobs that want the library's warnings but not a line per request.
+        :param metrics: The :class:`Metrics` requests are counted in. Defaults to one private to this client.
+            Pass your own to share it between clients.
+        :param hooks: :class:`RequestHook` objects called before and after every HTTP request
+        :param scheduler: A :class:`RequestScheduler` deciding the order requests are sent in when they compete
+            for capacity. Share one between the clients of a developer ID.
+        """
+        self.dev_id = str(dev_id)
+        self.auth_key = str(auth_key)
+        self.lang = lang
+        self._transport = transport if transport is not None else HTTPTransport()
+        self._session_store = session_store
+        self._session_managers = {}
+        self._session_managers_lock = threading.Lock()
+        self._cache = cache
+        self._match_cache = match_cache
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self._models = models
+        self.quiet = quiet
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._hooks = [self.metrics] + list(hooks)
+        self._scheduler = scheduler
+        self._coalescer = coalescer if coalescer is not None else RequestCoalescer()
+        self._BASE_URL = Endpoint.PC.value
+        logger.debug('dev_id: %s, lang: %s', self.dev_id, self.lang)
+
+    def _base_url(self, endpoint):
+        if endpoint is None:
+            return self._BASE_URL
+        if not isinstance(endpoint, Endpoint):
+            raise SmiteError("You need to use an enum to select an endpoint")
+        return endpoint.value
+
+    def _get_sessions(self, base_url):
+        sessions = self._session_managers.get(base_url)
+        if sessions is None:
+            with self._session_managers_lock:
+                sessions = self._session_managers.get(base_url)
+                if sessions is None:
+                    sessions = self._session_managers[base_url] = self._new_session_manager(base_url)
+        return sessions
+
+    def _session_key(self, base_url):
+        # PC sessions keep the plain developer ID as their key, so existing session files stay valid
+        return self.dev_id if base_url == Endpoint.PC.value else '{}@{}'.format(self.dev_id, base_url)
+
+    def _new_session_manager(self, base_url):
+        return SessionManager(functools.partial(self._create_session, base_url), self._session_key(base_url),
+                              self._session_store)
+
+    def _make_request(self, methodname, parameters=None, endpoint=None):
+        base_url = self._base_url(endpoint)
+        cache_key = self._cache_key(methodname, parameters, base_url)
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self.metrics.record_cache_hits(methodname, base_url)
+                return self._to_models(methodname, cached)
+
+        jsonfinal = self._coalescer.call(self._request_key(methodname, parameters, base_url),
+                                         lambda: self._request(methodname, parameters, base_url))
+        if cache_key is not None:
+            self._cache.set(methodname, cache_key, jsonfinal)
+        return self._to_models(methodname, jsonfinal)
+
+    def _request_key(self, methodname, parameters, base_url):
+        return self.dev_id, methodname, tuple(str(param) for param in parameters or ()), base_url
+
+    def _request(self, methodname, parameters, base_url):
+        if self._rate_limiter is not None and self._rate_limiter.begin_refresh():
+            self._refresh_rate_limits(base_url)
+        sessions = self._get_sessions(base_url)
+        session_id = sessions.get()
+        jsonfinal = self._send_request(methodname, parameters, session_id, base_url)
+        if self._is_invalid_session(jsonfinal):
+            logger.info('Session was rejected by the SmiteAPI, retrying %s with a new session', methodname)
+            self.metrics.record_session_rejected(methodname, base_url)
+            sessions.invalidate(session_id)
+            jsonfinal = self._send_request(methodname, parameters, sessions.get(), base_url)
+            if self._is_invalid_session(jsonfinal):
+                raise SessionError(self._ret_msg(jsonfinal))
+        if self._is_quota_exceeded(jsonfinal):
+            raise QuotaExceededError(self._ret_msg(jsonfinal))
+        if not jsonfinal:
+            raise NoResultError("Request was successful, but returned no data.") from None
+        return jsonfinal
+
+    def _to_models(self, methodname, result):
+        model = self._MODELS.get(methodname) if self._models else None
+        if model is None:
+            return result
+        return [model(row) for row in result]
+
+    def _to_match(self, match_id, rows):
+        return Match(match_id, rows) if self._models else rows
+
+    def _cache_key(self, methodname, parameters, base_url):
+        if self._cache is None or not self._cache.is_cached(methodname):
+            return None
+        return methodname, tuple(str(param) for param in parameters or ()), base_url, self.lang
+
+    def _refresh_rate_limits(self, base_url):
+        data_used = None
+        try:
+            data_used = self._send_request('getdataused', None, self._get_sessions(base_url).get(), base_url)
+        except SmiteError:
+            logger.warning('Could not refresh rate limits from getdataused')
+        finally:
+            self._rate_limiter.finish_refresh(data_used)
+
+    def _send_request(self, methodname, parameters, session_id, base_url=None):
+        url = self._build_request_url(methodname, parameters, session_id, base_url)
+        url = url.replace(' ', '%20')  # Cater for spaces in parameters
+        if not self.quiet:
+            logger.debug('Built request URL for %s: %s', methodname, url)
+        try:
+            return self._get_json(methodname, url, base_url)
+        except urllib.error.HTTPError as e:
+            raise self._request_error(e) from None
+
+    def _begin_request(self, methodname, url, base_url, waiting_since):
+        request = RequestInfo(methodname, base_url if base_url is not None else self._BASE_URL, url)
+        for hook in self._hooks:
+            hook.before_request(request)
+        request.started = time.perf_counter()
+        request.queue_time = request.started - waiting_since
+        return request
+
+    def _end_request(self, request):
+        for hook in self._hooks:
+            hook.after_request(request)
+
+    def _decode(self, request, html):
+        received = time.perf_counter()
+        request.network_time = received - request.started
+        request.bytes = len(html)
+        result = json.loads(html.decode('utf-8'))
+        request.decode_time = time.perf_counter() - received
+        return result
+
+    def _get_json(self, methodname, url, base_url=None, idempotent=True, session=False):
+        waiting_since = time.perf_counter()
+        if self._scheduler is None:
+            request, html = self._fetch(methodname, url, base_url, waiting_since, idempotent, session)
+        else:
+            self._scheduler.acquire(methodname)
+            try:
+                request, html = self._fetch(methodname, url, base_url, waiting_since, idempotent, session)
+            finally:
+                self._scheduler.release()
+        try:
+            result = self._decode(request, html)
+        except Exception as e:
+            request.error = e
+            self._end_request(request)
+            raise
+        self._end_request(request)
+        return result
+
+    def _fail_request(self, request, error):
+        request.network_time = time.perf_counter() - request.started
+        request.error = error
+        self._end_request(request)
+
+    @staticmethod
+    def _request_error(error):
+        if error.code == 404:
+            return NoResultError("Request invalid. API auth details may be incorrect.")
+        if error.code == 400:
+            return NoResultError("Request invalid. Bad request.")
+        return SmiteError("Request failed with HTTP {} {}".format(error.code, error.reason))
+
+    def _stream_request(self, methodname, parameters=None, endpoint=None):
+        base_url = self._base_url(endpoint)
+        if self._rate_limiter is not None and self._rate_limiter.begin_refresh():
+            self._refresh_rate_limits(base_url)
+        sessions = self._get_sessions(base_url)
+        session_id = sessions.get()
+        for attempt in range(2):
+            url = self._build_request_url(methodname, parameters, session_id, base_url)
+            url = url.replace(' ', '%20')  # Cater for spaces in parameters
+            if not self.quiet:
+                logger.debug('Built streaming request URL for %s: %s', methodname, url)
+            try:
+                request, chunks = self._scheduled_fetch_stream(methodname, url, base_url)
+            except urllib.error.HTTPError as e:
+                raise self._request_error(e) from None
+            elements = iter_json_array(self._measure_stream(request, chunks))
+            first = next(elements, None)
+            if first is None:
+                raise NoResultError("Request was successful, but returned no data.")
+            if self._is_invalid_session([first]):
+                elements.close()
+                if attempt > 0:
+                    raise SessionError(self._ret_msg([first]))
+                logger.info('Session was rejected by the SmiteAPI, retrying %s with a new session', methodname)
+                self.metrics.record_session_rejected(methodname, base_url)
+                sessions.invalidate(session_id)
+                session_id = sessions.get()
+                continue
+            if self._is_quota_exceeded([first]):
+                elements.close()
+                raise QuotaExceededError(self._ret_msg([first]))
+            model = self._MODELS.get(methodname) if self._models else None
+            if model is None:
+                yield first
+                yield from elements
+            else:
+                yield model(first)
+                for element in elements:
+                    yield model(element)
+            return
+
+    def _measure_stream(self, request, chunks):
+        try:
+            for chunk in chunks:
+                request.bytes += len(chunk)
+                yield chunk
+        except Exception as e:
+            request.error = e
+            raise
+        finally:
+            request.network_time = time.perf_counter() - request.started
+            self._end_request(request)
+
+    def _scheduled_fetch_stream(self, methodname, url, base_url):
+        # The scheduler's slot is held until the response starts, not until the whole body is read
+        waiting_since = time.perf_counter()
+        if self._scheduler is None:
+            return self._fetch_stream(methodname, url, base_url, waiting_since)
+        self._scheduler.acquire(methodname)
+        try:
+            return self._fetch_stream(methodname, url, base_url, waiting_since)
+        finally:
+            self._scheduler.release()
+
+    def _fetch_stream(self, methodname, url, base_url, waiting_since):
+        return self._fetch_with(self._transport.stream, methodname, url, base_url, waiting_since, True, False)
+
+    def _fetch(self, methodname, url, base_url, waiting_since, idempotent=True, session=False):
+        return self._fetch_with(self._transport.get, methodname, url, base_url, waiting_since, idempotent, session)
+
+    def _fetch_with(self, send, methodname, url, base_url, waiting_since, idempotent, session):
+        """
+        Sends a request, retrying it while it fails with a transient error. Hooks are called for every attempt
+        that reaches the transport.
+
+        :param send: The transport method sending the request
+        :return: The :class:`RequestInfo` of the attempt that succeeded, and what send returned
+        """
+        key = urllib.parse.urlsplit(url).netloc
+        attempt = 0
+        while True:
+            self._circuit_breaker.before_request(key)
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(session)
+            request = self._begin_request(methodname, url, base_url, waiting_since)
+            try:
+                response = send(url)
+            except Exception as e:
+                self._fail_request(request, e)
+                delay = self._handle_fetch_error(key, e, attempt, idempotent)
+            else:
+                self._circuit_breaker.record_success(key)
+                return request, response
+            waiting_since = time.perf_counter()
+            time.sleep(delay)
+            attempt += 1
+
+    def _handle_fetch_error(self, key, error, attempt, idempotent):
+        if not self._retry_policy.is_retryable(error):
+            if isinstance(error, urllib.error.HTTPError):
+                # The API answered, so the endpoint itself is healthy
+                self._circuit_breaker.record_success(key)
+            raise error
+        self._circuit_breaker.record_failure(key)
+        delay = self._retry_policy.delay(attempt) if idempotent else None
+        if delay is None:
+            logger.warning('Request to %s failed after %d attempt(s): %r', key, attempt + 1, error)
+            raise SmiteError("Request to {} failed after {} attempt(s): {!r}".format(key, attempt + 1, error)) from error
+        logger.warning('Request to %s failed (%r), retrying in %.2f seconds', key, error, delay)
+        return delay
+
+    @staticmethod
+    def _ret_msg(response):
+        if isinstance(response, list) and response:
+            response = response[0]
+        if isinstance(response, dict):
+            ret_msg = response.get('ret_msg')
+            if isinstance(ret_msg, str):
+                return ret_msg
+        return None
+
+    @classmethod
+    def _is_invalid_session(cls, response):
+        ret_msg = cls._ret_msg(response)
+        return ret_msg is not None and 'invalid session' in ret_msg.lower()
+
+    @classmethod
+    def _is_quota_exceeded(cls, response):
+        ret_msg = cls._ret_msg(response)
+        return ret_msg is not None and _is_quota_message(ret_msg)
+
+    def _build_request_url(self, methodname, parameters=(), session_id=None, base_url=None):
+        if base_url is None:
+            base_url = self._BASE_URL
+        timestamp = self._create_now_timestamp()
+        signature = self._create_signature(methodname, timestamp)
+        if session_id is None:
+            session_id = self._get_sessions(base_url).get()
+
+        path = [methodname + SmiteClient._RESPONSE_FORMAT, self.dev_id, signature, session_id, timestamp]
+        if parameters:
+            path += [str(param) for param in parameters]
+        return base_url + '/'.join(path)
+
+    def _build_session_url(self, base_url=None):
+        if base_url is None:
+            base_url = self._BASE_URL
+        timestamp = self._create_now_timestamp()
+        signature = self._create_signature('createsession', timestamp)
+        return '{0}/createsessionJson/{1}/{2}/{3}'.format(base_url, self.dev_id, signature, timestamp)
+
+    def _create_session(self, base_url=None):
+        url = self._build_session_url(base_url)
+        try:
+            return self._get_json('createsession', url, base_url, idempotent=False, session=True)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                raise NoResultError("Couldn't create session. API auth details may be incorrect.") from None
+            raise SmiteError("Couldn't create session: HTTP {} {}".format(e.code, e.reason)) from None
+
+    def _create_now_timestamp(self):
+        datime_now = datetime.utcnow()
+        return datime_now.strftime("%Y%m%d%H%M%S")
+
+    def _create_signature(self, methodname, now=None):
+        # The signature must be made from the same timestamp that is sent in the URL
+        if now is None:
+            now = self._create_now_timestamp()
+        return hashlib.md5(self.dev_id.encode('utf-8') + methodname.encode('utf-8') + self.auth_key.encode('utf-8') + now.encode('utf-8')).hexdigest()
+
+    def _switch_endpoint(self, endpoint):
+        # Changes the default endpoint of every caller. Pass endpoint= to a method to query another one instead.
+        if not isinstance(endpoint, Endpoint):
+            raise SmiteError("You need to use an enum to switch endpoints")
+        self._BASE_URL = endpoint.value
+        logger.debug('Endpoint switch. New call URL: %s', self._BASE_URL)
+        return
+
+    def ping(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Indicates whether the request was successful
+
+        Note
+        -----
+        Pinging the Smite API is used to establish connectivity.
+        You do not need to authenticate your ID or key to do this.
+        """
+        base_url = self._base_url(endpoint)
+        return self._get_json('ping', '{0}/pingJson'.format(base_url), base_url)
+
+    def get_data_used(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a dictionary of daily usage limits and the stats against those limits
+
+        Note
+        -----
+        Getting your data usage does contribute to your
+        daily API limits
+        """
+        return self._make_request('getdataused', endpoint=endpoint)
+
+    def get_patch_info(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns the version of the current game patch
+        """
+        return self._make_request('getpatchinfo', endpoint=endpoint)
+
+    def get_demo_details(self, match_id, endpoint=None):
+        """
+        :param match_id: ID of the match
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns information regarding a match
+
+        Note
+        -----
+        It is better practice to use :meth:`get_match_details`
+        """
+        return self._make_request('getdemodetails', [match_id], endpoint=endpoint)
+
+    def get_gods(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns all smite Gods and their various attributes
+        """
+        return self._make_request('getgods', [self.lang], endpoint=endpoint)
+
+    def iter_gods(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a generator of all smite Gods, decoded one at a time as the response arrives
+        """
+        return self._stream_request('getgods', [self.lang], endpoint=endpoint)
+    
+    def get_god_skins(self, god_id, endpoint=None):
+        """
+        :param: god_id: ID of god you are querying. Can be found in get_gods return result.
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returnss all skin information for a particular god
+        """
+        return self._make_request('getgodskins', [god_id], endpoint=endpoint)
+
+    def get_items(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns all Smite items and their various attributes
+        """
+        return self._make_request('getitems', [self.lang], endpoint=endpoint)
+
+    def iter_items(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a generator of all Smite items, decoded one at a time as the response arrives
+        """
+        return self._stream_request('getitems', [self.lang], endpoint=endpoint)
+
+    def get_god_recommended_items(self, god_id, endpoint=None):
+        """
+        :param god_id: ID of god you are querying. Can be found in get_gods return result.
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a dictionary of recommended items for a particular god
+        """
+        return self._make_request('getgodrecommendeditems', [god_id], endpoint=endpoint)
+
+    def get_esports_proleague_details(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns the matchup information for each matchup of the current eSports pro league session.
+        """
+        return self._make_request('getesportsproleaguedetails', endpoint=endpoint)
+
+    def get_top_matches(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns the 50 most watch or most recent recorded matches
+        """
+        return self._make_request('gettopmatches', endpoint=endpoint)
+
+    def get_match_details(self, match_id, endpoint=None):
+        """
+        :param match_id: The id of the match
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a dictionary of the match and it's attributes.
+        """
+        base_url = self._base_url(endpoint)
+        if self._match_cache is not None:
+            rows = self._match_cache.get(base_url, match_id)
+            if rows is not None:
+                self.metrics.record_cache_hits('getmatchdetails', base_url)
+                return self._to_match(match_id, rows)
+        rows = self._make_request('getmatchdetails', [match_id], endpoint)
+        if self._match_cache is not None and self._is_match_complete(rows):
+            self._match_cache.put(base_url, match_id, rows)
+        return self._to_match(match_id, rows)
+
+    def get_match_details_batch(self, match_ids, max_workers=4, endpoint=None):
+        """
+        :param match_ids: An iterable of match IDs
+        :param max_workers: The maximum number of batch requests sent at once
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a dictionary mapping each match ID to the list of player rows for that match,
+            in the order the IDs were given. Matches with no data map to an empty list.
+
+        Note
+        -----
+        IDs are fetched in batches of 10, the most the API allows per request.
+        """
+        base_url = self._base_url(endpoint)
+        match_ids, cached, chunks = self._plan_match_details_batch(match_ids, base_url)
+        if len(chunks) <= 1:
+            results = [self._get_match_details_chunk(chunk, endpoint) for chunk in chunks]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(min(max_workers, len(chunks))) as executor:
+                fetch = functools.partial(self._get_match_details_chunk, endpoint=endpoint)
+                results = list(executor.map(fetch, chunks))
+        return self._finish_match_details_batch(match_ids, cached, chunks, results, base_url)
+
+    def iter_match_details_batch(self, match_ids, endpoint=None):
+        """
+        :param match_ids: An iterable of match IDs
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a generator of ``(match_id, rows)`` tuples. Only one batch of 10 matches is held
+            in memory at a time. Matches are not necessarily returned in the order they were given.
+        """
+        base_url = self._base_url(endpoint)
+        match_ids, cached, chunks = self._plan_match_details_batch(match_ids, base_url)
+        for match_id in match_ids:
+            if str(match_id) in cached:
+                yield match_id, self._to_match(match_id, cached[str(match_id)])
+        for chunk in chunks:
+            try:
+                rows = list(self._stream_request('getmatchdetailsbatch', [','.join(str(match_id) for match_id in chunk)],
+                                                 endpoint))
+            except NoResultError:
+                logger.debug('No details for any of the matches %s', chunk)
+                rows = []
+            fetched = self._finish_match_details_batch(chunk, {}, [chunk], [rows], base_url)
+            for match_id, match in fetched.items():
+                yield match_id, match
+
+    def _get_match_details_chunk(self, chunk, endpoint=None):
+        try:
+            return self._make_request('getmatchdetailsbatch', [','.join(str(match_id) for match_id in chunk)], endpoint)
+        except NoResultError:
+            logger.debug('No details for any of the matches %s', chunk)
+            return []
+
+    def _plan_match_details_batch(self, match_ids, base_url):
+        match_ids = list(collections.OrderedDict.fromkeys(match_ids))
+        cached = {}
+        if self._match_cache is not None:
+            cached = self._match_cache.get_many(base_url, match_ids)
+            self.metrics.record_cache_hits('getmatchdetails', base_url, len(cached))
+        missing = [match_id for match_id in match_ids if str(match_id) not in cached]
+        size = self._MATCH_BATCH_SIZE
+        return match_ids, cached, [missing[i:i + size] for i in range(0, len(missing), size)]
+
+    def _finish_match_details_batch(self, match_ids, cached, chunks, results, base_url):
+        fetched = self._group_match_rows([match_id for chunk in chunks for match_id in chunk], results)
+        if self._match_cache is not None:
+            self._match_cache.put_many(base_url, [(match_id, rows) for match_id, rows in fetched.items()
+                                                  if self._is_match_complete(rows)])
+        return collections.OrderedDict(
+            (match_id, self._to_match(match_id, cached[str(match_id)] if str(match_id) in cached else fetched[match_id]))
+            for match_id in match_ids)
+
+    @staticmethod
+    def _is_match_complete(rows):
+        return _is_complete_response(rows)
+
+    @staticmethod
+    def _group_match_rows(match_ids, results):
+        by_key = collections.OrderedDict((str(match_id), []) for match_id in match_ids)
+        for rows in results:
+            for row in rows:
+                match_rows = by_key.get(str(row.get('Match')))
+                if match_rows is not None:
+                    match_rows.append(row)
+        return collections.OrderedDict(zip(match_ids, by_key.values()))
+
+    def get_match_ids_by_queue(self, queue, date, hour=-1, endpoint=None):
+        """
+        :param queue: The queue to obtain data from
+        :param date: The date to obtain data from
+        :param hour: The hour to obtain data from (0-23, -1 = all day)
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a list of all match IDs for a specific match queue for given time frame
+        """
+        return self._make_request('getmatchidsbyqueue', [queue, date, hour], endpoint=endpoint)
+
+    def iter_match_ids_by_queue(self, queue, date, hour=-1, endpoint=None):
+        """
+        :param queue: The queue to obtain data from
+        :param date: The date to obtain data from
+        :param hour: The hour to obtain data from (0-23, -1 = all day)
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a generator of the match IDs for a specific match queue, decoded one at a time
+        """
+        return self._stream_request('getmatchidsbyqueue', [queue, date, hour], endpoint=endpoint)
+
+    def get_league_leaderboard(self, queue, tier, season, endpoint=None):
+        """
+        :param queue: The queue to obtain data from
+        :param tier: The tier to obtain data from
+        :param season: The season to obtain data from
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns the top players for a particular league
+        """
+        return self._make_request('getleagueleaderboard', [queue, tier, season], endpoint=endpoint)
+
+    def iter_league_leaderboard(self, queue, tier, season, endpoint=None):
+        """
+        :param queue: The queue to obtain data from
+        :param tier: The tier to obtain data from
+        :param season: The season to obtain data from
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a generator of the top players for a particular league, decoded one at a time
+        """
+        return self._stream_request('getleagueleaderboard', [queue, tier, season], endpoint=endpoint)
+
+    def get_league_seasons(self, queue, endpoint=None):
+        """
+        :param queue: The queue to obtain data from
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a list of seasons for a match queue
+        """
+        return self._make_request('getleagueseasons', [queue], endpoint=endpoint)
+
+    def get_team_details(self, clan_id, endpoint=None):
+        """
+        :param clan_id: The id of the clan
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns the details of the clan in a python dictionary
+        """
+        return self._make_request('getteamdetails', [clan_id], endpoint=endpoint)
+
+    def get_team_match_history(self, clan_id, endpoint=None):
+        """
+        :param clan_id: The ID of the clan.
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a history of matches from the given clan.
+
+        Warning
+        -----
+        This method is deprecated and will return a null dataset
+        """
+        return self._make_request('getteammatchhistory', [clan_id], endpoint=endpoint)
+
+    def get_team_players(self, clan_id, endpoint=None):
+        """
+        :param clan_id: The ID of the clan
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a list of players for the given clan.
+        """
+        return self._make_request('getteamplayers', [clan_id], endpoint=endpoint)
+
+    def search_teams(self, search_team, endpoint=None):
+        """
+        :param search_team: The string search term to search against
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns high level information for clan names containing search_team string
+        """
+        return self._make_request('searchteams', [search_team], endpoint=endpoint)
+
+    def get_player(self, player_name, endpoint=None):
+        """
+        :param player_name: the string name of a player
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns league and non-league high level data for a given player name
+        """
+        return self._make_request('getplayer', [player_name], endpoint=endpoint)
+
+    def get_player_on_all_endpoints(self, player_name, endpoints=tuple(Endpoint)):
+        """
+        :param player_name: the string name of a player
+        :param endpoints: The :class:`Endpoint` members to query, defaults to all of them
+        :return: Returns a dictionary mapping each endpoint to the player's data there, or None if the player
+            wasn't found on it. The endpoints are queried at the same time.
+        """
+        return self._fan_out(self.get_player, [player_name], endpoints)
+
+    def _fan_out(self, method, args, endpoints):
+        endpoints = list(endpoints)
+        with concurrent.futures.ThreadPoolExecutor(max(len(endpoints), 1)) as executor:
+            futures = [executor.submit(method, *args, endpoint=endpoint) for endpoint in endpoints]
+        results = collections.OrderedDict()
+        for endpoint, future in zip(endpoints, futures):
+            try:
+                results[endpoint] = future.result()
+            except NoResultError:
+                logger.debug('%s found nothing on %s', method.__name__, endpoint)
+                results[endpoint] = None
+        return results
+
+    def get_player_achievements(self, player_id, endpoint=None):
+        """
+        :param player_id: ID of a player
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a select number of achievement totals for the specified player ID
+        """
+        return self._make_request('getplayerachievements', [player_id], endpoint=endpoint)
+
+    def get_player_status(self, player_name, endpoint=None):
+        """
+        :param player_name: the string name of a player
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns the current online status of a player
+        """
+        return self._make_request('getplayerstatus', [player_name], endpoint=endpoint)
+
+    def get_friends(self, player, endpoint=None):
+        """
+        :param player: The player name or a player ID
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a list of friends
+        """
+        return self._make_request('getfriends', [player], endpoint=endpoint)
+
+    def iter_friends(self, player, endpoint=None):
+        """
+        :param player: The player name or a player ID
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a generator of friends, decoded one at a time as the response arrives
+        """
+        return self._stream_request('getfriends', [player], endpoint=endpoint)
+
+    def get_god_ranks(self, player, endpoint=None):
+        """
+        :param player: The player name or player ID
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns the rank and worshippers value for each God the player has played
+        """
+        return self._make_request('getgodranks', [player], endpoint=endpoint)
+
+    def get_match_history(self, player, endpoint=None):
+        """
+        :param player: The player name or player ID
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns the recent matches and high level match statistics for a particular player.
+        """
+        return self._make_request('getmatchhistory', [str(player)], endpoint=endpoint)
+
+    def iter_match_history(self, player, endpoint=None):
+        """
+        :param player: The player name or player ID
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a generator of the recent matches for a particular player, decoded one at a time
+        """
+        return self._stream_request('getmatchhistory', [str(player)], endpoint=endpoint)
+
+    def get_match_player_details(self, match_id, endpoint=None):
+        """
+        :param match_id: The ID of the match
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns player information for a live match
+        """
+        return self._make_request('getmatchplayerdetails', [match_id], endpoint=endpoint)
+
+    def get_motd(self, endpoint=None):
+        """
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns information about the most recent Match of the Days
+        """
+        return self._make_request('getmotd', endpoint=endpoint)
+
+    def get_queue_stats(self, player, queue, endpoint=None):
+        """
+        :param player: The player name or player ID
+        :param queue: The id of the game mode
+        :param endpoint: The :class:`Endpoint` to query, defaults to the client's endpoint
+        :return: Returns match summary statistics for a player and queue
+        """
+        return self._make_request('getqueuestats', [str(player), str(queue)], endpoint=endpoint)
@@ -0,0 +1,68 @@
+"""
+    Storage helpers shared by the caches, stores and checkpoints of this package.
+"""
+import json
+import os
+import sqlite3
+import threading
+
+
+def dump_json_atomically(data, path, **kwargs):
+    """
+    Writes data as JSON to a temporary file next to path and moves it into place, so readers never see
+    a partly written file.
+
+    :param data: The data to write
+    :param path: Path of the file to replace
+    :param kwargs: Further arguments passed to :func:`json.dump`
+    """
+    tmp_path = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp_path, path)
+
+
+class SQLiteDatabase(object):
+    """
+    An SQLite connection shared between threads, for the stores of this package.
+
+    The database is opened in WAL mode, so it can be shared between
+    processes, and every statement runs under a lock.
+    """
+    # SQLite limits the number of host parameters in a single statement
+    _MAX_QUERY_PARAMS = 900
+
+    def __init__(self, path, schema):
+        """
+        :param path: Path of the database file. It is created if it doesn't exist.
+        :param schema: An iterable of statements creating the tables if they don't exist
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in schema:
+            self._conn.execute(statement)
+
+    def _select_many(self, query, params, keys):
+        """
+        Runs a query with an ``IN ({})`` clause over any number of keys. Must be called with the lock held.
+
+        :param query: The query, with ``{}`` in place of the list of keys
+        :param params: The parameters before the keys
+        :param keys: A list of keys, which are queried in chunks
+        :return: A list of the rows found
+        """
+        found = []
+        for i in range(0, len(keys), self._MAX_QUERY_PARAMS):
+            chunk = keys[i:i + self._MAX_QUERY_PARAMS]
+            found += self._conn.execute(query.format(','.join('?' * len(chunk))), list(params) + chunk).fetchall()
+        return found
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
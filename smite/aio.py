@@ -0,0 +1,790 @@
+"""
+    asyncio support for smite-python.
+
+    :class:`AsyncSmiteClient` exposes the same methods as :class:`smite.SmiteClient`,
+    but every method returns an awaitable instead of blocking.
+"""
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import http.client
+import io
+import socket
+import time
+import urllib.error
+import urllib.parse
+
+from smite import (NoResultError, QuotaExceededError, RequestCoalescer, RequestScheduler, SessionError, SessionManager,
+                   SmiteClient, SmiteError, logger)
+from smite.streaming import aiter_json_array
+
+
+class AsyncConnectionPool(object):
+    """
+    A pool of persistent HTTP/1.1 connections to a single host, built on asyncio streams.
+    """
+
+    def __init__(self, host, port=None, scheme='http', maxsize=10, idle_timeout=60, connect_timeout=10,
+                 read_timeout=30):
+        """
+        :param host: The host to connect to
+        :param port: The port to connect to, defaults to the scheme's default port
+        :param scheme: Either ``http`` or ``https``
+        :param maxsize: The maximum number of idle connections kept open
+        :param idle_timeout: Number of seconds after which an idle connection is closed
+        :param connect_timeout: Number of seconds to wait for a connection to be established
+        :param read_timeout: Number of seconds to wait for a response once the request is sent
+        """
+        self.host = host
+        self.scheme = scheme
+        self.port = port or (443 if scheme == 'https' else 80)
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._idle = collections.deque()
+        if self.port in (80, 443):
+            self._host_header = host
+        else:
+            self._host_header = '{}:{}'.format(host, self.port)
+
+    async def _new_conn(self):
+        try:
+            return await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=self.scheme == 'https'), self.connect_timeout)
+        except asyncio.TimeoutError:
+            raise socket.timeout('Timed out connecting to {}'.format(self.host)) from None
+
+    def _get_idle_conn(self):
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][2] > self.idle_timeout:
+            self._idle.popleft()[1].close()
+        if self._idle:
+            reader, writer, _ = self._idle.pop()
+            return reader, writer
+        return None
+
+    def _put_conn(self, reader, writer):
+        if len(self._idle) < self.maxsize:
+            self._idle.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+
+    async def request(self, path):
+        """
+        :param path: The path and query string to request
+        :return: A ``(status, reason, headers, body)`` tuple
+        """
+        reader, writer, response = await self._open(path, self._exchange)
+        status, reason, headers, body, will_close = response
+        if will_close:
+            writer.close()
+        else:
+            self._put_conn(reader, writer)
+        return status, reason, headers, body
+
+    async def stream(self, path, chunk_size=65536):
+        """
+        :param path: The path and query string to request
+        :param chunk_size: The maximum number of bytes read from the socket at once
+        :return: A ``(status, reason, headers, chunks)`` tuple, where chunks is an asynchronous generator of the
+            body's bytes. The connection goes back to the pool once the body has been read to the end.
+        """
+        reader, writer, response = await self._open(path, self._read_head)
+        status, reason, headers, will_close = response
+        return status, reason, headers, self._stream_body(reader, writer, headers, will_close, chunk_size)
+
+    async def _open(self, path, exchange):
+        conn = self._get_idle_conn()
+        reused = conn is not None
+        if conn is None:
+            conn = await self._new_conn()
+        reader, writer = conn
+        try:
+            try:
+                response = await self._send(exchange(reader, writer, path))
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+                # The server closed the idle connection, retry on a fresh one
+                writer.close()
+                reader, writer = await self._new_conn()
+                response = await self._send(exchange(reader, writer, path))
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer, response
+
+    async def _send(self, exchange):
+        try:
+            return await asyncio.wait_for(exchange, self.read_timeout)
+        except asyncio.TimeoutError:
+            raise socket.timeout('Timed out waiting for a response from {}'.format(self.host)) from None
+
+    async def _exchange(self, reader, writer, path):
+        status, reason, headers, will_close = await self._read_head(reader, writer, path)
+        body = b''.join([chunk async for chunk in self._iter_body(reader, headers, 65536)])
+        return status, reason, headers, body, will_close
+
+    async def _read_head(self, reader, writer, path):
+        writer.write('GET {} HTTP/1.1\r\nHost: {}\r\nAccept-Encoding: identity\r\n\r\n'.format(
+            path, self._host_header).encode('latin-1'))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed before a response was received')
+        version, status, reason = (status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+        headers = http.client.HTTPMessage()
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip()] = value.strip()
+
+        connection = (headers.get('Connection') or '').lower()
+        will_close = connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive')
+        if (headers.get('Transfer-Encoding') or '').lower() != 'chunked' and headers.get('Content-Length') is None:
+            # The body ends when the server closes the connection
+            will_close = True
+        return int(status), reason, headers, will_close
+
+    @staticmethod
+    async def _iter_body(reader, headers, chunk_size):
+        if (headers.get('Transfer-Encoding') or '').lower() == 'chunked':
+            while True:
+                size = int((await reader.readline()).split(b';', 1)[0], 16)
+                if not size:
+                    break
+                while size:
+                    chunk = await reader.readexactly(min(size, chunk_size))
+                    size -= len(chunk)
+                    yield chunk
+                await reader.readexactly(2)
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+        elif headers.get('Content-Length') is not None:
+            remaining = int(headers['Content-Length'])
+            while remaining:
+                chunk = await reader.readexactly(min(remaining, chunk_size))
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            while True:
+                chunk = await reader.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    async def _stream_body(self, reader, writer, headers, will_close, chunk_size):
+        complete = False
+        body = self._iter_body(reader, headers, chunk_size)
+        try:
+            while True:
+                try:
+                    chunk = await self._send(body.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield chunk
+            complete = True
+        finally:
+            await body.aclose()
+            if complete and not will_close:
+                self._put_conn(reader, writer)
+            else:
+                writer.close()
+
+    def close(self):
+        """
+        Closes all idle connections in the pool.
+        """
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+class AsyncHTTPTransport(object):
+    """
+    The asyncio counterpart of :class:`smite.HTTPTransport`, keeping an
+    :class:`AsyncConnectionPool` for each endpoint host.
+
+    A transport must only be used from the event loop it was first used on.
+    """
+
+    def __init__(self, pool_size=10, idle_timeout=60, connect_timeout=10, read_timeout=30):
+        """
+        :param pool_size: The maximum number of idle connections kept open per endpoint
+        :param idle_timeout: Number of seconds after which an idle connection is closed
+        :param connect_timeout: Number of seconds to wait for a connection to be established
+        :param read_timeout: Number of seconds to wait for a response once the request is sent
+        """
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._pools = {}
+
+    def _get_pool(self, parts):
+        key = (parts.scheme, parts.hostname, parts.port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = AsyncConnectionPool(parts.hostname, parts.port, parts.scheme, self.pool_size, self.idle_timeout,
+                                       self.connect_timeout, self.read_timeout)
+            self._pools[key] = pool
+        return pool
+
+    async def get(self, url):
+        """
+        :param url: The URL to request
+        :return: The body of the response
+
+        Raises :class:`urllib.error.HTTPError` if the response status is an error.
+        """
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        status, reason, headers, body = await self._get_pool(parts).request(path)
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, reason, headers, io.BytesIO(body))
+        return body
+
+    async def stream(self, url):
+        """
+        :param url: The URL to request
+        :return: An asynchronous generator of the bytes of the response body, read from the socket as they are needed
+
+        Raises :class:`urllib.error.HTTPError` if the response status is an error.
+        """
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        status, reason, headers, chunks = await self._get_pool(parts).stream(path)
+        if status >= 400:
+            body = b''.join([chunk async for chunk in chunks])
+            raise urllib.error.HTTPError(url, status, reason, headers, io.BytesIO(body))
+        return chunks
+
+    def close(self):
+        """
+        Closes all idle connections held by the transport.
+        """
+        for pool in self._pools.values():
+            pool.close()
+
+
+class AsyncSessionManager(SessionManager):
+    """
+    A :class:`smite.SessionManager` whose methods are coroutines.
+
+    Session creation is guarded by an :class:`asyncio.Lock`, so coroutines
+    that find the session expired at the same time wait for a single
+    createsession call instead of each making their own. The store's lock is
+    held too, as with :class:`smite.SessionManager`, so with a
+    :class:`smite.FileSessionStore` only one process creates the session.
+    The store is used from a thread of the manager's own, so waiting for
+    another process never blocks the event loop. The thread is stopped by
+    :meth:`close`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        SessionManager.__init__(self, *args, **kwargs)
+        self._lock = None
+        self._store_executor = None
+
+    def _get_lock(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def _in_store_thread(self, function, *args):
+        if self._store_executor is None:
+            # A single thread, so the store's lock is always released by the thread that took it
+            self._store_executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='smite-session-store')
+        return asyncio.get_event_loop().run_in_executor(self._store_executor, function, *args)
+
+    def close(self):
+        """
+        Stops the thread the store is used from. It is started again if the manager is used afterwards.
+        """
+        executor, self._store_executor = self._store_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def get(self):
+        """
+        :return: A session ID, creating a new session if the current one is missing or about to expire
+        """
+        if not self.is_valid():
+            async with self._get_lock():
+                if not self.is_valid():
+                    async with self._store_lock():
+                        stored = await self._in_store_thread(self.store.get, self.key)
+                        if stored and self._is_fresh(stored[1]):
+                            self._current = tuple(stored)
+                        else:
+                            return await self._refresh()
+        return self.session_id
+
+    async def refresh(self):
+        """
+        :return: The ID of a newly created session
+        """
+        async with self._get_lock(), self._store_lock():
+            return await self._refresh()
+
+    async def _refresh(self):
+        logger.info('Creating new session with the SmiteAPI')
+        session = await self._create()
+        return await self._in_store_thread(self._accept, session)
+
+    async def invalidate(self, session_id=None):
+        """
+        :param session_id: The session that was rejected. If it has already been replaced, nothing is done.
+        """
+        await self._in_store_thread(SessionManager.invalidate, self, session_id)
+
+    def _store_lock(self):
+        return _AsyncStoreLock(self)
+
+
+class _AsyncStoreLock(object):
+    """
+    Holds a :class:`smite.SessionStore` lock from the manager's store thread.
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._context = manager.store.lock(manager.key)
+
+    async def __aenter__(self):
+        return await self._manager._in_store_thread(self._context.__enter__)
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return await self._manager._in_store_thread(self._context.__exit__, exc_type, exc_value, traceback)
+
+
+class AsyncRequestCoalescer(RequestCoalescer):
+    """
+    A :class:`smite.RequestCoalescer` for coroutines.
+
+    Coroutines that make the same request while it is in flight await the
+    first one's result. If the first coroutine is cancelled, one of the
+    waiting coroutines sends the request instead.
+    """
+
+    async def call(self, key, fetch):
+        """
+        :param key: Identifies the request, calls with equal keys are coalesced
+        :param fetch: Callable returning an awaitable of the request's result
+        :return: The result of the request
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            self.coalesced -= 1
+
+        future = self._calls[key] = asyncio.get_event_loop().create_future()
+        self.requests += 1
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            self._forget(key)
+            future.cancel()
+            raise
+        except BaseException as e:
+            self._forget(key)
+            future.set_exception(e)
+            # Mark the exception as retrieved, nobody may be waiting for it
+            future.exception()
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+
+class AsyncRequestScheduler(RequestScheduler):
+    """
+    A :class:`smite.RequestScheduler` for coroutines.
+
+    :meth:`acquire` and :meth:`release` are coroutines. A scheduler must only
+    be used from one event loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        RequestScheduler.__init__(self, *args, **kwargs)
+        self._async_condition = None
+
+    def _get_condition(self):
+        if self._async_condition is None:
+            self._async_condition = asyncio.Condition()
+        return self._async_condition
+
+    async def acquire(self, methodname):
+        """
+        Waits until the request may be sent. Every call must be followed by a call to :meth:`release`.
+
+        :param methodname: The lowercase API method of the request
+        """
+        condition = self._get_condition()
+        async with condition:
+            entry = self._enqueue(methodname)
+            try:
+                while True:
+                    dispatched, timeout = self._try_dispatch(entry)
+                    if dispatched:
+                        condition.notify_all()
+                        return
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                self._abandon(entry)
+                condition.notify_all()
+                raise
+
+    async def release(self):
+        """
+        Marks a request sent after :meth:`acquire` as finished.
+        """
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            condition.notify_all()
+
+
+class AsyncSmiteClient(SmiteClient):
+    """
+    An asyncio version of :class:`smite.SmiteClient`.
+
+    Every API method of :class:`smite.SmiteClient` is available, and returns an
+    awaitable resolving to the same result. The streaming ``iter_*`` methods
+    return asynchronous generators instead::
+
+        client = AsyncSmiteClient(1700, '2djsa8231jlsad92ka9d2jkad912j')
+        gods = await client.get_gods()
+        async for item in client.iter_items():
+            ...
+
+    Note
+    -----
+    The number of requests in flight at once is capped by ``max_concurrency``.
+    """
+
+    def __init__(self, dev_id, auth_key, lang=1, session_store=None, transport=None, cache=None, match_cache=None,
+                 rate_limiter=None, retry_policy=None, circuit_breaker=None, models=False, max_concurrency=10,
+                 coalescer=None, quiet=False, metrics=None, hooks=(), scheduler=None):
+        """
+        :param dev_id: Your private developer ID supplied by Hi-rez
+        :param auth_key: Your authorization key
+        :param lang: the language code needed by some queries, default to english.
+        :param session_store: A :class:`smite.SessionStore` to share sessions through
+        :param transport: The :class:`AsyncHTTPTransport` used to send requests.
+            Defaults to a transport private to this client.
+        :param cache: A :class:`smite.ResponseCache` to serve repeated requests from
+        :param match_cache: A :class:`smite.matchcache.SQLiteMatchCache` to keep finished matches in
+        :param rate_limiter: A :class:`smite.RateLimiter` that requests are throttled by
+        :param retry_policy: The :class:`smite.RetryPolicy` for requests that fail with a transient error
+        :param circuit_breaker: The :class:`smite.CircuitBreaker` tracking failing endpoints
+        :param models: Whether to return gods, items, players and matches as the compact models of :mod:`smite.models`
+        :param max_concurrency: The maximum number of requests in flight at once
+        :param coalescer: The :class:`AsyncRequestCoalescer` that identical concurrent requests are merged by
+        :param quiet: Whether to skip logging every request URL
+        :param metrics: The :class:`smite.Metrics` requests are counted in
+        :param hooks: :class:`smite.RequestHook` objects called before and after every HTTP request
+        :param scheduler: An :class:`AsyncRequestScheduler` deciding the order requests are sent in
+        """
+        if transport is None:
+            transport = AsyncHTTPTransport(pool_size=max_concurrency)
+        SmiteClient.__init__(self, dev_id, auth_key, lang, session_store, transport, cache, match_cache,
+                             rate_limiter, retry_policy, circuit_breaker, models,
+                             coalescer if coalescer is not None else AsyncRequestCoalescer(), quiet,
+                             metrics, hooks, scheduler)
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    def _get_semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _fetch(self, methodname, url, base_url, waiting_since, idempotent=True, session=False):
+        return await self._fetch_with(self._transport.get, methodname, url, base_url, waiting_since, idempotent,
+                                      session)
+
+    async def _fetch_with(self, send, methodname, url, base_url, waiting_since, idempotent, session):
+        key = urllib.parse.urlsplit(url).netloc
+        attempt = 0
+        while True:
+            self._circuit_breaker.before_request(key)
+            if self._rate_limiter is not None:
+                wait = self._rate_limiter.reserve(session)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            async with self._get_semaphore():
+                # Waiting for the semaphore counts as queue time
+                request = self._begin_request(methodname, url, base_url, waiting_since)
+                try:
+                    response = await send(url)
+                except Exception as e:
+                    self._fail_request(request, e)
+                    error = e
+                else:
+                    error = None
+            if error is None:
+                self._circuit_breaker.record_success(key)
+                return request, response
+            delay = self._handle_fetch_error(key, error, attempt, idempotent)
+            waiting_since = time.perf_counter()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _new_session_manager(self, base_url):
+        return AsyncSessionManager(functools.partial(self._create_session, base_url), self._session_key(base_url),
+                                   self._session_store)
+
+    async def _make_request(self, methodname, parameters=None, endpoint=None):
+        base_url = self._base_url(endpoint)
+        cache_key = self._cache_key(methodname, parameters, base_url)
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self.metrics.record_cache_hits(methodname, base_url)
+                return self._to_models(methodname, cached)
+
+        jsonfinal = await self._coalescer.call(self._request_key(methodname, parameters, base_url),
+                                               lambda: self._request(methodname, parameters, base_url))
+        if cache_key is not None:
+            self._cache.set(methodname, cache_key, jsonfinal)
+        return self._to_models(methodname, jsonfinal)
+
+    async def _request(self, methodname, parameters, base_url):
+        if self._rate_limiter is not None and self._rate_limiter.begin_refresh():
+            await self._refresh_rate_limits(base_url)
+        sessions = self._get_sessions(base_url)
+        session_id = await sessions.get()
+        jsonfinal = await self._send_request(methodname, parameters, session_id, base_url)
+        if self._is_invalid_session(jsonfinal):
+            logger.info('Session was rejected by the SmiteAPI, retrying %s with a new session', methodname)
+            self.metrics.record_session_rejected(methodname, base_url)
+            await sessions.invalidate(session_id)
+            jsonfinal = await self._send_request(methodname, parameters, await sessions.get(), base_url)
+            if self._is_invalid_session(jsonfinal):
+                raise SessionError(self._ret_msg(jsonfinal))
+        if self._is_quota_exceeded(jsonfinal):
+            raise QuotaExceededError(self._ret_msg(jsonfinal))
+        if not jsonfinal:
+            raise NoResultError("Request was successful, but returned no data.") from None
+        return jsonfinal
+
+    async def _refresh_rate_limits(self, base_url):
+        data_used = None
+        try:
+            session_id = await self._get_sessions(base_url).get()
+            data_used = await self._send_request('getdataused', None, session_id, base_url)
+        except SmiteError:
+            logger.warning('Could not refresh rate limits from getdataused')
+        finally:
+            self._rate_limiter.finish_refresh(data_used)
+
+    async def _send_request(self, methodname, parameters, session_id, base_url=None):
+        url = self._build_request_url(methodname, parameters, session_id, base_url)
+        url = url.replace(' ', '%20')  # Cater for spaces in parameters
+        if not self.quiet:
+            logger.debug('Built request URL for %s: %s', methodname, url)
+        try:
+            return await self._get_json(methodname, url, base_url)
+        except urllib.error.HTTPError as e:
+            raise self._request_error(e) from None
+
+    async def _get_json(self, methodname, url, base_url=None, idempotent=True, session=False):
+        waiting_since = time.perf_counter()
+        if self._scheduler is None:
+            request, html = await self._fetch(methodname, url, base_url, waiting_since, idempotent, session)
+        else:
+            await self._scheduler.acquire(methodname)
+            try:
+                request, html = await self._fetch(methodname, url, base_url, waiting_since, idempotent, session)
+            finally:
+                await self._scheduler.release()
+        try:
+            result = self._decode(request, html)
+        except Exception as e:
+            request.error = e
+            self._end_request(request)
+            raise
+        self._end_request(request)
+        return result
+
+    async def _create_session(self, base_url=None):
+        try:
+            return await self._get_json('createsession', self._build_session_url(base_url), base_url,
+                                        idempotent=False, session=True)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                raise NoResultError("Couldn't create session. API auth details may be incorrect.") from None
+            raise SmiteError("Couldn't create session: HTTP {} {}".format(e.code, e.reason)) from None
+
+    async def get_match_details(self, match_id, endpoint=None):
+        """
+        :param match_id: The id of the match
+        :param endpoint: The :class:`smite.Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a dictionary of the match and it's attributes.
+        """
+        base_url = self._base_url(endpoint)
+        if self._match_cache is not None:
+            rows = self._match_cache.get(base_url, match_id)
+            if rows is not None:
+                self.metrics.record_cache_hits('getmatchdetails', base_url)
+                return self._to_match(match_id, rows)
+        rows = await self._make_request('getmatchdetails', [match_id], endpoint)
+        if self._match_cache is not None and self._is_match_complete(rows):
+            self._match_cache.put(base_url, match_id, rows)
+        return self._to_match(match_id, rows)
+
+    async def get_match_details_batch(self, match_ids, endpoint=None):
+        """
+        :param match_ids: An iterable of match IDs
+        :param endpoint: The :class:`smite.Endpoint` to query, defaults to the client's endpoint
+        :return: Returns a dictionary mapping each match ID to the list of player rows for that match,
+            in the order the IDs were given. Matches with no data map to an empty list.
+        """
+        base_url = self._base_url(endpoint)
+        match_ids, cached, chunks = self._plan_match_details_batch(match_ids, base_url)
+        results = await asyncio.gather(*[self._get_match_details_chunk(chunk, endpoint) for chunk in chunks])
+        return self._finish_match_details_batch(match_ids, cached, chunks, results, base_url)
+
+    async def _get_match_details_chunk(self, chunk, endpoint=None):
+        try:
+            return await self._make_request('getmatchdetailsbatch', [','.join(str(match_id) for match_id in chunk)],
+                                            endpoint)
+        except NoResultError:
+            logger.debug('No details for any of the matches %s', chunk)
+            return []
+
+    async def _fan_out(self, method, args, endpoints):
+        endpoints = list(endpoints)
+        results = await asyncio.gather(*[method(*args, endpoint=endpoint) for endpoint in endpoints],
+                                       return_exceptions=True)
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, NoResultError):
+                logger.debug('%s found nothing on %s', method.__name__, endpoint)
+            elif isinstance(result, BaseException):
+                raise result
+        return collections.OrderedDict((endpoint, None if isinstance(result, NoResultError) else result)
+                                       for endpoint, result in zip(endpoints, results))
+
+    async def _stream_request(self, methodname, parameters=None, endpoint=None):
+        base_url = self._base_url(endpoint)
+        if self._rate_limiter is not None and self._rate_limiter.begin_refresh():
+            await self._refresh_rate_limits(base_url)
+        sessions = self._get_sessions(base_url)
+        session_id = await sessions.get()
+        for attempt in range(2):
+            url = self._build_request_url(methodname, parameters, session_id, base_url)
+            url = url.replace(' ', '%20')  # Cater for spaces in parameters
+            if not self.quiet:
+                logger.debug('Built streaming request URL for %s: %s', methodname, url)
+            try:
+                request, chunks = await self._scheduled_fetch_stream(methodname, url, base_url)
+            except urllib.error.HTTPError as e:
+                raise self._request_error(e) from None
+            elements = aiter_json_array(self._measure_stream(request, chunks))
+            try:
+                first = await elements.__anext__()
+            except StopAsyncIteration:
+                raise NoResultError("Request was successful, but returned no data.") from None
+            if self._is_invalid_session([first]):
+                await elements.aclose()
+                if attempt > 0:
+                    raise SessionError(self._ret_msg([first]))
+                logger.info('Session was rejected by the SmiteAPI, retrying %s with a new session', methodname)
+                self.metrics.record_session_rejected(methodname, base_url)
+                await sessions.invalidate(session_id)
+                session_id = await sessions.get()
+                continue
+            if self._is_quota_exceeded([first]):
+                await elements.aclose()
+                raise QuotaExceededError(self._ret_msg([first]))
+            model = self._MODELS.get(methodname) if self._models else None
+            try:
+                yield first if model is None else model(first)
+                async for element in elements:
+                    yield element if model is None else model(element)
+            finally:
+                await elements.aclose()
+            return
+
+    async def _measure_stream(self, request, chunks):
+        try:
+            async for chunk in chunks:
+                request.bytes += len(chunk)
+                yield chunk
+        except Exception as e:
+            request.error = e
+            raise
+        finally:
+            await chunks.aclose()
+            request.network_time = time.perf_counter() - request.started
+            self._end_request(request)
+
+    async def _scheduled_fetch_stream(self, methodname, url, base_url):
+        # The scheduler's slot is held until the response starts, not until the whole body is read
+        waiting_since = time.perf_counter()
+        if self._scheduler is None:
+            return await self._fetch_stream(methodname, url, base_url, waiting_since)
+        await self._scheduler.acquire(methodname)
+        try:
+            return await self._fetch_stream(methodname, url, base_url, waiting_since)
+        finally:
+            await self._scheduler.release()
+
+    async def _fetch_stream(self, methodname, url, base_url, waiting_since):
+        return await self._fetch_with(self._transport.stream, methodname, url, base_url, waiting_since, True, False)
+
+    async def iter_match_details_batch(self, match_ids, endpoint=None):
+        """
+        :param match_ids: An iterable of match IDs
+        :param endpoint: The :class:`smite.Endpoint` to query, defaults to the client's endpoint
+        :return: Returns an asynchronous generator of ``(match_id, rows)`` tuples. Only one batch of 10 matches is
+            held in memory at a time. Matches are not necessarily returned in the order they were given.
+        """
+        base_url = self._base_url(endpoint)
+        match_ids, cached, chunks = self._plan_match_details_batch(match_ids, base_url)
+        for match_id in match_ids:
+            if str(match_id) in cached:
+                yield match_id, self._to_match(match_id, cached[str(match_id)])
+        for chunk in chunks:
+            try:
+                rows = [row async for row in self._stream_request(
+                    'getmatchdetailsbatch', [','.join(str(match_id) for match_id in chunk)], endpoint)]
+            except NoResultError:
+                logger.debug('No details for any of the matches %s', chunk)
+                rows = []
+            fetched = self._finish_match_details_batch(chunk, {}, [chunk], [rows], base_url)
+            for match_id, match in fetched.items():
+                yield match_id, match
+
+    async def ping(self, endpoint=None):
+        """
+        :param endpoint: The :class:`smite.Endpoint` to query, defaults to the client's endpoint
+        :return: Indicates whether the request was successful
+        """
+        base_url = self._base_url(endpoint)
+        return await self._get_json('ping', '{0}/pingJson'.format(base_url), base_url)
+
+    def close(self):
+        """
+        Closes all idle connections held by the client's transport, and stops the threads its session managers
+        use the session store from.
+        """
+        self._transport.close()
+        with self._session_managers_lock:
+            for sessions in self._session_managers.values():
+                sessions.close()
@@ -0,0 +1,230 @@
+"""
+    Indexed static data for gods, items and god skins.
+
+    Gods, items and skins only change when the game is patched. A
+    :class:`Catalog` fetches them once per patch and keeps indexes by ID
+    and name, so lookups don't need any API calls or list scans. A catalog
+    can be saved to a file and loaded by other processes at startup.
+"""
+import json
+import threading
+
+from smite import Endpoint, NoResultError, logger
+from smite._storage import dump_json_atomically
+from smite.models import God, Item
+
+
+def _to_dict(row):
+    return row.to_dict() if hasattr(row, 'to_dict') else row
+
+
+def _name_key(name):
+    return name.strip().casefold() if isinstance(name, str) else None
+
+
+class _Index(object):
+    __slots__ = ('rows', 'by_id', 'by_name')
+
+    def __init__(self, rows, id_key, name_key, model=None):
+        self.rows = [model(row) for row in rows] if model is not None else rows
+        self.by_id = {}
+        self.by_name = {}
+        for row, raw in zip(self.rows, rows):
+            if raw.get(id_key) is not None:
+                self.by_id[raw[id_key]] = row
+            name = _name_key(raw.get(name_key))
+            if name:
+                self.by_name.setdefault(name, row)
+
+    def find(self, key):
+        if isinstance(key, str):
+            row = self.by_name.get(_name_key(key))
+            if row is not None or not key.isdigit():
+                return row
+            key = int(key)
+        return self.by_id.get(key)
+
+
+class _Snapshot(object):
+    __slots__ = ('version', 'data', 'gods', 'items', 'skins')
+
+    def __init__(self, version, data, models):
+        self.version = version
+        self.data = data
+        self.gods = _Index(data['gods'], 'id', 'Name', God if models else None)
+        self.items = _Index(data['items'], 'ItemId', 'DeviceName', Item if models else None)
+        self.skins = {}
+        for row in data['skins']:
+            self.skins.setdefault(row.get('god_id'), []).append(row)
+
+
+class Catalog(object):
+    """
+    Gods, items and god skins indexed by ID and case-insensitive name.
+
+    Data is kept separately for each :class:`smite.Endpoint` and language.
+    :meth:`update` fetches it with a client, and does nothing if the catalog
+    already holds data for the current patch. Lookups that don't name an
+    endpoint or language use the catalog's defaults.
+
+    Note
+    -----
+    Fetching skins takes one request per god. Pass ``skins=False`` to
+    :meth:`update` to skip them.
+    """
+    _FORMAT_VERSION = 1
+
+    def __init__(self, endpoint=Endpoint.PC, lang=1, models=False):
+        """
+        :param endpoint: The default :class:`smite.Endpoint` of lookups
+        :param lang: The default language code of lookups
+        :param models: Whether to return gods and items as :class:`smite.models.God` and
+            :class:`smite.models.Item` models instead of dictionaries
+        """
+        self.endpoint = endpoint
+        self.lang = lang
+        self.models = models
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(endpoint, lang):
+        if isinstance(endpoint, str):
+            for member in Endpoint:
+                if endpoint in (member.value, member.name, member.name.lower()):
+                    endpoint = member
+                    break
+            else:
+                return endpoint, int(lang)
+        return endpoint.name, int(lang)
+
+    def _snapshot(self, endpoint, lang):
+        key = self._key(endpoint if endpoint is not None else self.endpoint, lang if lang is not None else self.lang)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            raise KeyError('The catalog holds no data for {} in language {}'.format(*key))
+        return snapshot
+
+    @staticmethod
+    def _patch_version(client, endpoint):
+        info = client.get_patch_info(endpoint=endpoint)
+        if isinstance(info, list):
+            info = info[0] if info else {}
+        return info.get('version_string')
+
+    def update(self, client, skins=True, endpoint=None):
+        """
+        Fetches the data for an endpoint in the client's language, unless the catalog already
+        holds it for the current patch.
+
+        :param client: The :class:`smite.SmiteClient` to fetch with
+        :param skins: Whether to fetch the skins of every god
+        :param endpoint: The :class:`smite.Endpoint` to fetch from, defaults to the client's endpoint
+        :return: Whether the data was fetched
+        """
+        key = self._key(client._base_url(endpoint), client.lang)
+        version = self._patch_version(client, endpoint)
+        current = self._snapshots.get(key)
+        if current is not None and version is not None and current.version == version:
+            return False
+
+        gods = [_to_dict(row) for row in client.get_gods(endpoint=endpoint)]
+        items = [_to_dict(row) for row in client.get_items(endpoint=endpoint)]
+        skin_rows = []
+        if skins:
+            for god in gods:
+                try:
+                    skin_rows.extend(_to_dict(row) for row in client.get_god_skins(god['id'], endpoint=endpoint))
+                except NoResultError:
+                    logger.debug('No skins listed for god %s', god['id'])
+        snapshot = _Snapshot(version, {'gods': gods, 'items': items, 'skins': skin_rows}, self.models)
+        with self._lock:
+            self._snapshots[key] = snapshot
+        logger.info('Catalog for %s in language %s updated to patch %s', key[0], key[1], version)
+        return True
+
+    def version(self, endpoint=None, lang=None):
+        """
+        :param endpoint: The :class:`smite.Endpoint`, defaults to the catalog's
+        :param lang: The language code, defaults to the catalog's
+        :return: The patch version the data was fetched for
+        """
+        return self._snapshot(endpoint, lang).version
+
+    def god(self, god, endpoint=None, lang=None):
+        """
+        :param god: The ID or name of the god
+        :param endpoint: The :class:`smite.Endpoint`, defaults to the catalog's
+        :param lang: The language code, defaults to the catalog's
+        :return: The god's attributes, or None if there is no such god
+        """
+        return self._snapshot(endpoint, lang).gods.find(god)
+
+    def item(self, item, endpoint=None, lang=None):
+        """
+        :param item: The ID or name of the item
+        :param endpoint: The :class:`smite.Endpoint`, defaults to the catalog's
+        :param lang: The language code, defaults to the catalog's
+        :return: The item's attributes, or None if there is no such item
+        """
+        return self._snapshot(endpoint, lang).items.find(item)
+
+    def skins(self, god, endpoint=None, lang=None):
+        """
+        :param god: The ID or name of the god
+        :param endpoint: The :class:`smite.Endpoint`, defaults to the catalog's
+        :param lang: The language code, defaults to the catalog's
+        :return: A list of the god's skins
+        """
+        snapshot = self._snapshot(endpoint, lang)
+        if isinstance(god, str) and not god.isdigit():
+            found = snapshot.gods.find(god)
+            if found is None:
+                return []
+            god = found['id']
+        return list(snapshot.skins.get(int(god), ()))
+
+    def gods(self, endpoint=None, lang=None):
+        """
+        :param endpoint: The :class:`smite.Endpoint`, defaults to the catalog's
+        :param lang: The language code, defaults to the catalog's
+        :return: A list of every god
+        """
+        return list(self._snapshot(endpoint, lang).gods.rows)
+
+    def items(self, endpoint=None, lang=None):
+        """
+        :param endpoint: The :class:`smite.Endpoint`, defaults to the catalog's
+        :param lang: The language code, defaults to the catalog's
+        :return: A list of every item
+        """
+        return list(self._snapshot(endpoint, lang).items.rows)
+
+    def save(self, path):
+        """
+        Writes the catalog to a file, replacing it atomically.
+
+        :param path: Path of the file
+        """
+        with self._lock:
+            snapshots = [{'endpoint': key[0], 'lang': key[1], 'version': snapshot.version, 'data': snapshot.data}
+                         for key, snapshot in self._snapshots.items()]
+        dump_json_atomically({'format': self._FORMAT_VERSION, 'snapshots': snapshots}, path, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path, endpoint=Endpoint.PC, lang=1, models=False):
+        """
+        :param path: Path of a file written by :meth:`save`
+        :param endpoint: The default :class:`smite.Endpoint` of lookups
+        :param lang: The default language code of lookups
+        :param models: Whether to return gods and items as models instead of dictionaries
+        :return: A :class:`Catalog` holding the saved data
+        """
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('format') != cls._FORMAT_VERSION:
+            raise ValueError('{} is not a catalog file this version can read'.format(path))
+        catalog = cls(endpoint, lang, models)
+        for saved in state['snapshots']:
+            catalog._snapshots[(saved['endpoint'], saved['lang'])] = _Snapshot(saved['version'], saved['data'], models)
+        return catalog
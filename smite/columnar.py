@@ -0,0 +1,300 @@
+"""
+    Columnar export of match details for analytics.
+
+    :class:`ColumnBuilder` turns match player rows into one typed buffer per
+    field. Integers are kept in ``array('q')``, floats in ``array('d')`` and
+    strings such as god and item names are dictionary encoded into
+    ``array('i')`` codes. Tables can be written to a simple columnar file and
+    memory mapped back without parsing any JSON. If NumPy is installed,
+    columns can be read as NumPy arrays.
+
+    Missing values are stored as ``INT_NULL`` in integer columns, NaN in
+    float columns and code -1 in string columns.
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INT_NULL = -2 ** 63
+_INT_MAX = 2 ** 63 - 1
+_NAN = float('nan')
+_MAGIC = b'SMCOL\x01\n\x00'
+_ALIGNMENT = 8
+
+
+class _Column(object):
+    __slots__ = ('kind', 'data', 'values', 'codes', 'pending_nulls')
+
+    def __init__(self):
+        self.kind = None
+        self.data = None
+        self.values = None
+        self.codes = None
+        self.pending_nulls = 0
+
+    def _start(self, kind):
+        self.kind = kind
+        if kind == 's':
+            self.data = array('i', [-1]) * self.pending_nulls
+            self.values = []
+            self.codes = {}
+        elif kind == 'd':
+            self.data = array('d', [_NAN]) * self.pending_nulls
+        else:
+            self.data = array('q', [INT_NULL]) * self.pending_nulls
+        self.pending_nulls = 0
+
+    def _encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def _to_float(self):
+        self.data = array('d', (_NAN if value == INT_NULL else float(value) for value in self.data))
+        self.kind = 'd'
+
+    def _to_string(self):
+        old, kind = self.data, self.kind
+        self._start('s')
+        null = INT_NULL if kind == 'q' else None
+        for value in old:
+            if value == null or value != value:
+                self.data.append(-1)
+            else:
+                self.data.append(self._encode(str(value)))
+
+    def append(self, value):
+        if value is None:
+            if self.kind is None:
+                self.pending_nulls += 1
+            else:
+                self.data.append(-1 if self.kind == 's' else _NAN if self.kind == 'd' else INT_NULL)
+            return
+        if isinstance(value, bool):
+            value = int(value)
+        elif not isinstance(value, (int, float, str)):
+            value = json.dumps(value, sort_keys=True)
+
+        if isinstance(value, str):
+            if self.kind != 's':
+                if self.kind is None:
+                    self._start('s')
+                else:
+                    self._to_string()
+            self.data.append(self._encode(value))
+        elif isinstance(value, float) or not -_INT_MAX <= value <= _INT_MAX:
+            if self.kind is None:
+                self._start('d')
+            elif self.kind == 'q':
+                self._to_float()
+            if self.kind == 's':
+                self.data.append(self._encode(str(value)))
+            else:
+                self.data.append(float(value))
+        else:
+            if self.kind is None:
+                self._start('q')
+            if self.kind == 's':
+                self.data.append(self._encode(str(value)))
+            else:
+                self.data.append(value)
+
+    def finish(self, rows):
+        if self.kind is None:
+            self._start('q')
+        while len(self.data) < rows:
+            self.append(None)
+        return self.data, self.values
+
+
+class ColumnBuilder(object):
+    """
+    Collects match player rows into typed columns.
+
+    Rows are added one at a time, so records can be streamed in from
+    :meth:`smite.SmiteClient.iter_match_details_batch` or a
+    :class:`smite.crawler.QueueCrawler` without keeping the dicts around.
+    """
+
+    def __init__(self, columns=None):
+        """
+        :param columns: The fields to keep. Defaults to the fields of the first row added.
+        """
+        self._names = list(columns) if columns is not None else None
+        self._columns = {name: _Column() for name in self._names} if columns is not None else None
+        self._rows = 0
+
+    def add_row(self, row):
+        """
+        :param row: A result row as a dictionary or :class:`smite.models.Model`
+        """
+        if hasattr(row, 'to_dict'):
+            row = row.to_dict()
+        if self._columns is None:
+            self._names = list(row)
+            self._columns = {name: _Column() for name in self._names}
+        for name in self._names:
+            self._columns[name].append(row.get(name))
+        self._rows += 1
+
+    def add_match_details(self, details):
+        """
+        :param details: Any of the results of the match detail methods: a list of player rows, a list of
+            :class:`smite.models.Match`, a dictionary mapping match IDs to rows, or an iterable of
+            ``(match_id, rows)`` tuples or :class:`smite.crawler.MatchRecord` tuples
+        """
+        if isinstance(details, dict):
+            details = details.values()
+        for item in details:
+            if hasattr(item, 'players'):
+                rows = item.players
+            elif isinstance(item, tuple):
+                rows = item[-1]
+            elif isinstance(item, list):
+                rows = item
+            else:
+                self.add_row(item)
+                continue
+            for row in rows:
+                self.add_row(row)
+
+    def build(self):
+        """
+        :return: A :class:`ColumnarTable` of the rows added so far
+        """
+        columns = {}
+        dictionaries = {}
+        for name in self._names or []:
+            data, values = self._columns[name].finish(self._rows)
+            columns[name] = data
+            if values is not None:
+                dictionaries[name] = values
+        return ColumnarTable(self._names or [], columns, dictionaries, self._rows)
+
+
+class ColumnarTable(object):
+    """
+    Typed columns of match player rows.
+
+    Columns are available as :class:`memoryview` objects, or as NumPy arrays with
+    :meth:`to_numpy` if NumPy is installed. String columns hold integer codes
+    into their dictionary.
+    """
+
+    def __init__(self, names, columns, dictionaries, rows, buffer=None):
+        self.names = list(names)
+        self._columns = columns
+        self.dictionaries = dictionaries
+        self.rows = rows
+        self._buffer = buffer
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, name):
+        """
+        :param name: The name of the column
+        :return: A :class:`memoryview` of the column's values, or of its codes for a string column
+        """
+        return memoryview(self._columns[name])
+
+    def decode(self, name):
+        """
+        :param name: The name of a string column
+        :return: The column's values as a list of strings, None where a value is missing
+        """
+        values = self.dictionaries[name]
+        return [values[code] if code >= 0 else None for code in self.column(name)]
+
+    def to_numpy(self):
+        """
+        :return: A dictionary mapping each column name to a NumPy array, sharing memory with the table
+        """
+        if numpy is None:
+            raise ImportError('NumPy is required for to_numpy()')
+        return {name: numpy.frombuffer(self.column(name), dtype=self.column(name).format) for name in self.names}
+
+    def write(self, path):
+        """
+        Writes the table to a columnar file that :meth:`open` can memory map.
+
+        :param path: Path of the file to write
+        """
+        header = {'byteorder': sys.byteorder, 'rows': self.rows, 'columns': []}
+        offset = 0
+        for name in self.names:
+            view = self.column(name)
+            header['columns'].append({'name': name, 'type': view.format, 'offset': offset, 'size': view.nbytes,
+                                      'dictionary': self.dictionaries.get(name)})
+            offset += -(-view.nbytes // _ALIGNMENT) * _ALIGNMENT
+        header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        data_start = -(-(len(_MAGIC) + 8 + len(header_bytes)) // _ALIGNMENT) * _ALIGNMENT
+        with open(path, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(struct.pack('<Q', len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b'\x00' * (data_start - f.tell()))
+            for column in header['columns']:
+                view = self.column(column['name'])
+                f.write(view.tobytes())
+                f.write(b'\x00' * (-view.nbytes % _ALIGNMENT))
+
+    @classmethod
+    def open(cls, path):
+        """
+        Memory maps a file written by :meth:`write`. Column data is read from disk as it is accessed.
+
+        :param path: Path of the file
+        :return: A :class:`ColumnarTable` backed by the file
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(_MAGIC)] != _MAGIC:
+            mapped.close()
+            raise ValueError('{} is not a columnar file'.format(path))
+        header_length, = struct.unpack_from('<Q', mapped, len(_MAGIC))
+        header_start = len(_MAGIC) + 8
+        header = json.loads(mapped[header_start:header_start + header_length].decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            mapped.close()
+            raise ValueError('{} was written on a machine with a different byte order'.format(path))
+        data_start = -(-(header_start + header_length) // _ALIGNMENT) * _ALIGNMENT
+        buffer = memoryview(mapped)
+        columns = {}
+        dictionaries = {}
+        for column in header['columns']:
+            start = data_start + column['offset']
+            columns[column['name']] = buffer[start:start + column['size']].cast(column['type'])
+            if column['dictionary'] is not None:
+                dictionaries[column['name']] = column['dictionary']
+        return cls([column['name'] for column in header['columns']], columns, dictionaries, header['rows'], mapped)
+
+    def close(self):
+        """
+        Releases the memory map of a table returned by :meth:`open`.
+        """
+        if self._buffer is not None:
+            for column in self._columns.values():
+                column.release()
+            self._buffer.close()
+            self._buffer = None
+
+
+def to_columns(details, columns=None):
+    """
+    :param details: Match details in any form accepted by :meth:`ColumnBuilder.add_match_details`
+    :param columns: The fields to keep. Defaults to the fields of the first row.
+    :return: A :class:`ColumnarTable` of the players' rows
+    """
+    builder = ColumnBuilder(columns)
+    builder.add_match_details(details)
+    return builder.build()
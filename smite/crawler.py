@@ -0,0 +1,582 @@
+"""
+    Crawling every match played in a queue over a range of dates, and the
+    friend graph around some players.
+"""
+import bisect
+import collections
+import concurrent.futures
+import datetime
+import hashlib
+import heapq
+import json
+import math
+import os
+import queue
+import struct
+import tempfile
+import threading
+from array import array
+
+from smite import NoResultError, SmiteError, logger
+from smite._storage import dump_json_atomically
+
+MatchRecord = collections.namedtuple('MatchRecord', ['queue', 'date', 'hour', 'match_id', 'players'])
+FriendEdge = collections.namedtuple('FriendEdge', ['player_id', 'friend_id', 'depth'])
+PlayerRecord = collections.namedtuple('PlayerRecord', ['player_id', 'depth', 'player'])
+
+
+class CrawlCheckpoint(object):
+    """
+    Records the progress of a :class:`QueueCrawler` in a JSON file.
+
+    An hour is identified by a ``queue/date/hour`` key. Finished hours are
+    kept as a set of keys. For hours that are in progress, the listed match
+    IDs and the IDs already handed out are kept, so that a restarted crawl
+    neither lists the hour again nor fetches a match twice.
+
+    Hours that had matches still in progress when they were listed are
+    partial. They never count as finished, and are listed again by the
+    next crawl, which skips the matches already handed out.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: Path of the checkpoint file. If None, progress is only kept in memory.
+        """
+        self.path = path
+        self.done = set()
+        self.pending = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.done = set(state.get('done', []))
+            self.pending = {key: {'ids': slot['ids'], 'done': set(slot['done']), 'partial': slot.get('partial', False)}
+                            for key, slot in state.get('pending', {}).items()}
+
+    def listed_ids(self, key):
+        """
+        :param key: The hour's key
+        :return: The match IDs of the hour that haven't been handed out yet, or None if it hasn't been listed
+            or is partial
+        """
+        with self._lock:
+            slot = self.pending.get(key)
+            if slot is None or slot['partial']:
+                return None
+            return [match_id for match_id in slot['ids'] if match_id not in slot['done']]
+
+    def start(self, key, match_ids, complete=True):
+        """
+        :param key: The hour's key
+        :param match_ids: The match IDs listed for the hour
+        :param complete: False if the hour had matches still in progress, which weren't listed
+        :return: The match IDs that haven't been handed out yet, leaving out those handed out by an earlier
+            listing of a partial hour
+        """
+        with self._lock:
+            previous = self.pending.get(key)
+            done = previous['done'] if previous is not None else set()
+            remaining = [match_id for match_id in match_ids if match_id not in done]
+            if remaining or not complete:
+                self.pending[key] = {'ids': list(match_ids), 'done': done & set(match_ids), 'partial': not complete}
+            else:
+                self.pending.pop(key, None)
+                self.done.add(key)
+            return remaining
+
+    def finish(self, key, match_id):
+        """
+        :param key: The hour's key
+        :param match_id: A match of the hour that has been handed out
+        """
+        with self._lock:
+            slot = self.pending.get(key)
+            if slot is None:
+                return
+            slot['done'].add(match_id)
+            if not slot['partial'] and len(slot['done']) >= len(slot['ids']):
+                del self.pending[key]
+                self.done.add(key)
+
+    def save(self):
+        """
+        Writes the checkpoint to its file, replacing it atomically.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            state = {'done': sorted(self.done),
+                     'pending': {key: {'ids': slot['ids'], 'done': sorted(slot['done']), 'partial': slot['partial']}
+                                 for key, slot in self.pending.items()}}
+        dump_json_atomically(state, self.path)
+
+
+class QueueCrawler(object):
+    """
+    Fetches the details of every match played in some queues over a range of dates.
+
+    Match IDs are listed hour by hour with :meth:`smite.SmiteClient.get_match_ids_by_queue`
+    on one thread, while worker threads fetch their details in batches with
+    :meth:`smite.SmiteClient.get_match_details_batch`. Both stages hand work on
+    through bounded queues, so listing pauses while the consumer is behind
+    and memory use stays flat.
+
+    Progress is recorded in a :class:`CrawlCheckpoint`. A crawl started again
+    with the same checkpoint file picks up where the previous one stopped.
+    A match counts as done once the consumer asks for the next record after it.
+    Matches still in progress are left out, and their hours are listed again
+    by the next crawl with the same checkpoint file.
+    """
+    _STOP = object()
+
+    def __init__(self, client, queues, start_date, end_date=None, checkpoint=None, workers=4, max_pending=500,
+                 hours=range(24), checkpoint_every=100):
+        """
+        :param client: The :class:`smite.SmiteClient` to crawl with
+        :param queues: An iterable of queue IDs
+        :param start_date: The first :class:`datetime.date` to crawl
+        :param end_date: The last :class:`datetime.date` to crawl, inclusive. Defaults to start_date.
+        :param checkpoint: Path of the checkpoint file, or None to not keep progress between runs
+        :param workers: The number of threads fetching match details
+        :param max_pending: The maximum number of fetched records waiting to be consumed
+        :param hours: The hours of each day to crawl
+        :param checkpoint_every: Number of consumed records between checkpoint writes
+        """
+        self.client = client
+        self.queues = list(queues)
+        self.start_date = start_date
+        self.end_date = end_date if end_date is not None else start_date
+        self.checkpoint = CrawlCheckpoint(checkpoint)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.hours = list(hours)
+        self.checkpoint_every = checkpoint_every
+
+    def _slots(self):
+        date = self.start_date
+        while date <= self.end_date:
+            for queue_id in self.queues:
+                for hour in self.hours:
+                    yield queue_id, date.strftime('%Y%m%d'), hour
+            date += datetime.timedelta(days=1)
+
+    @staticmethod
+    def _key(queue_id, date, hour):
+        return '{}/{}/{}'.format(queue_id, date, hour)
+
+    def _list(self, queue_id, date, hour):
+        """
+        :return: The IDs of the finished matches of the hour, and whether none were in progress
+        """
+        try:
+            rows = self.client.get_match_ids_by_queue(queue_id, date, hour)
+        except NoResultError:
+            logger.debug('No matches listed for queue %s on %s at hour %s', queue_id, date, hour)
+            return [], True
+        rows = [row for row in rows if row.get('Match')]
+        return ([str(row['Match']) for row in rows if row.get('Active_Flag') != 'y'],
+                not any(row.get('Active_Flag') == 'y' for row in rows))
+
+    def _put(self, q, item, stop):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _lister(self, batches, results, stop):
+        size = self.client._MATCH_BATCH_SIZE
+        try:
+            for queue_id, date, hour in self._slots():
+                key = self._key(queue_id, date, hour)
+                if key in self.checkpoint.done:
+                    continue
+                match_ids = self.checkpoint.listed_ids(key)
+                if match_ids is None:
+                    match_ids = self.checkpoint.start(key, *self._list(queue_id, date, hour))
+                logger.debug('Crawling %d matches for %s', len(match_ids), key)
+                for i in range(0, len(match_ids), size):
+                    if not self._put(batches, ((queue_id, date, hour), match_ids[i:i + size]), stop):
+                        return
+        except Exception as e:
+            self._put(results, e, stop)
+        finally:
+            for _ in range(self.workers):
+                self._put(batches, self._STOP, stop)
+
+    def _worker(self, batches, results, stop):
+        try:
+            while not stop.is_set():
+                try:
+                    item = batches.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is self._STOP or stop.is_set():
+                    break
+                slot, match_ids = item
+                details = self.client.get_match_details_batch(match_ids, max_workers=1)
+                for match_id in match_ids:
+                    if not self._put(results, MatchRecord(slot[0], slot[1], slot[2], match_id, details[match_id]),
+                                     stop):
+                        return
+        except Exception as e:
+            self._put(results, e, stop)
+        finally:
+            self._put(results, self._STOP, stop)
+
+    def crawl(self):
+        """
+        :return: A generator of :class:`MatchRecord` tuples, one per finished match.
+            Matches the API returns no players for are skipped.
+        """
+        batches = queue.Queue(maxsize=self.workers * 2)
+        results = queue.Queue(maxsize=self.max_pending)
+        stop = threading.Event()
+        threads = [threading.Thread(target=self._lister, args=(batches, results, stop), daemon=True)]
+        threads += [threading.Thread(target=self._worker, args=(batches, results, stop), daemon=True)
+                    for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        running = self.workers
+        consumed = 0
+        try:
+            while running:
+                record = results.get()
+                if record is self._STOP:
+                    running -= 1
+                    continue
+                if isinstance(record, Exception):
+                    raise record
+                if record.players:
+                    yield record
+                self.checkpoint.finish(self._key(record.queue, record.date, record.hour), record.match_id)
+                consumed += 1
+                if consumed % self.checkpoint_every == 0:
+                    self.checkpoint.save()
+        finally:
+            stop.set()
+            # Workers finish the batch they are fetching, which is left for the next crawl
+            for thread in threads:
+                thread.join()
+            self.checkpoint.save()
+
+    def __iter__(self):
+        return self.crawl()
+
+
+class CompactIdSet(object):
+    """
+    An exact set of non-negative integer IDs using about 8 bytes per ID.
+
+    IDs are kept in a sorted array of 64-bit integers. New IDs go to a small
+    set first, which is merged into the array once it grows to an eighth of
+    its size, so adding stays cheap on average.
+    """
+
+    def __init__(self):
+        self._sorted = array('Q')
+        self._recent = set()
+
+    def add(self, key):
+        """
+        :param key: The ID to add
+        :return: Whether the ID was new
+        """
+        if key in self:
+            return False
+        self._recent.add(key)
+        if len(self._recent) >= max(4096, len(self._sorted) // 8):
+            self._merge()
+        return True
+
+    def _merge(self):
+        self._sorted = array('Q', heapq.merge(self._sorted, sorted(self._recent)))
+        self._recent = set()
+
+    def __contains__(self, key):
+        if key in self._recent:
+            return True
+        i = bisect.bisect_left(self._sorted, key)
+        return i < len(self._sorted) and self._sorted[i] == key
+
+    def __len__(self):
+        return len(self._sorted) + len(self._recent)
+
+
+class BloomFilter(object):
+    """
+    A probabilistic set with a fixed memory footprint.
+
+    Membership tests never miss a key that was added, but answer yes for
+    keys that weren't with a probability of about ``error_rate`` once
+    ``capacity`` keys have been added. Used by a :class:`FriendGraphCrawler`,
+    a false positive means a player is not crawled.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        :param capacity: The number of keys the filter is sized for
+        :param error_rate: The false positive rate once ``capacity`` keys are added
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # Double hashing: the i-th position is h1 + i * h2
+        digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        """
+        :param key: The key to add
+        :return: Whether the key was new, as far as the filter can tell
+        """
+        new = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self):
+        return self.count
+
+
+class DiskFrontier(object):
+    """
+    A first-in first-out queue of ``(player_id, depth)`` pairs that spills to disk.
+
+    Up to ``memory_items`` pairs are kept in memory. Once it is full, new
+    pairs are appended to a temporary file as fixed size records, and read
+    back in blocks when the pairs in memory run out.
+    """
+    _RECORD = struct.Struct('<QH')
+
+    def __init__(self, memory_items=100000, directory=None):
+        """
+        :param memory_items: The maximum number of pairs kept in memory
+        :param directory: The directory of the spill file, defaults to the system's temporary directory
+        """
+        self.memory_items = memory_items
+        self.directory = directory
+        self._memory = collections.deque()
+        self._file = None
+        self._read_offset = 0
+        self._spilled = 0
+
+    def put(self, player_id, depth):
+        """
+        :param player_id: The ID of the player to crawl
+        :param depth: The player's distance from the seeds
+        """
+        if not self._spilled and len(self._memory) < self.memory_items:
+            self._memory.append((player_id, depth))
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self.directory)
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(self._RECORD.pack(player_id, depth))
+        self._spilled += 1
+
+    def get(self):
+        """
+        :return: The oldest ``(player_id, depth)`` pair, or None if the frontier is empty
+        """
+        if not self._memory and self._spilled:
+            self._load()
+        return self._memory.popleft() if self._memory else None
+
+    def _load(self):
+        count = min(self._spilled, self.memory_items)
+        self._file.seek(self._read_offset)
+        data = self._file.read(count * self._RECORD.size)
+        self._memory.extend(self._RECORD.iter_unpack(data))
+        self._read_offset += len(data)
+        self._spilled -= count
+        if not self._spilled:
+            # Everything on disk has been read, start the file over
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_offset = 0
+
+    def __len__(self):
+        return len(self._memory) + self._spilled
+
+    def close(self):
+        """
+        Removes the spill file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class FriendGraphCrawler(object):
+    """
+    Crawls the friend graph breadth-first from some seed players.
+
+    Worker threads call :meth:`smite.SmiteClient.get_friends` for the players
+    in the frontier, and :meth:`smite.SmiteClient.get_player` for every
+    player found if ``profiles`` is set. Each friendship found is handed out
+    as a :class:`FriendEdge` as soon as it is known, so the edge list can be
+    written out while the crawl runs.
+
+    Players are deduplicated by ID in ``visited``: a :class:`CompactIdSet`
+    by default, or a :class:`BloomFilter` for crawls too large to keep every
+    ID, at the cost of skipping a few players. The frontier is a
+    :class:`DiskFrontier`, so only ``memory_items`` players waiting to be
+    crawled are kept in memory.
+
+    A player whose friends can't be fetched, once the client's retries are
+    used up, is logged and counted under ``failed`` in ``stats``, and the
+    crawl carries on without their friends.
+    """
+
+    def __init__(self, client, seeds, max_depth=2, max_players=None, profiles=False, workers=8, visited=None,
+                 memory_items=100000, directory=None, endpoint=None):
+        """
+        :param client: The :class:`smite.SmiteClient` to crawl with
+        :param seeds: An iterable of player names or IDs to start from
+        :param max_depth: The distance from the seeds up to which players are found. Friends of players at this
+            distance are not requested.
+        :param max_players: The maximum number of players found, or None for no limit
+        :param profiles: Whether to call :meth:`smite.SmiteClient.get_player` for every player found
+        :param workers: The number of threads making requests
+        :param visited: An object with ``add`` and ``__len__`` methods like :class:`CompactIdSet` or
+            :class:`BloomFilter` recording the players found. Defaults to a new :class:`CompactIdSet`.
+        :param memory_items: The maximum number of frontier entries kept in memory
+        :param directory: The directory the frontier spills to
+        :param endpoint: The :class:`smite.Endpoint` the players play on, defaults to the client's endpoint
+        """
+        self.client = client
+        self.seeds = list(seeds)
+        self.max_depth = max_depth
+        self.max_players = max_players
+        self.profiles = profiles
+        self.workers = workers
+        self.visited = visited if visited is not None else CompactIdSet()
+        self.memory_items = memory_items
+        self.directory = directory
+        self.endpoint = endpoint
+        self.stats = collections.Counter()
+
+    def _resolve(self, seed):
+        seed = str(seed)
+        if seed.isdigit():
+            return int(seed)
+        try:
+            rows = self.client.get_player(seed, endpoint=self.endpoint)
+        except NoResultError:
+            logger.debug('Seed player %s was not found', seed)
+            return None
+        except SmiteError as e:
+            logger.warning('Seed player %s could not be looked up: %s', seed, e)
+            return None
+        # Rows are dictionaries, or Player models if the client was created with models=True
+        player_id = rows[0].get('Id') if rows and hasattr(rows[0], 'get') else None
+        return int(player_id) if player_id else None
+
+    def _expand(self, player_id, depth, stop):
+        player = None
+        if self.profiles:
+            try:
+                rows = self.client.get_player(player_id, endpoint=self.endpoint)
+                player = rows[0] if rows else None
+            except NoResultError:
+                logger.debug('No profile for player %s', player_id)
+            except SmiteError as e:
+                logger.warning('Profile of player %s could not be fetched: %s', player_id, e)
+        friends = []
+        if depth < self.max_depth and not stop.is_set():
+            try:
+                rows = self.client.get_friends(player_id, endpoint=self.endpoint)
+            except NoResultError:
+                logger.debug('No friends listed for player %s', player_id)
+                rows = []
+            except SmiteError as e:
+                logger.warning('Friends of player %s could not be fetched: %s', player_id, e)
+                # None tells the crawl the player failed, as opposed to having no friends
+                return player, None
+            # Friends with hidden profiles are listed without a player ID
+            friends = [int(row['player_id']) for row in rows
+                       if isinstance(row, dict) and str(row.get('player_id') or '0').isdigit()
+                       and int(row['player_id'])]
+        return player, friends
+
+    def _discover(self, frontier, player_id, depth):
+        if self.max_players is not None and len(self.visited) >= self.max_players:
+            return
+        if not self.visited.add(player_id):
+            return
+        self.stats['players'] += 1
+        # Players at the maximum depth only need crawling for their profile
+        if depth < self.max_depth or self.profiles:
+            frontier.put(player_id, depth)
+
+    def crawl(self):
+        """
+        :return: A generator of :class:`FriendEdge` tuples, one for each friend listed by each crawled player,
+            and if ``profiles`` is set, a :class:`PlayerRecord` for every player found, with None as the player
+            if their profile couldn't be fetched.
+        """
+        frontier = DiskFrontier(self.memory_items, self.directory)
+        pending = {}
+        stop = threading.Event()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(self.workers) as executor:
+                try:
+                    for player_id in executor.map(self._resolve, self.seeds):
+                        if player_id is not None:
+                            self._discover(frontier, player_id, 0)
+                    while True:
+                        while len(pending) < self.workers * 2:
+                            entry = frontier.get()
+                            if entry is None:
+                                break
+                            pending[executor.submit(self._expand, entry[0], entry[1], stop)] = entry
+                        if not pending:
+                            break
+                        done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            player_id, depth = pending.pop(future)
+                            player, friends = future.result()
+                            if self.profiles:
+                                yield PlayerRecord(player_id, depth, player)
+                            if friends is None:
+                                self.stats['failed'] += 1
+                                friends = []
+                            elif depth < self.max_depth:
+                                self.stats['expanded'] += 1
+                            for friend_id in friends:
+                                self.stats['edges'] += 1
+                                yield FriendEdge(player_id, friend_id, depth)
+                                self._discover(frontier, friend_id, depth + 1)
+                        logger.debug('Friend graph: %d players found, %d in the frontier, %d in flight',
+                                     len(self.visited), len(frontier), len(pending))
+                finally:
+                    # Leaving the executor waits for its queued tasks, so they are cancelled first. Tasks already
+                    # running stop after their current request.
+                    stop.set()
+                    for future in pending:
+                        future.cancel()
+        finally:
+            frontier.close()
+
+    def __iter__(self):
+        return self.crawl()
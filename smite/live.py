@@ -0,0 +1,338 @@
+"""
+    Watching players for live matches.
+"""
+import asyncio
+import collections
+import heapq
+import threading
+import time
+from array import array
+from datetime import datetime
+
+from smite import NoResultError, RateLimiter, SmiteError, logger
+
+LiveEvent = collections.namedtuple('LiveEvent', ['kind', 'player', 'status', 'match_id', 'details'])
+
+OFFLINE = 0
+IN_LOBBY = 1
+GOD_SELECTION = 2
+IN_GAME = 3
+ONLINE = 4
+
+
+class _PlayerState(object):
+    __slots__ = ('player', 'status', 'match_id', 'interval', 'due', 'activity')
+
+    def __init__(self, player, interval):
+        self.player = player
+        self.status = None
+        self.match_id = None
+        self.interval = interval
+        self.due = None
+        # Number of polls that found the player online, for each hour of the day in UTC
+        self.activity = array('I', [0] * 24)
+
+
+class LiveTracker(object):
+    """
+    Polls the status of players and reports when they start and finish matches.
+
+    Players are polled with :meth:`smite.SmiteClient.get_player_status` on an
+    adaptive schedule:
+
+    - right after a status change, and while a player is in the lobby, in
+      god selection or online, they are polled every ``min_interval`` seconds
+    - while a player is in a match, they are polled every ``match_interval`` seconds
+    - while a player stays offline, the interval doubles up to ``max_interval``,
+      or up to ``active_interval`` during the hours of the day the player has
+      been seen online before
+
+    When a player enters a match, :meth:`smite.SmiteClient.get_match_player_details`
+    is called once for that match, even if several tracked players are in it.
+    Polls are paced to stay within ``requests_per_minute``. When more polls are
+    due than the budget allows, they are made in the order they fell due.
+
+    Events are :class:`LiveEvent` tuples with one of the kinds ``status``,
+    ``match_started`` and ``match_ended``. They are passed to ``callback``,
+    and can also be consumed by iterating over the tracker, or with
+    ``async for`` when the client is a :class:`smite.aio.AsyncSmiteClient`.
+
+    Players can be added and removed while a poll is waiting, from another
+    thread or another task.
+    """
+    # The longest a waiting poll sleeps before checking for new players and stop()
+    _SLEEP_STEP = 1.0
+
+    def __init__(self, client, players, requests_per_minute=60, callback=None, min_interval=30, match_interval=120,
+                 active_interval=5 * 60, max_interval=60 * 60, endpoint=None):
+        """
+        :param client: The :class:`smite.SmiteClient` or :class:`smite.aio.AsyncSmiteClient` to poll with
+        :param players: An iterable of player names to watch
+        :param requests_per_minute: The maximum number of requests made per minute
+        :param callback: A callable given every :class:`LiveEvent`
+        :param min_interval: Number of seconds between polls of players who may be about to start a match
+        :param match_interval: Number of seconds between polls of players in a match
+        :param active_interval: The longest interval between polls of offline players during their usual play times
+        :param max_interval: The longest interval between polls of offline players
+        :param endpoint: The :class:`smite.Endpoint` the players play on, defaults to the client's endpoint
+        """
+        self.client = client
+        self.callback = callback
+        self.min_interval = min_interval
+        self.match_interval = match_interval
+        self.active_interval = active_interval
+        self.max_interval = max_interval
+        self.endpoint = endpoint
+        self.polls = 0
+        self._budget = RateLimiter(rate=requests_per_minute / 60.0, burst=1)
+        self._players = {}
+        self._schedule = []
+        self._matches = collections.OrderedDict()
+        self._stopped = False
+        self._lock = threading.RLock()
+        for player in players:
+            self.add(player)
+
+    def add(self, player, delay=0):
+        """
+        :param player: The name of a player to start watching
+        :param delay: Number of seconds before the player is first polled
+        """
+        with self._lock:
+            if player in self._players:
+                return
+            state = self._players[player] = _PlayerState(player, self.min_interval)
+            self._push(state, delay)
+
+    def remove(self, player):
+        """
+        :param player: The name of a player to stop watching
+        """
+        with self._lock:
+            self._players.pop(player, None)
+
+    def stop(self):
+        """
+        Makes :meth:`run` and iteration over the tracker return once the current poll is done. A poll still
+        waiting to fall due returns without polling.
+        """
+        self._stopped = True
+
+    def _push(self, state, delay):
+        with self._lock:
+            state.due = time.monotonic() + delay
+            heapq.heappush(self._schedule, (state.due, state.player))
+
+    def _next_poll(self):
+        """
+        :return: A ``(player, due, wait)`` tuple of the next player to poll, the time the poll falls due and the
+            number of seconds to wait for it, or None if no players are watched
+        """
+        with self._lock:
+            while self._schedule:
+                due, player = self._schedule[0]
+                state = self._players.get(player)
+                if state is None or state.due != due:
+                    # The player was removed, or removed and added again
+                    heapq.heappop(self._schedule)
+                    continue
+                return player, due, max(due - time.monotonic(), 0.0)
+            return None
+
+    def _take(self, player, due):
+        """
+        :return: The state of the player whose poll fell due, taken off the schedule, or None if the player
+            was removed or added again since
+        """
+        with self._lock:
+            state = self._players.get(player)
+            if state is None or state.due != due:
+                return None
+            if self._schedule[0] == (due, player):
+                heapq.heappop(self._schedule)
+            else:
+                # Players added while the poll waited may be due earlier
+                self._schedule.remove((due, player))
+                heapq.heapify(self._schedule)
+            self.polls += 1
+            return state
+
+    def _sleep(self, seconds):
+        """
+        :return: False if :meth:`stop` was called before the time was up
+        """
+        end = time.monotonic() + seconds
+        while not self._stopped:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, self._SLEEP_STEP))
+        return False
+
+    async def _asleep(self, seconds):
+        end = time.monotonic() + seconds
+        while not self._stopped:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return True
+            await asyncio.sleep(min(remaining, self._SLEEP_STEP))
+        return False
+
+    def _is_active_hour(self, state):
+        total = sum(state.activity)
+        return total > 0 and state.activity[datetime.utcnow().hour] * 24 >= total
+
+    def _reschedule(self, state, changed):
+        if changed or state.status in (IN_LOBBY, GOD_SELECTION, ONLINE):
+            state.interval = self.min_interval
+        elif state.status == IN_GAME:
+            state.interval = self.match_interval
+        else:
+            limit = self.active_interval if self._is_active_hour(state) else self.max_interval
+            state.interval = min(state.interval * 2, max(limit, self.min_interval))
+        self._push(state, state.interval)
+
+    @staticmethod
+    def _parse_status(rows):
+        row = rows[0] if isinstance(rows, list) and rows else rows
+        if not isinstance(row, dict) or row.get('status') is None:
+            return OFFLINE, None
+        return row['status'], row.get('Match') or None
+
+    def _update(self, state, rows):
+        """
+        :return: A list of the events caused by the poll, and the ID of a match whose details are needed
+        """
+        status, match_id = self._parse_status(rows)
+        events = []
+        changed = status != state.status or match_id != state.match_id
+        if changed:
+            if state.status == IN_GAME and state.match_id is not None:
+                events.append(LiveEvent('match_ended', state.player, status, state.match_id, None))
+            events.append(LiveEvent('status', state.player, status, match_id, None))
+        if status != OFFLINE:
+            state.activity[datetime.utcnow().hour] += 1
+        entered = status == IN_GAME and match_id is not None and match_id != state.match_id
+        state.status, state.match_id = status, match_id
+        self._reschedule(state, changed)
+        return events, match_id if entered else None
+
+    def _match_started(self, state, match_id, details):
+        self._matches[match_id] = details
+        while len(self._matches) > 1000:
+            self._matches.popitem(last=False)
+        return LiveEvent('match_started', state.player, IN_GAME, match_id, details)
+
+    def _emit(self, events):
+        if self.callback is not None:
+            for event in events:
+                self.callback(event)
+        return events
+
+    def poll(self):
+        """
+        Waits for the next poll to fall due and makes it.
+
+        :return: A list of the :class:`LiveEvent` tuples it caused, None if no players are watched, or an empty
+            list if :meth:`stop` was called while waiting
+        """
+        while True:
+            upcoming = self._next_poll()
+            if upcoming is None:
+                return None
+            player, due, wait = upcoming
+            if wait > 0:
+                # Woken up regularly to notice players added in the meantime
+                if not self._sleep(min(wait, self._SLEEP_STEP)):
+                    return []
+                continue
+            if not self._sleep(self._budget.reserve()):
+                return []
+            state = self._take(player, due)
+            if state is not None:
+                break
+        try:
+            rows = self.client.get_player_status(player, endpoint=self.endpoint)
+        except NoResultError:
+            logger.debug('No status for %s, taking them as offline', player)
+            rows = None
+        except SmiteError as e:
+            logger.warning('Could not poll the status of %s: %s', player, e)
+            self._reschedule(state, False)
+            return []
+        events, match_id = self._update(state, rows)
+        if match_id is not None:
+            details = self._matches.get(match_id)
+            if details is None:
+                time.sleep(self._budget.reserve())
+                try:
+                    details = self.client.get_match_player_details(match_id, endpoint=self.endpoint)
+                except SmiteError as e:
+                    logger.warning('Could not fetch the players of match %s: %s', match_id, e)
+            events.append(self._match_started(state, match_id, details))
+        return self._emit(events)
+
+    def run(self):
+        """
+        Polls players until :meth:`stop` is called or no players are left, passing events to the callback.
+        """
+        self._stopped = False
+        while not self._stopped and self.poll() is not None:
+            pass
+
+    def __iter__(self):
+        self._stopped = False
+        while not self._stopped:
+            events = self.poll()
+            if events is None:
+                return
+            for event in events:
+                yield event
+
+    async def apoll(self):
+        """
+        The same as :meth:`poll`, for trackers using a :class:`smite.aio.AsyncSmiteClient`.
+        """
+        while True:
+            upcoming = self._next_poll()
+            if upcoming is None:
+                return None
+            player, due, wait = upcoming
+            if wait > 0:
+                if not await self._asleep(min(wait, self._SLEEP_STEP)):
+                    return []
+                continue
+            if not await self._asleep(self._budget.reserve()):
+                return []
+            state = self._take(player, due)
+            if state is not None:
+                break
+        try:
+            rows = await self.client.get_player_status(player, endpoint=self.endpoint)
+        except NoResultError:
+            logger.debug('No status for %s, taking them as offline', player)
+            rows = None
+        except SmiteError as e:
+            logger.warning('Could not poll the status of %s: %s', player, e)
+            self._reschedule(state, False)
+            return []
+        events, match_id = self._update(state, rows)
+        if match_id is not None:
+            details = self._matches.get(match_id)
+            if details is None:
+                await asyncio.sleep(self._budget.reserve())
+                try:
+                    details = await self.client.get_match_player_details(match_id, endpoint=self.endpoint)
+                except SmiteError as e:
+                    logger.warning('Could not fetch the players of match %s: %s', match_id, e)
+            events.append(self._match_started(state, match_id, details))
+        return self._emit(events)
+
+    async def __aiter__(self):
+        self._stopped = False
+        while not self._stopped:
+            events = await self.apoll()
+            if events is None:
+                return
+            for event in events:
+                yield event
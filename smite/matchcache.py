@@ -0,0 +1,92 @@
+"""
+    Durable storage for finished matches.
+
+    Match details never change once a match has finished, so they can be
+    kept on disk and served again after a restart without spending any of
+    the daily request quota.
+"""
+import json
+import zlib
+
+from smite._storage import SQLiteDatabase
+
+
+class SQLiteMatchCache(SQLiteDatabase):
+    """
+    Keeps the player rows of finished matches in an SQLite database.
+
+    Rows are stored as zlib compressed JSON, keyed by endpoint and match ID.
+    The database is opened in WAL mode so it can be shared between
+    processes, and a cache instance can be shared between threads.
+    """
+
+    def __init__(self, path, compresslevel=6):
+        """
+        :param path: Path of the database file. It is created if it doesn't exist.
+        :param compresslevel: The zlib compression level used for stored matches
+        """
+        SQLiteDatabase.__init__(self, path, [
+            'CREATE TABLE IF NOT EXISTS matches ('
+            'endpoint TEXT NOT NULL, match_id TEXT NOT NULL, payload BLOB NOT NULL, '
+            'PRIMARY KEY (endpoint, match_id)) WITHOUT ROWID'])
+        self.compresslevel = compresslevel
+
+    def _encode(self, rows):
+        return zlib.compress(json.dumps(rows, separators=(',', ':')).encode('utf-8'), self.compresslevel)
+
+    @staticmethod
+    def _decode(payload):
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+    def get(self, endpoint, match_id):
+        """
+        :param endpoint: The endpoint URL the match was played on
+        :param match_id: The ID of the match
+        :return: The player rows of the match, or None if it isn't stored
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT payload FROM matches WHERE endpoint = ? AND match_id = ?',
+                                     (endpoint, str(match_id))).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def get_many(self, endpoint, match_ids):
+        """
+        :param endpoint: The endpoint URL the matches were played on
+        :param match_ids: An iterable of match IDs
+        :return: A dictionary mapping the string ID of each stored match to its player rows
+        """
+        with self._lock:
+            found = self._select_many('SELECT match_id, payload FROM matches WHERE endpoint = ? AND match_id IN ({})',
+                                      [endpoint], [str(match_id) for match_id in match_ids])
+        return {match_id: self._decode(payload) for match_id, payload in found}
+
+    def put(self, endpoint, match_id, rows):
+        """
+        :param endpoint: The endpoint URL the match was played on
+        :param match_id: The ID of the match
+        :param rows: The player rows of the finished match
+        """
+        self.put_many(endpoint, [(match_id, rows)])
+
+    def put_many(self, endpoint, matches):
+        """
+        :param endpoint: The endpoint URL the matches were played on
+        :param matches: An iterable of ``(match_id, rows)`` pairs
+        """
+        values = [(endpoint, str(match_id), self._encode(rows)) for match_id, rows in matches]
+        if not values:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany('INSERT OR REPLACE INTO matches (endpoint, match_id, payload) VALUES (?, ?, ?)',
+                                       values)
+
+    def __contains__(self, key):
+        endpoint, match_id = key
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM matches WHERE endpoint = ? AND match_id = ?',
+                                      (endpoint, str(match_id))).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM matches').fetchone()[0]
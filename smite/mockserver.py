@@ -0,0 +1,400 @@
+"""
+    A local imitation of the Smite API for testing and benchmarking.
+
+    :class:`MockSmiteServer` serves the ``smiteapi.svc`` URL scheme over
+    HTTP using only the standard library. It checks request signatures,
+    issues sessions that expire, enforces request limits and answers with
+    synthetic but deterministic gods, items, players and matches. Latency,
+    error rates and limits are configurable, so clients can be measured
+    without spending any of the daily quota.
+
+    The server can also be started from the command line::
+
+        python -m smite.mockserver --port 8000 --latency 0.05
+"""
+import argparse
+import collections
+import hashlib
+import http.server
+import json
+import random
+import socketserver
+import threading
+import time
+import urllib.parse
+import uuid
+from datetime import datetime, timedelta
+
+from smite import SmiteClient, logger
+
+_TIMESTAMP_FORMAT = '%Y%m%d%H%M%S'
+_DATETIME_FORMAT = '%m/%d/%Y %I:%M:%S %p'
+_PANTHEONS = ['Arthurian', 'Celtic', 'Chinese', 'Egyptian', 'Greek', 'Hindu', 'Japanese', 'Mayan', 'Norse', 'Roman']
+_ROLES = ['Assassin', 'Guardian', 'Hunter', 'Mage', 'Warrior']
+
+
+class _Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Small JSON responses would otherwise wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug('Mock API: ' + format, *args)
+
+    def do_GET(self):
+        status, body = self.server.mock.handle(self.path)
+        data = body.encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockSmiteServer(object):
+    """
+    A stdlib HTTP server answering like the Smite API.
+
+    Use it as a context manager, and create clients that talk to it with
+    :meth:`client`::
+
+        with MockSmiteServer(latency=0.02) as server:
+            client = server.client()
+            gods = client.get_gods()
+
+    Note
+    -----
+    Data is generated from ``seed``, so two servers with the same seed
+    return the same gods, items, players and matches.
+    """
+    PATH = '/smiteapi.svc/'
+
+    def __init__(self, dev_id=1004, auth_key='23DF3C7E9BD14D84BF892AD206B6755C', host='127.0.0.1', port=0,
+                 latency=0.0, jitter=0.0, error_rate=0.0, daily_limit=7500, requests_per_second=None,
+                 session_lifetime=15 * 60, session_cap=500, gods=100, items=250, matches_per_hour=25, seed=0):
+        """
+        :param dev_id: The developer ID requests must be made with
+        :param auth_key: The authorization key requests must be signed with
+        :param host: The interface to listen on
+        :param port: The port to listen on. The default of 0 picks a free port.
+        :param latency: Number of seconds every response is delayed by
+        :param jitter: Up to this many extra seconds are added to each delay at random
+        :param error_rate: The fraction of requests answered with HTTP 503
+        :param daily_limit: The number of requests allowed before every request is refused, or None for no limit
+        :param requests_per_second: The number of requests allowed each second before HTTP 429 is returned,
+            or None for no limit
+        :param session_lifetime: Number of seconds a session is valid for after creation
+        :param session_cap: The number of sessions that may be created before session creation is refused
+        :param gods: The number of gods served
+        :param items: The number of items served
+        :param matches_per_hour: The number of matches listed for every queue and hour
+        :param seed: Seed of the generated data
+        """
+        self.dev_id = str(dev_id)
+        self.auth_key = str(auth_key)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.daily_limit = daily_limit
+        self.requests_per_second = requests_per_second
+        self.session_lifetime = session_lifetime
+        self.session_cap = session_cap
+        self.gods = gods
+        self.items = items
+        self.matches_per_hour = matches_per_hour
+        self.seed = seed
+        self.counts = collections.Counter()
+        self._sessions = {}
+        self._second = (0, 0)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        :return: The base URL of the mock API, to be used in place of an :class:`smite.Endpoint` value
+        """
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}{}'.format(host, port, self.PATH)
+
+    def start(self):
+        """
+        Starts serving requests on a background thread.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the server and closes its socket.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def client(self, client_class=SmiteClient, **kwargs):
+        """
+        :param client_class: The client class to create, such as :class:`smite.aio.AsyncSmiteClient`
+        :param kwargs: Further arguments passed to the client
+        :return: A client using this server as its default endpoint
+        """
+        client = client_class(self.dev_id, self.auth_key, **kwargs)
+        client._BASE_URL = self.url
+        return client
+
+    def reset(self):
+        """
+        Clears the request counts and removes all sessions.
+        """
+        with self._lock:
+            self.counts.clear()
+            self._sessions.clear()
+
+    def requests(self):
+        """
+        :return: The total number of requests received, pings included
+        """
+        return sum(self.counts.values())
+
+    def handle(self, path):
+        """
+        :param path: The path of a request
+        :return: A ``(status, body)`` tuple answering it
+        """
+        if not path.startswith(self.PATH):
+            return 404, None
+        parts = path[len(self.PATH):].strip('/').split('/')
+        method = parts[0].lower()
+        if not method.endswith('json'):
+            return 404, None
+        method = method[:-4]
+        with self._lock:
+            self.counts[method] += 1
+            total = sum(self.counts.values())
+            limited = self._throttle()
+            failed = self._random.random() < self.error_rate
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+        if limited:
+            return 429, None
+        if failed:
+            return 503, None
+        if method == 'ping':
+            return 200, json.dumps('Smite API (ver 5.0.0.0) [PATCH - 7.1] - Ping successful. Server Date:{}'.format(
+                datetime.utcnow().strftime(_DATETIME_FORMAT)))
+        if self.daily_limit is not None and total > self.daily_limit:
+            return 200, json.dumps([self._error('Daily request limit reached')])
+        if method == 'createsession':
+            return 200, json.dumps(self._create_session(parts))
+        if len(parts) < 5:
+            return 404, None
+        error = self._check_request(method, parts)
+        if error is not None:
+            return 200, json.dumps([self._error(error)])
+
+        handler = getattr(self, '_' + method, None)
+        result = handler(*[urllib.parse.unquote(param) for param in parts[5:]]) if handler is not None else []
+        return 200, json.dumps(result)
+
+    def _throttle(self):
+        if self.requests_per_second is None:
+            return False
+        second = int(time.time())
+        start, count = self._second
+        count = count + 1 if start == second else 1
+        self._second = (second, count)
+        return count > self.requests_per_second
+
+    @staticmethod
+    def _error(message):
+        return {'ret_msg': message}
+
+    def _check_signature(self, method, dev_id, signature, timestamp):
+        if dev_id != self.dev_id:
+            return 'Invalid developer id.'
+        expected = hashlib.md5((dev_id + method + self.auth_key + timestamp).encode('utf-8')).hexdigest()
+        if signature != expected:
+            return 'Invalid signature. Your signature must be the md5 hash of dev id, method, auth key and timestamp.'
+        try:
+            sent = datetime.strptime(timestamp, _TIMESTAMP_FORMAT)
+        except ValueError:
+            return 'Invalid timestamp.'
+        if abs(datetime.utcnow() - sent) > timedelta(minutes=15):
+            return 'Timestamp is too far from the current time.'
+        return None
+
+    def _create_session(self, parts):
+        if len(parts) < 4:
+            return self._error('Invalid request.')
+        error = self._check_signature('createsession', parts[1], parts[2], parts[3])
+        if error is not None:
+            return self._error(error)
+        with self._lock:
+            if self.session_cap is not None and self.counts['createsession'] > self.session_cap:
+                return self._error('Maximum number of sessions reached for today')
+            session_id = uuid.uuid4().hex.upper()
+            self._sessions[session_id] = time.time()
+        return {'ret_msg': 'Approved', 'session_id': session_id, 'timestamp': datetime.utcnow().strftime(_DATETIME_FORMAT)}
+
+    def _check_request(self, method, parts):
+        error = self._check_signature(method, parts[1], parts[2], parts[4])
+        if error is not None:
+            return error
+        created = self._sessions.get(parts[3])
+        if created is None or time.time() - created > self.session_lifetime:
+            return 'Invalid session id.'
+        return None
+
+    def _rng(self, *key):
+        return random.Random(':'.join(str(part) for part in (self.seed,) + key))
+
+    def _god(self, god_id):
+        rng = self._rng('god', god_id)
+        return {'id': god_id, 'Name': 'God {}'.format(god_id), 'Title': 'The {}'.format(rng.choice(_ROLES)),
+                'Pantheon': rng.choice(_PANTHEONS), 'Roles': ' ' + rng.choice(_ROLES), 'Type': ' Melee, Physical',
+                'Health': rng.randint(400, 600), 'Mana': rng.randint(200, 300), 'Speed': rng.randint(360, 380),
+                'latestGod': 'n', 'ret_msg': None}
+
+    def _item(self, item_id):
+        rng = self._rng('item', item_id)
+        return {'ItemId': item_id, 'DeviceName': 'Item {}'.format(item_id), 'ItemTier': rng.randint(1, 4),
+                'Price': rng.randint(1, 30) * 100, 'Type': 'Item', 'ChildItemId': 0, 'RootItemId': item_id,
+                'IconId': item_id, 'ActiveFlag': 'y', 'ret_msg': None}
+
+    def _match_rows(self, match_id):
+        rng = self._rng('match', match_id)
+        started = datetime(2017, 1, 1) + timedelta(minutes=rng.randint(0, 525600))
+        minutes = rng.randint(15, 45)
+        winner = rng.randint(1, 2)
+        rows = []
+        for slot in range(10):
+            task_force = 1 if slot < 5 else 2
+            god_id = rng.randint(1, self.gods)
+            player_id = rng.randint(1, 10 ** 6)
+            row = {'Match': match_id, 'playerId': player_id, 'playerName': 'Player{}'.format(player_id),
+                   'GodId': god_id, 'Reference_Name': 'God {}'.format(god_id), 'match_queue_id': 426,
+                   'TaskForce': task_force, 'Win_Status': 'Winner' if task_force == winner else 'Loser',
+                   'Kills_Player': rng.randint(0, 20), 'Deaths': rng.randint(0, 15), 'Assists': rng.randint(0, 25),
+                   'Damage_Player': rng.randint(5000, 60000), 'Gold_Earned': rng.randint(8000, 25000),
+                   'Final_Match_Level': 20, 'Minutes': minutes, 'Entry_Datetime': started.strftime(_DATETIME_FORMAT),
+                   'ret_msg': None}
+            for i in range(1, 7):
+                item_id = rng.randint(1, self.items)
+                row['ItemId{}'.format(i)] = item_id
+                row['Item_Purch_{}'.format(i)] = 'Item {}'.format(item_id)
+            rows.append(row)
+        return rows
+
+    def _testsession(self, *params):
+        return 'This was a successful test with the following parameters added: developer: {}'.format(self.dev_id)
+
+    def _getdataused(self, *params):
+        with self._lock:
+            return [{'Active_Sessions': len(self._sessions), 'Concurrent_Sessions': 50,
+                     'Request_Limit_Daily': self.daily_limit or 0, 'Session_Cap': self.session_cap or 0,
+                     'Session_Time_Limit': self.session_lifetime // 60, 'Total_Requests_Today': self.requests(),
+                     'Total_Sessions_Today': self.counts['createsession'], 'ret_msg': None}]
+
+    def _getpatchinfo(self, *params):
+        return {'version_string': '7.1', 'ret_msg': None}
+
+    def _getgods(self, lang=None):
+        return [self._god(god_id) for god_id in range(1, self.gods + 1)]
+
+    def _getgodskins(self, god_id):
+        god_id = int(god_id)
+        if not 1 <= god_id <= self.gods:
+            return []
+        return [{'god_id': god_id, 'god_name': 'God {}'.format(god_id), 'skin_id1': god_id * 100 + i,
+                 'skin_name': 'Skin {}'.format(i), 'obtainability': 'Normal', 'ret_msg': None} for i in range(3)]
+
+    def _getitems(self, lang=None):
+        return [self._item(item_id) for item_id in range(1, self.items + 1)]
+
+    def _getmatchdetails(self, match_id):
+        return self._match_rows(int(match_id))
+
+    def _getmatchdetailsbatch(self, match_ids):
+        return [row for match_id in match_ids.split(',') if match_id for row in self._match_rows(int(match_id))]
+
+    def _getmatchidsbyqueue(self, queue, date, hour='-1'):
+        hours = range(24) if int(hour) < 0 else [int(hour)]
+        return [{'Active_Flag': 'n', 'Match': str(int(date) % 10 ** 6 * 10 ** 5 + h * 1000 + i), 'ret_msg': None}
+                for h in hours for i in range(self.matches_per_hour)]
+
+    def _getplayer(self, player):
+        rng = self._rng('player', player)
+        if player.isdigit():
+            player_id, name = int(player), 'Player{}'.format(player)
+        else:
+            player_id, name = rng.randint(1, 10 ** 6), player
+        return [{'Id': player_id, 'Name': name, 'Level': rng.randint(1, 150), 'MasteryLevel': rng.randint(0, 100),
+                 'Wins': rng.randint(0, 5000), 'Losses': rng.randint(0, 5000), 'Leaves': rng.randint(0, 50),
+                 'Region': 'Europe', 'Team_Name': '', 'Created_Datetime': '1/1/2015 12:00:00 PM',
+                 'Last_Login_Datetime': datetime.utcnow().strftime(_DATETIME_FORMAT), 'ret_msg': None}]
+
+    def _getplayerstatus(self, player):
+        rng = self._rng('status', player, int(time.time() // 60))
+        status = rng.choice([0, 1, 1, 3, 4])
+        return [{'Match': rng.randint(10 ** 8, 10 ** 9) if status == 3 else 0, 'status': status,
+                 'status_string': ['Offline', 'In Lobby', 'God Selection', 'In Game', 'Online'][status],
+                 'ret_msg': None}]
+
+    def _getmatchhistory(self, player):
+        rng = self._rng('history', player)
+        return [{'Match': rng.randint(10 ** 8, 10 ** 9), 'God': 'God {}'.format(rng.randint(1, self.gods)),
+                 'Kills': rng.randint(0, 20), 'Deaths': rng.randint(0, 15), 'Assists': rng.randint(0, 25),
+                 'Win_Status': rng.choice(['Win', 'Loss']), 'Queue': 'Conquest', 'Minutes': rng.randint(15, 45),
+                 'playerName': player, 'ret_msg': None} for _ in range(50)]
+
+    def _getfriends(self, player):
+        rng = self._rng('friends', player)
+        return [{'account_id': str(friend), 'name': 'Player{}'.format(friend), 'player_id': str(friend),
+                 'ret_msg': None} for friend in (rng.randint(1, 10 ** 6) for _ in range(rng.randint(0, 20)))]
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Runs a local imitation of the Smite API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--dev-id', default=1004)
+    parser.add_argument('--auth-key', default='23DF3C7E9BD14D84BF892AD206B6755C')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--daily-limit', type=int, default=7500)
+    parser.add_argument('--requests-per-second', type=int, default=None)
+    options = parser.parse_args(args)
+    server = MockSmiteServer(options.dev_id, options.auth_key, options.host, options.port, options.latency,
+                             options.jitter, options.error_rate, options.daily_limit, options.requests_per_second)
+    print('Serving the mock Smite API at {}'.format(server.url))
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
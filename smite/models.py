@@ -0,0 +1,307 @@
+"""
+    Compact typed models for API results.
+
+    A model keeps the integer values of a result row in an :class:`array.array`
+    and its other values in a tuple, with short strings interned. The keys of
+    the row are shared with every other row that has the same keys. This
+    takes a fraction of the memory of a dict per row. Values are only
+    converted, for example into :class:`datetime.datetime`, when they are
+    accessed.
+"""
+import sys
+from array import array
+from datetime import datetime
+
+_SCHEMAS = {}
+_INT_MIN = -2 ** 63
+_INT_MAX = 2 ** 63 - 1
+_INTERN_MAX_LENGTH = 64
+
+
+def _is_int(value):
+    return type(value) is int and _INT_MIN <= value <= _INT_MAX
+
+
+def _schema(keys, layout):
+    schema = _SCHEMAS.get((keys, layout))
+    if schema is None:
+        ints = objs = 0
+        index = {}
+        for key, is_int in zip(keys, layout):
+            if is_int:
+                index[key] = (True, ints)
+                ints += 1
+            else:
+                index[key] = (False, objs)
+                objs += 1
+        schema = _SCHEMAS.setdefault((keys, layout), (keys, index))
+    return schema
+
+
+def _compact(value):
+    if type(value) is str and len(value) <= _INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _parse_datetime(value):
+    if not value:
+        return None
+    return datetime.strptime(value, '%m/%d/%Y %I:%M:%S %p')
+
+
+def _identity(value):
+    return value
+
+
+class Model(object):
+    """
+    Base class for models wrapping a single result row.
+
+    Fields listed in ``_FIELDS`` are available as attributes. Any key of the
+    original row can also be read with ``model['Key']`` or as an attribute of
+    the same name.
+    """
+    __slots__ = ('_schema', '_ints', '_objs')
+    _FIELDS = {}
+    _REPR_FIELDS = ()
+
+    def __init__(self, data):
+        """
+        :param data: A result row as returned by the API
+        """
+        values = tuple(data.values())
+        layout = tuple(_is_int(value) for value in values)
+        self._schema = _schema(tuple(data), layout)
+        self._ints = array('q', [value for value, is_int in zip(values, layout) if is_int])
+        self._objs = tuple(_compact(value) for value, is_int in zip(values, layout) if not is_int)
+
+    def _value(self, location):
+        is_int, position = location
+        return self._ints[position] if is_int else self._objs[position]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            key, convert = self._FIELDS[name]
+        except KeyError:
+            key, convert = name, _identity
+        location = self._schema[1].get(key)
+        if location is None:
+            raise AttributeError('{} has no field {!r}'.format(type(self).__name__, name))
+        return convert(self._value(location))
+
+    def __getitem__(self, key):
+        return self._value(self._schema[1][key])
+
+    def get(self, key, default=None):
+        """
+        :param key: A key of the original row
+        :param default: The value returned if the row has no such key
+        :return: The raw value stored under key
+        """
+        location = self._schema[1].get(key)
+        return default if location is None else self._value(location)
+
+    def keys(self):
+        """
+        :return: The keys of the original row
+        """
+        return self._schema[0]
+
+    def to_dict(self):
+        """
+        :return: The original row as a dictionary
+        """
+        keys, index = self._schema
+        return {key: self._value(index[key]) for key in keys}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ', '.join('{}={!r}'.format(name, self.get(self._FIELDS[name][0])) for name in self._REPR_FIELDS)
+        return '{}({})'.format(type(self).__name__, fields)
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+
+class MatchPlayer(Model):
+    """
+    A player's statistics in a finished match, as returned by :meth:`smite.SmiteClient.get_match_details`.
+    """
+    __slots__ = ()
+    _FIELDS = {
+        'match_id': ('Match', _identity),
+        'player_id': ('playerId', _identity),
+        'player_name': ('playerName', _identity),
+        'god_id': ('GodId', _identity),
+        'god_name': ('Reference_Name', _identity),
+        'queue': ('match_queue_id', _identity),
+        'task_force': ('TaskForce', _identity),
+        'win_status': ('Win_Status', _identity),
+        'kills': ('Kills_Player', _identity),
+        'deaths': ('Deaths', _identity),
+        'assists': ('Assists', _identity),
+        'damage': ('Damage_Player', _identity),
+        'gold': ('Gold_Earned', _identity),
+        'level': ('Final_Match_Level', _identity),
+        'minutes': ('Minutes', _identity),
+        'entry_datetime': ('Entry_Datetime', _parse_datetime),
+    }
+    _REPR_FIELDS = ('match_id', 'player_name', 'god_name', 'win_status')
+
+    @property
+    def item_ids(self):
+        """
+        :return: The IDs of the items the player finished the match with
+        """
+        return [item_id for item_id in (self.get('ItemId{}'.format(i)) for i in range(1, 7)) if item_id]
+
+    @property
+    def won(self):
+        """
+        :return: Whether the player's team won the match
+        """
+        return self.get('Win_Status') == 'Winner'
+
+
+class Match(object):
+    """
+    A finished match and the statistics of each of its players.
+    """
+    __slots__ = ('match_id', 'players')
+
+    def __init__(self, match_id, rows):
+        """
+        :param match_id: The ID of the match
+        :param rows: The player rows of the match
+        """
+        self.match_id = match_id
+        self.players = tuple(row if isinstance(row, MatchPlayer) else MatchPlayer(row) for row in rows)
+
+    def _first(self, name):
+        return getattr(self.players[0], name) if self.players else None
+
+    @property
+    def queue(self):
+        """
+        :return: The ID of the queue the match was played in
+        """
+        return self._first('queue')
+
+    @property
+    def minutes(self):
+        """
+        :return: The length of the match in minutes
+        """
+        return self._first('minutes')
+
+    @property
+    def entry_datetime(self):
+        """
+        :return: The time the match started
+        """
+        return self._first('entry_datetime')
+
+    @property
+    def winners(self):
+        """
+        :return: The players on the winning team
+        """
+        return [player for player in self.players if player.won]
+
+    @property
+    def losers(self):
+        """
+        :return: The players on the losing team
+        """
+        return [player for player in self.players if not player.won]
+
+    def to_list(self):
+        """
+        :return: The original player rows as a list of dictionaries
+        """
+        return [player.to_dict() for player in self.players]
+
+    def __len__(self):
+        return len(self.players)
+
+    def __iter__(self):
+        return iter(self.players)
+
+    def __bool__(self):
+        return bool(self.players)
+
+    def __eq__(self, other):
+        return isinstance(other, Match) and self.match_id == other.match_id and self.players == other.players
+
+    def __repr__(self):
+        return 'Match(match_id={!r}, players={})'.format(self.match_id, len(self.players))
+
+
+class God(Model):
+    """
+    A god and its attributes, as returned by :meth:`smite.SmiteClient.get_gods`.
+    """
+    __slots__ = ()
+    _FIELDS = {
+        'id': ('id', _identity),
+        'name': ('Name', _identity),
+        'title': ('Title', _identity),
+        'pantheon': ('Pantheon', _identity),
+        'roles': ('Roles', lambda value: value.strip() if value else value),
+        'type': ('Type', _identity),
+        'health': ('Health', _identity),
+        'mana': ('Mana', _identity),
+        'speed': ('Speed', _identity),
+        'is_new': ('latestGod', lambda value: value == 'y'),
+    }
+    _REPR_FIELDS = ('id', 'name')
+
+
+class Item(Model):
+    """
+    An item and its attributes, as returned by :meth:`smite.SmiteClient.get_items`.
+    """
+    __slots__ = ()
+    _FIELDS = {
+        'id': ('ItemId', _identity),
+        'name': ('DeviceName', _identity),
+        'tier': ('ItemTier', _identity),
+        'price': ('Price', _identity),
+        'type': ('Type', _identity),
+        'child_item_id': ('ChildItemId', _identity),
+        'root_item_id': ('RootItemId', _identity),
+        'icon_id': ('IconId', _identity),
+        'active': ('ActiveFlag', lambda value: value == 'y'),
+    }
+    _REPR_FIELDS = ('id', 'name')
+
+
+class Player(Model):
+    """
+    A player's profile, as returned by :meth:`smite.SmiteClient.get_player`.
+    """
+    __slots__ = ()
+    _FIELDS = {
+        'id': ('Id', _identity),
+        'name': ('Name', _identity),
+        'level': ('Level', _identity),
+        'mastery_level': ('MasteryLevel', _identity),
+        'wins': ('Wins', _identity),
+        'losses': ('Losses', _identity),
+        'leaves': ('Leaves', _identity),
+        'region': ('Region', _identity),
+        'clan': ('Team_Name', _identity),
+        'created': ('Created_Datetime', _parse_datetime),
+        'last_login': ('Last_Login_Datetime', _parse_datetime),
+    }
+    _REPR_FIELDS = ('id', 'name')
@@ -0,0 +1,276 @@
+"""
+    Spreading calls over several developer IDs.
+
+    Every developer ID has its own daily request and session limits. A
+    :class:`ClientPool` holds a client for each of several developer IDs and
+    sends each call through one of them, so their limits add up::
+
+        pool = ClientPool([(dev_id_1, auth_key_1), (dev_id_2, auth_key_2)])
+        gods = pool.get_gods()
+"""
+import collections
+import functools
+import inspect
+import os
+import threading
+import time
+import uuid
+import weakref
+
+from smite import Metrics, QuotaExceededError, RateLimiter, SmiteClient, SmiteError, logger
+
+
+class _Member(object):
+    __slots__ = ('dev_id', 'client', 'limiter', 'calls', 'exhausted_until')
+
+    def __init__(self, dev_id, client, limiter):
+        self.dev_id = dev_id
+        self.client = client
+        self.limiter = limiter
+        self.calls = 0
+        self.exhausted_until = 0
+
+
+class ClientPool(object):
+    """
+    A set of clients, one per developer ID, behind the methods of a single client.
+
+    The pool has the same ``get_*``, ``iter_*`` and ``search_*`` methods as
+    ``client_class``. Each call is made by one client, chosen by ``strategy``:
+
+    - ``least_used``: the client that has made the fewest calls through the pool
+    - ``remaining``: the client with the most daily requests left. Clients
+      that haven't fetched their budgets yet are chosen first, which fetches them.
+
+    Every client keeps its own sessions and has its own :class:`smite.RateLimiter`,
+    which tracks the daily budgets of its developer ID. When a developer ID
+    reaches a daily limit, either by its rate limiter's count or because the
+    API refused a request or session, it is taken out of rotation until the
+    limits reset at midnight UTC and the call is made again with another
+    one. :class:`smite.QuotaExceededError` is raised once every developer ID
+    is out of rotation.
+
+    A pool is thread-safe. When it is pickled, for example to be sent to
+    the workers of a :class:`concurrent.futures.ProcessPoolExecutor`, only its
+    configuration and the developer IDs out of rotation are kept, and each
+    process creates its own clients. Its methods can be pickled too, so
+    ``executor.map(pool.get_player, names)`` works. A process receiving the
+    same pool several times, as workers do for every task, creates its
+    clients once and reuses them. Pass a :class:`smite.FileSessionStore`
+    as ``session_store`` to share sessions between the processes.
+
+    Note
+    -----
+    Streaming ``iter_*`` calls are moved to another developer ID only if the
+    limit is hit before their first result.
+    """
+    STRATEGIES = ('least_used', 'remaining')
+
+    def __init__(self, credentials, strategy='least_used', rate=10, client_class=SmiteClient, **kwargs):
+        """
+        :param credentials: An iterable of ``(dev_id, auth_key)`` pairs
+        :param strategy: How a client is chosen for each call, ``least_used`` or ``remaining``
+        :param rate: The maximum number of requests per second made with each developer ID
+        :param client_class: The client class to create, such as :class:`smite.aio.AsyncSmiteClient`
+        :param kwargs: Further arguments passed to every client, such as ``cache`` or ``session_store``.
+            Unless ``metrics`` is given, the clients share one :class:`smite.Metrics`. They must be picklable
+            if the pool is sent to other processes.
+        """
+        if strategy not in self.STRATEGIES:
+            raise SmiteError('Unknown strategy {!r}, use one of {}'.format(strategy, ', '.join(self.STRATEGIES)))
+        if 'rate_limiter' in kwargs:
+            raise SmiteError('Every developer ID in a pool has its own rate limiter, pass rate instead')
+        self.credentials = [(str(dev_id), str(auth_key)) for dev_id, auth_key in credentials]
+        if not self.credentials:
+            raise SmiteError('A client pool needs at least one developer ID')
+        if len(set(dev_id for dev_id, _ in self.credentials)) != len(self.credentials):
+            raise SmiteError('The developer IDs of a pool must be unique')
+        self.strategy = strategy
+        self.rate = rate
+        self.client_class = client_class
+        self.metrics = kwargs.pop('metrics', None) or Metrics()
+        self._options = kwargs
+        self._members = []
+        for dev_id, auth_key in self.credentials:
+            limiter = RateLimiter(rate=rate)
+            client = client_class(dev_id, auth_key, rate_limiter=limiter, metrics=self.metrics, **kwargs)
+            self._members.append(_Member(dev_id, client, limiter))
+        self._lock = threading.Lock()
+        # Identifies the pool and its copies in other processes
+        self._token = uuid.uuid4().hex
+
+    def __reduce__(self):
+        state = {'token': self._token, 'credentials': self.credentials, 'strategy': self.strategy, 'rate': self.rate,
+                 'client_class': self.client_class, 'options': self._options,
+                 'exhausted': {member.dev_id: member.exhausted_until for member in self._members
+                               if member.exhausted_until}}
+        return _restore_pool, (state,)
+
+    def _mark_exhausted(self, exhausted):
+        with self._lock:
+            for member in self._members:
+                member.exhausted_until = max(member.exhausted_until, exhausted.get(member.dev_id, 0))
+
+    @property
+    def clients(self):
+        """
+        :return: A list of the pool's clients, in the order of the credentials
+        """
+        return [member.client for member in self._members]
+
+    def _choose(self):
+        with self._lock:
+            now = time.time()
+            available = []
+            for member in self._members:
+                if member.exhausted_until and member.exhausted_until <= now:
+                    # The daily limits have reset since the developer ID was taken out of rotation
+                    member.exhausted_until = 0
+                    member.limiter.reset()
+                if not member.exhausted_until:
+                    available.append(member)
+            if not available:
+                raise QuotaExceededError('All {} developer IDs have reached their daily limits, resets in {:.0f} '
+                                         'seconds'.format(len(self._members), RateLimiter.seconds_until_reset()))
+            if self.strategy == 'remaining':
+                member = min(available, key=self._remaining_order)
+            else:
+                member = min(available, key=lambda member: member.calls)
+            member.calls += 1
+            return member
+
+    @staticmethod
+    def _remaining_order(member):
+        remaining = member.limiter.requests_remaining
+        if remaining is None:
+            return 0, 0, member.calls
+        return 1, -remaining, member.calls
+
+    def _exhaust(self, member, error):
+        with self._lock:
+            member.exhausted_until = time.time() + RateLimiter.seconds_until_reset()
+        logger.warning('Developer ID %s taken out of rotation until the daily reset: %s', member.dev_id, error)
+
+    def _call(self, name, args, kwargs):
+        while True:
+            member = self._choose()
+            try:
+                result = getattr(member.client, name)(*args, **kwargs)
+            except QuotaExceededError as e:
+                self._exhaust(member, e)
+                continue
+            if inspect.isgenerator(result):
+                return self._iterate(member, result, name, args, kwargs)
+            if inspect.isasyncgen(result):
+                return self._aiterate(member, result, name, args, kwargs)
+            if inspect.isawaitable(result):
+                # Coroutines of an async client only raise once awaited
+                return self._await(member, result, name, args, kwargs)
+            return result
+
+    def _iterate(self, member, elements, name, args, kwargs):
+        try:
+            first = next(elements)
+        except StopIteration:
+            return
+        except QuotaExceededError as e:
+            self._exhaust(member, e)
+            yield from self._call(name, args, kwargs)
+            return
+        yield first
+        yield from elements
+
+    async def _await(self, member, result, name, args, kwargs):
+        try:
+            return await result
+        except QuotaExceededError as e:
+            self._exhaust(member, e)
+        return await self._call(name, args, kwargs)
+
+    async def _aiterate(self, member, elements, name, args, kwargs):
+        try:
+            first = await elements.__anext__()
+        except StopAsyncIteration:
+            return
+        except QuotaExceededError as e:
+            self._exhaust(member, e)
+            async for element in self._call(name, args, kwargs):
+                yield element
+            return
+        yield first
+        async for element in elements:
+            yield element
+
+    def __getattr__(self, name):
+        client_class = self.__dict__.get('client_class')
+        attribute = getattr(client_class, name, None) if client_class and not name.startswith('_') else None
+        if not callable(attribute):
+            raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+        method = _PoolMethod(self, name, attribute)
+        # Later lookups find the method without going through __getattr__
+        self.__dict__[name] = method
+        return method
+
+    def remaining(self):
+        """
+        :return: An ordered dictionary mapping each developer ID to a dictionary of its remaining daily
+            ``requests`` and ``sessions`` (None where not yet known), the number of ``calls`` made through the pool,
+            and the number of seconds it stays out of rotation for under ``exhausted_for``, 0 if it is in rotation
+        """
+        now = time.time()
+        with self._lock:
+            members = [(member, member.calls, member.exhausted_until) for member in self._members]
+        result = collections.OrderedDict()
+        for member, calls, exhausted_until in members:
+            remaining = member.limiter.remaining()
+            result[member.dev_id] = {'requests': remaining['requests'], 'sessions': remaining['sessions'],
+                                     'calls': calls, 'exhausted_for': max(exhausted_until - now, 0)}
+        return result
+
+    def close(self):
+        """
+        Closes all idle connections held by the clients' transports.
+        """
+        with _restored_pools_lock:
+            key = (os.getpid(), self._token)
+            if _restored_pools.get(key) is self:
+                del _restored_pools[key]
+        for member in self._members:
+            member.client._transport.close()
+
+
+class _PoolMethod(object):
+    """
+    A method of a :class:`ClientPool`, which pickles as the pool and the method's name.
+    """
+
+    def __init__(self, pool, name, attribute):
+        functools.update_wrapper(self, attribute)
+        self._pool = pool
+        self._name = name
+
+    def __call__(self, *args, **kwargs):
+        return self._pool._call(self._name, args, kwargs)
+
+    def __reduce__(self):
+        return getattr, (self._pool, self._name)
+
+
+# The pools unpickled by each process, so a pool sent again reuses its clients and sessions. Keyed by
+# process ID as well as token, so forked children don't use the connections of their parent's pools. A
+# pool is only held while something else refers to it, and is dropped when it is closed.
+_restored_pools = weakref.WeakValueDictionary()
+_restored_pools_lock = threading.Lock()
+
+
+def _restore_pool(state):
+    with _restored_pools_lock:
+        key = (os.getpid(), state['token'])
+        pool = _restored_pools.get(key)
+        if pool is None:
+            pool = ClientPool(state['credentials'], state['strategy'], state['rate'], state['client_class'],
+                              **state['options'])
+            pool._token = state['token']
+            _restored_pools[key] = pool
+    pool._mark_exhausted(state['exhausted'])
+    return pool
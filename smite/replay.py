@@ -0,0 +1,189 @@
+"""
+    Recording API responses and replaying them without the network.
+
+    A :class:`RecordingTransport` passes requests on to another transport
+    and keeps every successful response in a :class:`ResponseArchive`. A
+    :class:`ReplayTransport` later answers the same requests from the
+    archive, so datasets can be rebuilt at disk speed without spending any
+    of the daily quota::
+
+        archive = ResponseArchive('responses.db')
+        client = SmiteClient(dev_id, auth_key, transport=RecordingTransport(archive))
+        ...
+        client = SmiteClient(dev_id, auth_key, transport=ReplayTransport(archive))
+"""
+import json
+import time
+import urllib.parse
+import zlib
+
+from smite import HTTPTransport, SmiteError, Transport
+from smite._storage import SQLiteDatabase
+
+# Methods whose responses only matter for the session, not for their parameters
+_SESSION_METHODS = ('createsession', 'testsession', 'ping')
+
+
+class ReplayMissError(SmiteError):
+    def __init__(self, *args, **kwargs):
+        SmiteError.__init__(self, *args, **kwargs)
+
+
+def request_key(url):
+    """
+    :param url: The URL of an API request
+    :return: An ``(endpoint, method, parameters)`` tuple identifying the request. The developer ID,
+        signature, session and timestamp are left out, so the same call made at another time has the same key.
+    """
+    parts = urllib.parse.urlsplit(url)
+    segments = [urllib.parse.unquote(segment) for segment in parts.path.split('/') if segment]
+    for i, segment in enumerate(segments):
+        if segment.lower().endswith('json'):
+            method = segment[:-4].lower()
+            endpoint = '{}://{}/{}'.format(parts.scheme, parts.netloc, '/'.join(segments[:i]))
+            parameters = () if method in _SESSION_METHODS else tuple(segments[i + 5:])
+            return endpoint, method, '/'.join(parameters)
+    raise ValueError('{} is not a Smite API URL'.format(url))
+
+
+class ResponseArchive(SQLiteDatabase):
+    """
+    Keeps raw API responses in an SQLite database, indexed by endpoint, method and parameters.
+
+    Bodies are stored zlib compressed. The archive can be shared between
+    threads, and by several processes as long as only one of them records.
+    """
+
+    def __init__(self, path, compresslevel=6):
+        """
+        :param path: Path of the database file. It is created if it doesn't exist.
+        :param compresslevel: The zlib compression level used for stored responses
+        """
+        SQLiteDatabase.__init__(self, path, [
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'endpoint TEXT NOT NULL, method TEXT NOT NULL, parameters TEXT NOT NULL, '
+            'recorded REAL NOT NULL, body BLOB NOT NULL, '
+            'PRIMARY KEY (endpoint, method, parameters)) WITHOUT ROWID'])
+        self.compresslevel = compresslevel
+
+    def get(self, key):
+        """
+        :param key: A key made by :func:`request_key`
+        :return: The raw response body, or None if it isn't archived
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT body FROM responses WHERE endpoint = ? AND method = ? AND parameters = ?',
+                                     key).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    def put(self, key, body):
+        """
+        :param key: A key made by :func:`request_key`
+        :param body: The raw response body. A response already stored under the key is replaced.
+        """
+        payload = zlib.compress(body, self.compresslevel)
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                               tuple(key) + (time.time(), payload))
+
+    def keys(self, method=None):
+        """
+        :param method: Only list the responses of this lowercase API method
+        :return: A list of the keys of the archived responses
+        """
+        query = 'SELECT endpoint, method, parameters FROM responses'
+        with self._lock:
+            if method is None:
+                return self._conn.execute(query).fetchall()
+            return self._conn.execute(query + ' WHERE method = ?', (method,)).fetchall()
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM responses WHERE endpoint = ? AND method = ? AND parameters = ?',
+                                      key).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests through another transport and archives every successful response.
+    """
+
+    def __init__(self, archive, transport=None):
+        """
+        :param archive: The :class:`ResponseArchive` responses are saved to
+        :param transport: The :class:`smite.Transport` requests are sent with. Defaults to a new :class:`smite.HTTPTransport`.
+        """
+        self.archive = archive
+        self.transport = transport if transport is not None else HTTPTransport()
+
+    def get(self, url):
+        body = self.transport.get(url)
+        self.archive.put(request_key(url), body)
+        return body
+
+    def stream(self, url):
+        chunks = self.transport.stream(url)
+        return self._record(url, chunks)
+
+    def _record(self, url, chunks):
+        received = []
+        try:
+            for chunk in chunks:
+                received.append(chunk)
+                yield chunk
+        except GeneratorExit:
+            # The reader stopped before the end of the body, which the JSON decoder does once the array is closed.
+            # The rest is read so that only complete bodies are archived.
+            try:
+                received.extend(chunks)
+            except Exception:
+                return
+        self.archive.put(request_key(url), b''.join(received))
+
+    def close(self):
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Answers requests from a :class:`ResponseArchive` without using the network.
+
+    Sessions are always granted, whether or not their creation was recorded.
+    A request that was never recorded raises :class:`ReplayMissError`, or is
+    answered with no data if ``strict`` is False.
+    """
+
+    def __init__(self, archive, strict=True, chunk_size=65536):
+        """
+        :param archive: The :class:`ResponseArchive` to answer from
+        :param strict: Whether requests missing from the archive raise :class:`ReplayMissError`
+        :param chunk_size: The size of the chunks streamed responses are handed out in
+        """
+        self.archive = archive
+        self.strict = strict
+        self.chunk_size = chunk_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url):
+        key = request_key(url)
+        body = self.archive.get(key)
+        if body is not None:
+            self.hits += 1
+            return body
+        self.misses += 1
+        if key[1] == 'createsession':
+            return json.dumps({'ret_msg': 'Approved', 'session_id': 'replay', 'timestamp': None}).encode('utf-8')
+        if key[1] == 'testsession':
+            return json.dumps('This was a successful test').encode('utf-8')
+        if self.strict:
+            raise ReplayMissError('No recorded response for {} {}'.format(key[1], key[2]))
+        return b'[]'
+
+    def stream(self, url):
+        body = self.get(url)
+        return (body[i:i + self.chunk_size] for i in range(0, len(body), self.chunk_size))
@@ -0,0 +1,129 @@
+"""
+    Incremental decoding of JSON arrays.
+"""
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+_NUMBER_START = '-0123456789'
+
+
+class JSONArrayDecoder(object):
+    """
+    Decodes the elements of a top-level JSON array from bytes fed to it as they arrive.
+
+    Only the element being decoded and the undecoded rest of the data are
+    held in memory. If the document is not an array, the whole document is
+    decoded once the end of the data is fed, and returned as a single element.
+    """
+
+    def __init__(self, encoding='utf-8'):
+        """
+        :param encoding: The encoding of the document
+        """
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder(encoding)()
+        self._buf = ''
+        self._pos = 0
+        # None until the first character is seen, then True for an array and False for any other document
+        self._array = None
+
+    def feed(self, chunk, final=False):
+        """
+        :param chunk: The next bytes of the document
+        :param final: Whether this is the end of the document
+        :return: A list of the elements completed by the chunk
+        """
+        self._buf = self._buf[self._pos:] + self._text_decoder.decode(chunk, final)
+        self._pos = 0
+        return self._decode(final)
+
+    def close(self):
+        """
+        Marks the end of the document.
+
+        :return: A list of the elements completed by the end of the document
+        """
+        return self.feed(b'', True)
+
+    def _decode(self, eof):
+        elements = []
+        buf, pos = self._buf, self._pos
+        raw_decode = self._decoder.raw_decode
+        while not self.done:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buf):
+                break
+            char = buf[pos]
+            if self._array is None:
+                self._array = char == '['
+                if self._array:
+                    pos += 1
+                continue
+            if not self._array:
+                if eof:
+                    elements.append(self._decoder.decode(buf[pos:]))
+                    self.done = True
+                break
+            if char == ']':
+                self.done = True
+                break
+            if char == ',':
+                pos += 1
+                continue
+            try:
+                element, end = raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+                break
+            # A number is only complete once a delimiter follows it, it may continue in the next chunk
+            if not eof and not (end < len(buf) and (char not in _NUMBER_START or buf[end] in _DELIMITERS)):
+                break
+            pos = end
+            elements.append(element)
+        self._pos = pos
+        if eof and self._array and not self.done:
+            raise ValueError('Unterminated JSON array')
+        return elements
+
+
+def iter_json_array(chunks, encoding='utf-8'):
+    """
+    Decodes the elements of a top-level JSON array as the data arrives.
+
+    Only the element being decoded and the undecoded rest of the current
+    chunk are held in memory. If the document is not an array, the whole
+    document is decoded and yielded as a single element.
+
+    :param chunks: An iterable of bytes making up the JSON document
+    :param encoding: The encoding of the document
+    :return: A generator of the array's elements
+    """
+    decoder = JSONArrayDecoder(encoding)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+        if decoder.done:
+            return
+    yield from decoder.close()
+
+
+async def aiter_json_array(chunks, encoding='utf-8'):
+    """
+    The same as :func:`iter_json_array`, for an asynchronous iterable of bytes.
+
+    :param chunks: An asynchronous iterable of bytes making up the JSON document
+    :param encoding: The encoding of the document
+    :return: An asynchronous generator of the array's elements
+    """
+    decoder = JSONArrayDecoder(encoding)
+    async for chunk in chunks:
+        for element in decoder.feed(chunk):
+            yield element
+        if decoder.done:
+            return
+    for element in decoder.close():
+        yield element
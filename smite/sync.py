@@ -0,0 +1,166 @@
+"""
+    Incremental syncing of the match histories of tracked players.
+"""
+import collections
+import concurrent.futures
+import time
+
+from smite import NoResultError, logger
+from smite._storage import SQLiteDatabase
+
+SyncRecord = collections.namedtuple('SyncRecord', ['match_id', 'players', 'rows'])
+
+
+class WatermarkStore(SQLiteDatabase):
+    """
+    Keeps the sync progress of tracked players in an SQLite database.
+
+    For each player the highest match ID already synced is kept as its
+    watermark. The IDs of every match fetched are kept too, so a match
+    played by several tracked players is only fetched once.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the database file. It is created if it doesn't exist.
+        """
+        SQLiteDatabase.__init__(self, path, [
+            'CREATE TABLE IF NOT EXISTS watermarks ('
+            'endpoint TEXT NOT NULL, player TEXT NOT NULL, match_id INTEGER NOT NULL, '
+            'synced REAL NOT NULL, PRIMARY KEY (endpoint, player)) WITHOUT ROWID',
+            'CREATE TABLE IF NOT EXISTS matches ('
+            'endpoint TEXT NOT NULL, match_id INTEGER NOT NULL, '
+            'PRIMARY KEY (endpoint, match_id)) WITHOUT ROWID'])
+
+    def watermarks(self, endpoint, players):
+        """
+        :param endpoint: The endpoint URL the players play on
+        :param players: An iterable of player names or IDs
+        :return: A dictionary mapping each player that has been synced to its watermark
+        """
+        with self._lock:
+            return dict(self._select_many('SELECT player, match_id FROM watermarks WHERE endpoint = ? AND player IN ({})',
+                                          [endpoint], [str(player) for player in players]))
+
+    def seen(self, endpoint, match_ids):
+        """
+        :param endpoint: The endpoint URL the matches were played on
+        :param match_ids: An iterable of match IDs
+        :return: The set of those match IDs that have already been fetched
+        """
+        with self._lock:
+            return {row[0] for row in self._select_many(
+                'SELECT match_id FROM matches WHERE endpoint = ? AND match_id IN ({})',
+                [endpoint], [int(match_id) for match_id in match_ids])}
+
+    def commit(self, endpoint, watermarks, match_ids):
+        """
+        Records the progress of a sync in a single transaction.
+
+        :param endpoint: The endpoint URL the players play on
+        :param watermarks: A dictionary mapping players to their new watermarks
+        :param match_ids: The IDs of the matches that were fetched
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany('INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?)',
+                                   [(endpoint, str(player), int(match_id), now)
+                                    for player, match_id in watermarks.items()])
+            self._conn.executemany('INSERT OR IGNORE INTO matches VALUES (?, ?)',
+                                   [(endpoint, int(match_id)) for match_id in match_ids])
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM watermarks').fetchone()[0]
+
+
+class HistorySync(object):
+    """
+    Fetches the details of the matches tracked players have played since the last sync.
+
+    Players are synced in batches. The match histories of a batch are
+    fetched in parallel, and the matches newer than each player's watermark
+    that haven't been fetched for another player are collected. Their
+    details are then fetched with :meth:`smite.SmiteClient.get_match_details_batch`,
+    once per match however many tracked players played it.
+
+    A batch's progress is committed to the :class:`WatermarkStore` once
+    all its records have been consumed. A sync stopped part way through a
+    batch fetches that batch's matches again on the next run.
+    """
+
+    def __init__(self, client, store, batch_size=200, workers=4):
+        """
+        :param client: The :class:`smite.SmiteClient` to sync with
+        :param store: The :class:`WatermarkStore` progress is kept in
+        :param batch_size: The number of players synced per batch
+        :param workers: The number of threads fetching match histories and details
+        """
+        self.client = client
+        self.store = store
+        self.batch_size = batch_size
+        self.workers = workers
+        self.stats = collections.Counter()
+
+    def _history(self, player, endpoint):
+        try:
+            rows = self.client.get_match_history(player, endpoint=endpoint)
+        except NoResultError:
+            logger.debug('No match history for %s', player)
+            return []
+        # Private profiles return a single row with only an error message
+        return [int(row['Match']) for row in rows if row.get('Match')]
+
+    def sync(self, players, endpoint=None):
+        """
+        :param players: An iterable of player names or IDs
+        :param endpoint: The :class:`smite.Endpoint` the players play on, defaults to the client's endpoint
+        :return: A generator of :class:`SyncRecord` tuples, one per match fetched, naming the tracked players
+            that played it. Matches the API has no details for yet are left for the next sync.
+        """
+        players = list(collections.OrderedDict.fromkeys(str(player) for player in players))
+        base_url = self.client._base_url(endpoint)
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as executor:
+            for i in range(0, len(players), self.batch_size):
+                for record in self._sync_batch(players[i:i + self.batch_size], endpoint, base_url, executor):
+                    yield record
+
+    def _sync_batch(self, players, endpoint, base_url, executor):
+        watermarks = self.store.watermarks(base_url, players)
+        histories = executor.map(lambda player: self._history(player, endpoint), players)
+        new = collections.OrderedDict()
+        latest = {}
+        for player, match_ids in zip(players, histories):
+            self.stats['players'] += 1
+            watermark = watermarks.get(player, 0)
+            if match_ids:
+                latest[player] = max(max(match_ids), watermark)
+            for match_id in match_ids:
+                if match_id > watermark:
+                    new.setdefault(match_id, []).append(player)
+
+        seen = self.store.seen(base_url, new)
+        wanted = [match_id for match_id in new if match_id not in seen]
+        self.stats['new'] += len(new)
+        self.stats['already_fetched'] += len(seen)
+        logger.debug('Syncing %d players: %d new matches, %d to fetch', len(players), len(new), len(wanted))
+
+        chunk_size = self.client._MATCH_BATCH_SIZE
+        chunks = [wanted[i:i + chunk_size] for i in range(0, len(wanted), chunk_size)]
+        fetched = []
+        missing = set()
+        for details in executor.map(lambda chunk: self.client.get_match_details_batch(chunk, 1, endpoint), chunks):
+            for match_id, rows in details.items():
+                if not rows:
+                    missing.add(match_id)
+                    continue
+                fetched.append(match_id)
+                self.stats['fetched'] += 1
+                yield SyncRecord(match_id, new[match_id], rows)
+
+        # A player's watermark stops short of any of its matches that couldn't be fetched yet
+        for match_id in missing:
+            for player in new[match_id]:
+                latest[player] = max(min(latest[player], match_id - 1), watermarks.get(player, 0))
+        self.stats['missing'] += len(missing)
+        self.store.commit(base_url, latest, fetched)
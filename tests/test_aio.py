@@ -0,0 +1,59 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from smite import FileSessionStore
+from smite.aio import AsyncSmiteClient
+from smite.mockserver import MockSmiteServer
+
+
+def _store_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('smite-session-store')]
+
+
+class AsyncClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockSmiteServer(latency=0.05, daily_limit=10 ** 7, session_cap=10 ** 6)
+        self.server.start()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'sessions.json')
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def test_one_session_for_a_shared_file_store(self):
+        clients = [self.server.client(AsyncSmiteClient, session_store=FileSessionStore(self.path)) for _ in range(4)]
+
+        async def call():
+            try:
+                return await asyncio.gather(*[client.get_player('player') for client in clients for _ in range(2)])
+            finally:
+                for client in clients:
+                    client.close()
+
+        self.assertEqual(len(asyncio.run(call())), 8)
+        self.assertEqual(self.server.counts['createsession'], 1)
+
+    def test_close_stops_the_store_thread(self):
+        threads = _store_threads()
+        client = self.server.client(AsyncSmiteClient, session_store=FileSessionStore(self.path))
+
+        async def call():
+            await client.get_player('player')
+            self.assertEqual(len(_store_threads()), len(threads) + 1)
+            client.close()
+
+        asyncio.run(call())
+        for thread in _store_threads():
+            if thread not in threads:
+                thread.join(1)
+        self.assertEqual(len(_store_threads()), len(threads))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import time
+import unittest
+
+from smite import ResponseCache
+from smite.mockserver import MockSmiteServer
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def test_entry_expires_after_its_ttl(self):
+        cache = ResponseCache(ttls={'getplayer': 0.05})
+        cache.set('getplayer', 'key', [{'Name': 'player'}])
+        self.assertEqual(cache.get('key'), [{'Name': 'player'}])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.stats(), {'size': 0, 'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_methods_without_a_policy_are_not_cached(self):
+        cache = ResponseCache(ttls={'getgods': 0})
+        self.assertFalse(cache.is_cached('getplayer'))
+        self.assertFalse(cache.is_cached('getgods'))
+        cache.set('getplayer', 'player', [{'Name': 'player'}])
+        cache.set('getgods', 'gods', [{'Name': 'god'}])
+        self.assertIsNone(cache.get('player'))
+        self.assertIsNone(cache.get('gods'))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(maxsize=2)
+        cache.set('getgods', 'first', [{}])
+        cache.set('getgods', 'second', [{}])
+        cache.get('first')
+        cache.set('getgods', 'third', [{}])
+        self.assertIsNone(cache.get('second'))
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNotNone(cache.get('third'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_only_complete_responses_are_cached_forever(self):
+        cache = ResponseCache()
+        cache.set('getmatchdetails', 'processing', [{'ret_msg': 'Match details are not available yet'}])
+        cache.set('getmatchdetails', 'empty', [])
+        cache.set('getmatchdetails', 'finished', [{'Match': 1, 'ret_msg': None}])
+        self.assertIsNone(cache.get('processing'))
+        self.assertIsNone(cache.get('empty'))
+        self.assertEqual(cache.get('finished'), [{'Match': 1, 'ret_msg': None}])
+
+    def test_client_serves_repeated_calls_from_the_cache(self):
+        with MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6) as server:
+            client = server.client(cache=ResponseCache())
+            gods = client.get_gods()
+            self.assertEqual(client.get_gods(), gods)
+            self.assertEqual(server.counts['getgods'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from smite.catalog import Catalog
+from smite.mockserver import MockSmiteServer
+from smite.models import God
+
+
+class CatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockSmiteServer(gods=5, items=10, daily_limit=10 ** 7, session_cap=10 ** 6)
+        self.server.start()
+        self.client = self.server.client()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def test_lookups(self):
+        catalog = Catalog(endpoint=self.server.url)
+        self.assertTrue(catalog.update(self.client))
+        self.assertEqual(catalog.version(), '7.1')
+        self.assertEqual(catalog.god(3)['Name'], 'God 3')
+        self.assertIs(catalog.god(' god 3 '), catalog.god(3))
+        self.assertIs(catalog.god('3'), catalog.god(3))
+        self.assertIsNone(catalog.god('Nobody'))
+        self.assertEqual(catalog.item('ITEM 7')['ItemId'], 7)
+        self.assertEqual(len(catalog.gods()), 5)
+        self.assertEqual(len(catalog.items()), 10)
+        self.assertEqual([skin['skin_id1'] for skin in catalog.skins('God 2')], [200, 201, 202])
+        with self.assertRaises(KeyError):
+            catalog.god(1, lang=2)
+
+    def test_update_is_skipped_for_the_same_patch(self):
+        catalog = Catalog(endpoint=self.server.url)
+        catalog.update(self.client, skins=False)
+        self.server.counts.clear()
+        self.assertFalse(catalog.update(self.client, skins=False))
+        self.assertEqual(dict(self.server.counts), {'getpatchinfo': 1})
+
+    def test_save_and_load(self):
+        path = os.path.join(self.directory, 'catalog.json')
+        catalog = Catalog(endpoint=self.server.url)
+        catalog.update(self.client)
+        catalog.save(path)
+        loaded = Catalog.load(path, endpoint=self.server.url, models=True)
+        self.assertEqual(loaded.version(), '7.1')
+        self.assertIsInstance(loaded.god('God 1'), God)
+        self.assertEqual(loaded.god('God 1').to_dict(), catalog.god(1))
+        self.assertEqual(loaded.skins(1), catalog.skins(1))
+
+    def test_load_rejects_other_files(self):
+        path = os.path.join(self.directory, 'other.json')
+        with open(path, 'w') as f:
+            f.write('{"format": 0}')
+        with self.assertRaises(ValueError):
+            Catalog.load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
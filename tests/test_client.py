@@ -0,0 +1,84 @@
+import logging
+import threading
+import unittest
+
+from smite import NoResultError, RetryPolicy, SmiteError, logger
+from smite.mockserver import MockSmiteServer
+
+
+class ClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6)
+        self.server.start()
+        self.client = self.server.client()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_one_request_per_call(self):
+        self.client.get_player('warmup')
+        self.server.counts.clear()
+        for i in range(10):
+            self.assertEqual(self.client.get_player('player{}'.format(i))[0]['Name'], 'player{}'.format(i))
+        self.assertEqual(dict(self.server.counts), {'getplayer': 10})
+
+    def test_retry_after_rejected_session(self):
+        self.client.get_player('before')
+        self.server.reset()
+        self.assertEqual(self.client.get_player('after')[0]['Name'], 'after')
+        self.assertEqual(self.server.counts['createsession'], 1)
+        self.assertEqual(self.server.counts['getplayer'], 2)
+        methods = {row['method']: row for row in self.client.metrics.snapshot()['methods']}
+        self.assertEqual(methods['getplayer']['session_rejections'], 1)
+
+    def test_concurrent_identical_requests_are_coalesced(self):
+        self.client.get_player('warmup')
+        self.server.counts.clear()
+        self.server.latency = 0.2
+        barrier = threading.Barrier(8)
+        results = []
+
+        def call():
+            barrier.wait()
+            results.append(self.client.get_player('same'))
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(self.server.counts['getplayer'], 1)
+
+    def test_retries_are_counted_once_per_attempt(self):
+        client = self.server.client(retry_policy=RetryPolicy(retries=2, backoff=0))
+        client.get_player('warmup')
+        self.server.counts.clear()
+        self.server.error_rate = 1.0
+        with self.assertRaises(SmiteError):
+            client.get_player('player')
+        methods = {row['method']: row for row in client.metrics.snapshot()['methods']}
+        self.assertEqual(self.server.counts['getplayer'], 3)
+        self.assertEqual(methods['getplayer']['calls'], 1 + 3)
+        self.assertEqual(methods['getplayer']['errors'], 3)
+
+    def test_errors_are_logged_where_they_are_handled(self):
+        with self.assertLogs(logger, logging.DEBUG) as logs:
+            NoResultError('nothing found')
+            SmiteError('failed')
+            logger.debug('marker')
+        self.assertEqual(logs.output, ['DEBUG:smitepython:marker'])
+        client = self.server.client(retry_policy=RetryPolicy(retries=1, backoff=0))
+        client.get_player('warmup')
+        self.server.error_rate = 1.0
+        with self.assertLogs(logger, logging.WARNING) as logs:
+            with self.assertRaises(SmiteError):
+                client.get_player('player')
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn('failed after 2 attempt(s)', logs.records[-1].getMessage())
+
+
+if __name__ == '__main__':
+    unittest.main()
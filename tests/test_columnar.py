@@ -0,0 +1,68 @@
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from smite.columnar import INT_NULL, ColumnarTable, to_columns
+from smite.models import Match
+
+_ROWS = [
+    {'Match': 1, 'Kills_Player': 3, 'Reference_Name': 'Ymir', 'Damage_Mitigated': 1.5, 'Mixed': None},
+    {'Match': 1, 'Kills_Player': None, 'Reference_Name': 'Thor', 'Damage_Mitigated': 2, 'Mixed': 7},
+    {'Match': 2, 'Kills_Player': 10, 'Reference_Name': 'Ymir', 'Damage_Mitigated': None, 'Mixed': 'text'},
+]
+
+
+class ColumnarTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def check_table(self, table):
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.column('Match').format, 'q')
+        self.assertEqual(list(table.column('Kills_Player')), [3, INT_NULL, 10])
+        self.assertEqual(list(table.column('Reference_Name')), [0, 1, 0])
+        self.assertEqual(table.decode('Reference_Name'), ['Ymir', 'Thor', 'Ymir'])
+        mitigated = list(table.column('Damage_Mitigated'))
+        self.assertEqual(mitigated[:2], [1.5, 2.0])
+        self.assertTrue(math.isnan(mitigated[2]))
+        # A column changes to strings once a string is seen, keeping the earlier values
+        self.assertEqual(table.decode('Mixed'), [None, '7', 'text'])
+
+    def test_build(self):
+        self.check_table(to_columns([_ROWS]))
+
+    def test_forms_of_match_details(self):
+        by_id = {1: _ROWS[:2], 2: _ROWS[2:]}
+        for details in (by_id, list(by_id.items()), [Match(match_id, rows) for match_id, rows in by_id.items()]):
+            self.check_table(to_columns(details))
+
+    def test_selected_columns(self):
+        table = to_columns([_ROWS], columns=['Match', 'Missing'])
+        self.assertEqual(table.names, ['Match', 'Missing'])
+        self.assertEqual(list(table.column('Missing')), [INT_NULL] * 3)
+
+    def test_write_and_open(self):
+        path = os.path.join(self.directory, 'matches.col')
+        to_columns([_ROWS]).write(path)
+        table = ColumnarTable.open(path)
+        try:
+            self.check_table(table)
+        finally:
+            table.close()
+
+    def test_open_rejects_other_files(self):
+        path = os.path.join(self.directory, 'other.col')
+        with open(path, 'wb') as f:
+            f.write(b'not a columnar file')
+        with self.assertRaises(ValueError):
+            ColumnarTable.open(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
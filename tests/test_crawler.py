@@ -0,0 +1,143 @@
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from smite import RetryPolicy
+from smite.crawler import CrawlCheckpoint, FriendGraphCrawler, QueueCrawler
+from smite.mockserver import MockSmiteServer
+
+
+class CrawlCheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'checkpoint.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_progress_is_saved(self):
+        checkpoint = CrawlCheckpoint(self.path)
+        self.assertEqual(checkpoint.start('426/20170101/0', ['1', '2', '3']), ['1', '2', '3'])
+        checkpoint.finish('426/20170101/0', '1')
+        self.assertEqual(checkpoint.start('426/20170101/1', ['4', '5'], complete=False), ['4', '5'])
+        checkpoint.finish('426/20170101/1', '4')
+        checkpoint.finish('426/20170101/1', '5')
+        checkpoint.save()
+        checkpoint = CrawlCheckpoint(self.path)
+        self.assertEqual(checkpoint.listed_ids('426/20170101/0'), ['2', '3'])
+        # A partial hour is listed again, without the matches already handed out
+        self.assertIsNone(checkpoint.listed_ids('426/20170101/1'))
+        self.assertEqual(checkpoint.start('426/20170101/1', ['4', '5', '6']), ['6'])
+        checkpoint.finish('426/20170101/1', '6')
+        self.assertEqual(checkpoint.done, {'426/20170101/1'})
+
+
+class QueueCrawlerTest(unittest.TestCase):
+    DATE = datetime.date(2017, 1, 1)
+
+    def setUp(self):
+        self.server = MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6, matches_per_hour=10)
+        self.server.start()
+        self.directory = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.directory, 'checkpoint.json')
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def crawl(self, **kwargs):
+        crawler = QueueCrawler(self.server.client(), [426], self.DATE, checkpoint=self.checkpoint, hours=[0, 1],
+                               **kwargs)
+        return [record.match_id for record in crawler]
+
+    def test_resume(self):
+        crawl = QueueCrawler(self.server.client(), [426], self.DATE, checkpoint=self.checkpoint, hours=[0, 1],
+                             checkpoint_every=1).crawl()
+        first = [next(crawl).match_id for _ in range(5)]
+        crawl.close()
+        rest = self.crawl()
+        # The last match handed out is not done until the next one is asked for
+        self.assertEqual(len(rest), 16)
+        self.assertEqual(len(set(first + rest)), 20)
+        self.server.counts.clear()
+        self.assertEqual(self.crawl(), [])
+        self.assertEqual(self.server.counts['getmatchdetailsbatch'], 0)
+
+    def test_active_matches_are_crawled_again(self):
+        list_matches = self.server._getmatchidsbyqueue
+        active = [True]
+
+        def with_active_matches(*args):
+            rows = list_matches(*args)
+            for row in rows[-3:]:
+                row['Active_Flag'] = 'y' if active[0] else 'n'
+            return rows
+
+        self.server._getmatchidsbyqueue = with_active_matches
+        first = self.crawl()
+        self.assertEqual(len(first), 14)
+        self.assertEqual(self.crawl(), [])
+        active[0] = False
+        last = self.crawl()
+        self.assertEqual(len(last), 6)
+        self.assertFalse(set(first) & set(last))
+        self.assertEqual(self.crawl(), [])
+
+
+class FriendGraphCrawlerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_crawl(self):
+        crawler = FriendGraphCrawler(self.server.client(), [12345], max_depth=1, workers=4)
+        edges = list(crawler.crawl())
+        self.assertTrue(edges)
+        self.assertTrue(all(edge.player_id == 12345 and edge.depth == 0 for edge in edges))
+        self.assertEqual(len(crawler.visited), 1 + len({edge.friend_id for edge in edges}))
+        # Friends at the maximum depth are found but not crawled
+        self.assertEqual(self.server.counts['getfriends'], 1)
+
+    def test_seed_names_with_models(self):
+        crawler = FriendGraphCrawler(self.server.client(models=True), ['somebody'], max_depth=1)
+        edges = list(crawler.crawl())
+        seed_id = self.server.client().get_player('somebody')[0]['Id']
+        self.assertTrue(edges)
+        self.assertTrue(all(edge.player_id == seed_id for edge in edges))
+
+    def test_failed_player_does_not_stop_the_crawl(self):
+        handle = self.server.handle
+
+        def fail_one_player(path):
+            if 'getfriendsjson' in path.lower() and path.endswith('/12345'):
+                return 503, None
+            return handle(path)
+        self.server.handle = fail_one_player
+        crawler = FriendGraphCrawler(self.server.client(retry_policy=RetryPolicy(retries=0)), [12345, 54321],
+                                     max_depth=1)
+        edges = list(crawler.crawl())
+        self.assertTrue(edges)
+        self.assertTrue(all(edge.player_id == 54321 for edge in edges))
+        self.assertEqual((crawler.stats['failed'], crawler.stats['expanded']), (1, 1))
+
+    def test_close_cancels_queued_requests(self):
+        self.server.latency = 0.1
+        crawl = FriendGraphCrawler(self.server.client(), [12345], max_depth=3, workers=2).crawl()
+        for _ in range(60):
+            next(crawl)
+        crawl.close()
+        sent = self.server.requests()
+        time.sleep(0.3)
+        self.assertEqual(self.server.requests(), sent)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from smite.aio import AsyncSmiteClient
+from smite.live import IN_GAME, OFFLINE, LiveTracker
+from smite.mockserver import MockSmiteServer
+
+
+class LiveTrackerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6)
+        self.server.start()
+        self.statuses = {}
+        self.server._getplayerstatus = lambda player: [self.statuses.get(player, {'status': OFFLINE, 'Match': 0})]
+        self.server._getmatchplayerdetails = lambda match_id: [{'Match': int(match_id), 'ret_msg': None}]
+
+    def tearDown(self):
+        self.server.stop()
+
+    def tracker(self, client=None, players=(), **kwargs):
+        tracker = LiveTracker(client or self.server.client(), players, requests_per_minute=6000, **kwargs)
+        tracker._SLEEP_STEP = 0.02
+        return tracker
+
+    def test_match_details_are_fetched_once_per_match(self):
+        self.statuses = {'first': {'status': IN_GAME, 'Match': 123}, 'second': {'status': IN_GAME, 'Match': 123}}
+        tracker = self.tracker(players=['first', 'second'], min_interval=0)
+        events = tracker.poll() + tracker.poll()
+        started = [event for event in events if event.kind == 'match_started']
+        self.assertEqual([event.player for event in started], ['first', 'second'])
+        self.assertEqual(started[0].details, [{'Match': 123, 'ret_msg': None}])
+        self.assertEqual(self.server.counts['getmatchplayerdetails'], 1)
+        self.statuses['first'] = {'status': OFFLINE, 'Match': 0}
+        self.assertEqual([event.kind for event in tracker.poll()], ['match_ended', 'status'])
+
+    def test_player_added_while_waiting_is_polled(self):
+        tracker = self.tracker()
+        tracker.add('idle', delay=3600)
+        threading.Timer(0.1, tracker.add, ('new',)).start()
+        started = time.monotonic()
+        events = tracker.poll()
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual([event.player for event in events], ['new'])
+        # The waiting player is still scheduled
+        self.assertIn('idle', [player for due, player in tracker._schedule])
+
+    def test_player_removed_while_waiting_is_not_polled(self):
+        tracker = self.tracker()
+        tracker.add('removed', delay=0.2)
+        tracker.add('kept', delay=0.4)
+        threading.Timer(0.1, tracker.remove, ('removed',)).start()
+        self.assertEqual([event.player for event in tracker.poll()], ['kept'])
+        self.assertEqual(self.server.counts['getplayerstatus'], 1)
+
+    def test_stop_interrupts_a_waiting_poll(self):
+        tracker = self.tracker()
+        tracker.add('idle', delay=3600)
+        threading.Timer(0.1, tracker.stop).start()
+        started = time.monotonic()
+        tracker.run()
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(self.server.counts['getplayerstatus'], 0)
+
+    def test_async_player_added_while_waiting_is_polled(self):
+        async def poll():
+            client = self.server.client(AsyncSmiteClient)
+            tracker = self.tracker(client)
+            tracker.add('idle', delay=3600)
+            asyncio.get_event_loop().call_later(0.1, tracker.add, 'new')
+            events = await tracker.apoll()
+            client.close()
+            return tracker, events
+
+        tracker, events = asyncio.run(poll())
+        self.assertEqual([event.player for event in events], ['new'])
+        self.assertIn('idle', [player for due, player in tracker._schedule])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from smite.matchcache import SQLiteMatchCache
+from smite.mockserver import MockSmiteServer
+
+
+class SQLiteMatchCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'matches.db')
+        self.cache = SQLiteMatchCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_put_and_get(self):
+        rows = [{'Match': 1, 'Kills_Player': 3, 'ret_msg': None}]
+        self.assertIsNone(self.cache.get('endpoint', 1))
+        self.cache.put('endpoint', 1, rows)
+        self.assertEqual(self.cache.get('endpoint', '1'), rows)
+        self.assertIn(('endpoint', 1), self.cache)
+        self.assertNotIn(('other', 1), self.cache)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_get_many_over_the_parameter_limit(self):
+        self.cache.put_many('endpoint', [(match_id, [{'Match': match_id}]) for match_id in range(2000)])
+        found = self.cache.get_many('endpoint', range(-5, 2005))
+        self.assertEqual(len(found), 2000)
+        self.assertEqual(found['1999'], [{'Match': 1999}])
+
+    def test_matches_survive_reopening(self):
+        self.cache.put('endpoint', 1, [{'Match': 1}])
+        self.cache.close()
+        self.cache = SQLiteMatchCache(self.path)
+        self.assertEqual(self.cache.get('endpoint', 1), [{'Match': 1}])
+
+    def test_client_serves_stored_matches(self):
+        with MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6) as server:
+            client = server.client(match_cache=self.cache)
+            first = client.get_match_details(123456)
+            self.assertEqual(client.get_match_details(123456), first)
+            batch = client.get_match_details_batch([123456, 123457])
+            self.assertEqual(server.counts['getmatchdetails'], 1)
+            self.assertEqual(server.counts['getmatchdetailsbatch'], 1)
+            self.assertEqual(len(self.cache), 2)
+            self.assertEqual(client.get_match_details_batch([123456, 123457]), batch)
+            self.assertEqual(server.counts['getmatchdetailsbatch'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import datetime
+import pickle
+import unittest
+
+from smite.mockserver import MockSmiteServer
+from smite.models import God, Match, MatchPlayer, Player
+
+_PLAYER_ROW = {'Id': 12345, 'Name': 'Player', 'Level': 80, 'Team_Name': '', 'Created_Datetime': '1/2/2015 1:30:00 PM',
+               'Last_Login_Datetime': '', 'Huge': 2 ** 70, 'ret_msg': None}
+
+
+class ModelTest(unittest.TestCase):
+
+    def test_fields(self):
+        player = Player(_PLAYER_ROW)
+        self.assertEqual(player.id, 12345)
+        self.assertEqual(player.name, 'Player')
+        self.assertEqual(player.clan, '')
+        self.assertEqual(player.created, datetime.datetime(2015, 1, 2, 13, 30))
+        self.assertIsNone(player.last_login)
+        # Keys of the row are attributes too
+        self.assertEqual(player.Level, 80)
+        self.assertEqual(player['Huge'], 2 ** 70)
+        self.assertIsNone(player.get('Missing'))
+        with self.assertRaises(AttributeError):
+            player.Missing
+        with self.assertRaises(KeyError):
+            player['Missing']
+
+    def test_row_is_kept_unchanged(self):
+        player = Player(_PLAYER_ROW)
+        self.assertEqual(player.to_dict(), _PLAYER_ROW)
+        self.assertEqual(list(player.keys()), list(_PLAYER_ROW))
+        self.assertEqual(pickle.loads(pickle.dumps(player)), player)
+        self.assertNotEqual(player, God(_PLAYER_ROW))
+
+    def test_models_have_no_instance_dict(self):
+        player = Player(_PLAYER_ROW)
+        self.assertFalse(hasattr(player, '__dict__'))
+        with self.assertRaises(AttributeError):
+            player.extra = 1
+
+    def test_rows_with_the_same_keys_share_a_schema(self):
+        first = Player(_PLAYER_ROW)
+        second = Player(dict(_PLAYER_ROW, Id=1))
+        self.assertIs(first._schema, second._schema)
+
+    def test_match(self):
+        rows = [{'Match': 1, 'playerName': 'winner', 'Win_Status': 'Winner', 'Minutes': 30, 'ItemId1': 7,
+                 'ItemId2': 0},
+                {'Match': 1, 'playerName': 'loser', 'Win_Status': 'Loser', 'Minutes': 30, 'ItemId1': 0,
+                 'ItemId2': 8}]
+        match = Match(1, rows)
+        self.assertEqual(len(match), 2)
+        self.assertEqual(match.minutes, 30)
+        self.assertEqual([player.player_name for player in match.winners], ['winner'])
+        self.assertEqual([player.player_name for player in match.losers], ['loser'])
+        self.assertEqual(match.players[0].item_ids, [7])
+        self.assertEqual(match.to_list(), rows)
+        self.assertEqual(Match(1, [MatchPlayer(row) for row in rows]), match)
+        self.assertFalse(Match(2, []))
+
+    def test_client_returns_models(self):
+        with MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6) as server:
+            client = server.client(models=True)
+            player = client.get_player('player')[0]
+            self.assertIsInstance(player, Player)
+            self.assertEqual(player.name, 'player')
+            gods = client.get_gods()
+            self.assertTrue(all(isinstance(god, God) for god in gods))
+            self.assertEqual([god.to_dict() for god in gods], server.client().get_gods())
+
+
+if __name__ == '__main__':
+    unittest.main()
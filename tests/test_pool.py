@@ -0,0 +1,89 @@
+import asyncio
+import gc
+import os
+import pickle
+import unittest
+
+from smite import SmiteClient
+from smite.aio import AsyncSmiteClient
+from smite.mockserver import MockSmiteServer
+from smite import pool as pool_module
+from smite.pool import ClientPool
+
+_URLS = {}
+
+
+class _Client(SmiteClient):
+
+    def __init__(self, dev_id, *args, **kwargs):
+        SmiteClient.__init__(self, dev_id, *args, **kwargs)
+        self._BASE_URL = _URLS[self.dev_id]
+
+
+class _AsyncClient(AsyncSmiteClient):
+
+    def __init__(self, dev_id, *args, **kwargs):
+        AsyncSmiteClient.__init__(self, dev_id, *args, **kwargs)
+        self._BASE_URL = _URLS[self.dev_id]
+
+
+class ClientPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        # The first developer ID runs out after creating a session, checking its quota and one call
+        self.first = MockSmiteServer(dev_id=1, auth_key='a', daily_limit=3, session_cap=10 ** 6)
+        self.second = MockSmiteServer(dev_id=2, auth_key='b', daily_limit=10 ** 7, session_cap=10 ** 6)
+        for server in (self.first, self.second):
+            server.start()
+            _URLS[server.dev_id] = server.url
+        self.credentials = [(1, 'a'), (2, 'b')]
+
+    def tearDown(self):
+        for server in (self.first, self.second):
+            server.stop()
+
+    def assert_rotated(self, pool):
+        self.assertEqual(self.first.requests(), 3)
+        self.assertEqual(self.first.counts['getplayer'], 1)
+        self.assertEqual(self.second.counts['getplayer'], 5)
+        self.assertGreater(pool.remaining()['1']['exhausted_for'], 0)
+        self.assertEqual(pool.remaining()['2']['exhausted_for'], 0)
+
+    def test_rotation(self):
+        pool = ClientPool(self.credentials, client_class=_Client)
+        for i in range(6):
+            self.assertEqual(pool.get_player('player{}'.format(i))[0]['Name'], 'player{}'.format(i))
+        self.assert_rotated(pool)
+
+    def test_async_rotation(self):
+        pool = ClientPool(self.credentials, client_class=_AsyncClient)
+
+        async def crawl():
+            return [await pool.get_player('player{}'.format(i)) for i in range(6)]
+
+        self.assertEqual(len(asyncio.run(crawl())), 6)
+        self.assert_rotated(pool)
+
+    def test_pickled_method(self):
+        pool = ClientPool(self.credentials, client_class=_Client)
+        get_player = pickle.loads(pickle.dumps(pool.get_player))
+        self.assertEqual(get_player('player')[0]['Name'], 'player')
+        self.assertEqual(get_player.__name__, 'get_player')
+
+    def test_restored_pools_released(self):
+        pool = ClientPool(self.credentials, client_class=_Client)
+        data = pickle.dumps(pool)
+        restored = pickle.loads(data)
+        self.assertIs(pickle.loads(data), restored)
+        key = (os.getpid(), restored._token)
+        self.assertIn(key, pool_module._restored_pools)
+        restored.close()
+        self.assertNotIn(key, pool_module._restored_pools)
+        restored = pickle.loads(data)
+        del restored
+        gc.collect()
+        self.assertNotIn(key, pool_module._restored_pools)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from smite import QuotaExceededError, RateLimiter
+from smite.mockserver import MockSmiteServer
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_used_up_quota_raises(self):
+        limiter = RateLimiter(rate=1000)
+        limiter.finish_refresh([{'Request_Limit_Daily': 5, 'Total_Requests_Today': 3,
+                                 'Session_Cap': 10, 'Total_Sessions_Today': 10}])
+        limiter.reserve()
+        with self.assertRaises(QuotaExceededError):
+            limiter.reserve(session=True)
+        limiter.reserve()
+        with self.assertRaises(QuotaExceededError):
+            limiter.reserve()
+        self.assertEqual(limiter.remaining()['requests'], 0)
+
+    def test_unknown_limits_are_not_enforced(self):
+        for data_used in ([{'Request_Limit_Daily': 0, 'Session_Cap': 0}], [{}], None):
+            limiter = RateLimiter(rate=1000)
+            limiter.finish_refresh(data_used)
+            for _ in range(3):
+                limiter.reserve(session=True)
+            self.assertIsNone(limiter.remaining()['requests'])
+            self.assertIsNone(limiter.remaining()['sessions'])
+
+    def test_requests_are_spread_out(self):
+        limiter = RateLimiter(rate=10, burst=2)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertAlmostEqual(limiter.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(limiter.reserve(), 0.2, places=2)
+
+    def test_rate_is_lowered_near_the_end_of_the_budget(self):
+        limiter = RateLimiter(rate=10, burst=1)
+        limiter.finish_refresh({'Request_Limit_Daily': 1000, 'Total_Requests_Today': 990})
+        limiter.reserve()
+        self.assertGreater(limiter.reserve(), 1.0)
+
+    def test_refresh_is_handed_to_one_caller(self):
+        limiter = RateLimiter(refresh_interval=600)
+        self.assertTrue(limiter.begin_refresh())
+        self.assertFalse(limiter.begin_refresh())
+        limiter.finish_refresh(None)
+        self.assertFalse(limiter.begin_refresh())
+        limiter.reset()
+        self.assertTrue(limiter.begin_refresh())
+
+    def test_client_stops_before_the_server_refuses(self):
+        with MockSmiteServer(daily_limit=5, session_cap=10 ** 6) as server:
+            client = server.client(rate_limiter=RateLimiter(rate=1000))
+            with self.assertRaises(QuotaExceededError):
+                for i in range(10):
+                    client.get_player('player{}'.format(i))
+            self.assertEqual(server.requests(), 5)
+
+    def test_client_with_an_unlimited_server(self):
+        with MockSmiteServer(daily_limit=None, session_cap=None) as server:
+            client = server.client(rate_limiter=RateLimiter(rate=1000))
+            for i in range(3):
+                client.get_player('player{}'.format(i))
+            self.assertEqual(server.counts['getplayer'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
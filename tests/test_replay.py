@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from smite import SmiteClient
+from smite.mockserver import MockSmiteServer
+from smite.replay import RecordingTransport, ReplayMissError, ReplayTransport, ResponseArchive, request_key
+
+
+class ReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.archive = ResponseArchive(os.path.join(self.directory, 'responses.db'))
+
+    def tearDown(self):
+        self.archive.close()
+        shutil.rmtree(self.directory)
+
+    def test_replay(self):
+        with MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6) as server:
+            client = server.client(transport=RecordingTransport(self.archive))
+            player = client.get_player('player')
+            friends = client.get_friends('player')
+            gods = list(client.iter_gods())
+            url = server.url
+        transport = ReplayTransport(self.archive)
+        client = SmiteClient(server.dev_id, server.auth_key, transport=transport)
+        client._BASE_URL = url
+        self.assertEqual(client.get_player('player'), player)
+        self.assertEqual(client.get_friends('player'), friends)
+        self.assertEqual(list(client.iter_gods()), gods)
+        # The recorded session creation is answered from the archive as well
+        self.assertEqual(transport.hits, 4)
+        with self.assertRaises(ReplayMissError):
+            client.get_player('unknown')
+
+    def test_request_key_leaves_out_the_signature_and_session(self):
+        first = request_key('http://api.example.com/smiteapi.svc/getplayerjson/1004/abc/session1/20170101000000/Name')
+        second = request_key('http://api.example.com/smiteapi.svc/getplayerJson/1004/def/session2/20170102000000/Name')
+        self.assertEqual(first, ('http://api.example.com/smiteapi.svc', 'getplayer', 'Name'))
+        self.assertEqual(first, second)
+        with self.assertRaises(ValueError):
+            request_key('http://api.example.com/index.html')
+
+    def test_archive_survives_reopening(self):
+        key = ('endpoint', 'getgods', '1')
+        self.archive.put(key, b'[]')
+        self.archive.close()
+        self.archive = ResponseArchive(os.path.join(self.directory, 'responses.db'))
+        self.assertIn(key, self.archive)
+        self.assertEqual(self.archive.get(key), b'[]')
+        self.assertEqual(self.archive.keys('getgods'), [key])
+
+
+if __name__ == '__main__':
+    unittest.main()
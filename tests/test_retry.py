@@ -0,0 +1,75 @@
+import http.client
+import time
+import unittest
+import urllib.error
+
+from smite import CircuitBreaker, CircuitOpenError, RetryPolicy, SmiteError
+from smite.mockserver import MockSmiteServer
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_delays(self):
+        policy = RetryPolicy(retries=4, backoff=0.5, max_backoff=1.5)
+        for attempt, cap in enumerate([0.5, 1.0, 1.5, 1.5]):
+            for _ in range(50):
+                self.assertTrue(0 <= policy.delay(attempt) <= cap)
+        self.assertIsNone(policy.delay(4))
+
+    def test_retryable_errors(self):
+        def http_error(code):
+            return urllib.error.HTTPError('url', code, 'reason', {}, None)
+
+        self.assertTrue(RetryPolicy.is_retryable(http_error(503)))
+        self.assertTrue(RetryPolicy.is_retryable(http_error(429)))
+        self.assertFalse(RetryPolicy.is_retryable(http_error(404)))
+        self.assertTrue(RetryPolicy.is_retryable(ConnectionResetError()))
+        self.assertTrue(RetryPolicy.is_retryable(http.client.IncompleteRead(b'')))
+        self.assertFalse(RetryPolicy.is_retryable(ValueError()))
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_opens_and_half_opens(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+        breaker.record_failure('endpoint')
+        breaker.before_request('endpoint')
+        breaker.record_failure('endpoint')
+        self.assertTrue(breaker.is_open('endpoint'))
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request('endpoint')
+        breaker.before_request('other')
+        time.sleep(0.15)
+        # A single trial request is let through
+        breaker.before_request('endpoint')
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request('endpoint')
+        breaker.record_success('endpoint')
+        self.assertFalse(breaker.is_open('endpoint'))
+        breaker.before_request('endpoint')
+
+    def test_failed_trial_opens_again(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+        breaker.record_failure('endpoint')
+        time.sleep(0.15)
+        breaker.before_request('endpoint')
+        breaker.record_failure('endpoint')
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request('endpoint')
+
+    def test_client_fails_fast_once_open(self):
+        with MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6) as server:
+            client = server.client(retry_policy=RetryPolicy(retries=1, backoff=0),
+                                   circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+            client.get_player('warmup')
+            server.error_rate = 1.0
+            with self.assertRaises(SmiteError):
+                client.get_player('player')
+            self.assertEqual(server.counts['getplayer'], 3)
+            with self.assertRaises(CircuitOpenError):
+                client.get_player('player')
+            self.assertEqual(server.counts['getplayer'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
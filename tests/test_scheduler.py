@@ -0,0 +1,115 @@
+import threading
+import time
+import unittest
+
+from smite import DeadlineExceededError, RequestScheduler
+from smite.mockserver import MockSmiteServer
+
+
+class RequestSchedulerTest(unittest.TestCase):
+
+    def wait_for_waiting(self, scheduler, count):
+        for _ in range(200):
+            if sum(scheduler.stats()['waiting'].values()) == count:
+                return
+            time.sleep(0.01)
+        self.fail('requests never started waiting')
+
+    def start(self, scheduler, methodname, sent):
+        def acquire():
+            scheduler.acquire(methodname)
+            sent.append(methodname)
+            scheduler.release()
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        return thread
+
+    def test_urgent_classes_are_sent_first(self):
+        scheduler = RequestScheduler(max_in_flight=1, reserved={})
+        scheduler.acquire('getplayer')
+        sent = []
+        threads = [self.start(scheduler, 'getmatchhistory', sent)]
+        self.wait_for_waiting(scheduler, 1)
+        threads.append(self.start(scheduler, 'getitems', sent))
+        self.wait_for_waiting(scheduler, 2)
+        threads.append(self.start(scheduler, 'getplayerstatus', sent))
+        self.wait_for_waiting(scheduler, 3)
+        self.assertEqual(scheduler.stats()['waiting'], {RequestScheduler.INTERACTIVE: 1, RequestScheduler.NORMAL: 1,
+                                                         RequestScheduler.BULK: 1})
+        scheduler.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sent, ['getplayerstatus', 'getitems', 'getmatchhistory'])
+        self.assertEqual(scheduler.dispatched, 4)
+
+    def test_reserved_slots_are_kept_for_urgent_classes(self):
+        scheduler = RequestScheduler(max_in_flight=4)
+        for _ in range(3):
+            scheduler.acquire('getmatchdetails')
+        with scheduler.prioritize(RequestScheduler.BULK, timeout=0.05):
+            with self.assertRaises(DeadlineExceededError):
+                scheduler.acquire('getmatchdetails')
+        scheduler.acquire('getplayer')
+        self.assertEqual(scheduler.stats()['in_flight'], 4)
+
+    def test_every_class_can_send_one_request(self):
+        scheduler = RequestScheduler(max_in_flight=1, reserved={RequestScheduler.INTERACTIVE: 1})
+        scheduler.acquire('getfriends')
+        scheduler.release()
+        self.assertEqual(scheduler.dispatched, 1)
+
+    def test_deadline_passes_while_waiting(self):
+        scheduler = RequestScheduler(max_in_flight=1)
+        scheduler.acquire('getplayer')
+        with scheduler.prioritize(RequestScheduler.INTERACTIVE, timeout=0.05):
+            with self.assertRaises(DeadlineExceededError):
+                scheduler.acquire('getplayer')
+        stats = scheduler.stats()
+        self.assertEqual((stats['expired'], stats['in_flight'], stats['waiting']), (1, 1, {}))
+        scheduler.release()
+        scheduler.acquire('getplayer')
+        self.assertEqual(scheduler.dispatched, 2)
+
+    def test_prioritize_moves_requests_ahead(self):
+        scheduler = RequestScheduler(max_in_flight=1, reserved={})
+        scheduler.acquire('getplayer')
+        sent = []
+        thread = self.start(scheduler, 'getmatchhistory', sent)
+        self.wait_for_waiting(scheduler, 1)
+
+        def acquire_urgently():
+            with scheduler.prioritize(RequestScheduler.INTERACTIVE):
+                scheduler.acquire('getfriends')
+            sent.append('getfriends')
+            scheduler.release()
+        urgent = threading.Thread(target=acquire_urgently)
+        urgent.start()
+        self.wait_for_waiting(scheduler, 2)
+        scheduler.release()
+        thread.join()
+        urgent.join()
+        self.assertEqual(sent, ['getfriends', 'getmatchhistory'])
+
+    def test_rate_spreads_requests_out(self):
+        scheduler = RequestScheduler(rate=20, burst=1)
+        started = time.monotonic()
+        for _ in range(3):
+            scheduler.acquire('getplayer')
+            scheduler.release()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_expired_request_is_not_sent(self):
+        with MockSmiteServer() as server:
+            scheduler = RequestScheduler()
+            client = server.client(scheduler=scheduler)
+            client.get_player('player')
+            sent = server.requests()
+            with scheduler.prioritize(RequestScheduler.INTERACTIVE, timeout=0):
+                with self.assertRaises(DeadlineExceededError):
+                    client.get_player('player')
+            self.assertEqual(server.requests(), sent)
+            self.assertEqual(scheduler.stats()['in_flight'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
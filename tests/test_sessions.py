@@ -0,0 +1,71 @@
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import unittest
+
+from smite import FileSessionStore, MemorySessionStore
+from smite.mockserver import MockSmiteServer
+
+
+class SessionStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'sessions.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def check_store(self, store):
+        self.assertIsNone(store.get('1004'))
+        store.set('1004', 'first', 100.0)
+        self.assertEqual(store.get('1004'), ('first', 100.0))
+        # Deleting a session that has been replaced leaves the new one
+        store.set('1004', 'second', 200.0)
+        store.delete('1004', 'first')
+        self.assertEqual(store.get('1004'), ('second', 200.0))
+        store.delete('1004', 'second')
+        self.assertIsNone(store.get('1004'))
+        with store.lock('1004'):
+            with store.lock('1004'):
+                store.set('1004', 'third', 300.0)
+        self.assertEqual(store.get('1004'), ('third', 300.0))
+
+    def test_memory_store(self):
+        self.check_store(MemorySessionStore())
+
+    def test_file_store(self):
+        self.check_store(FileSessionStore(self.path))
+        self.assertEqual(FileSessionStore(self.path).get('1004'), ('third', 300.0))
+        self.assertEqual(pickle.loads(pickle.dumps(FileSessionStore(self.path))).get('1004'), ('third', 300.0))
+
+    def test_unreadable_file_is_empty(self):
+        with open(self.path, 'w') as f:
+            f.write('{"1004": ')
+        store = FileSessionStore(self.path)
+        self.assertIsNone(store.get('1004'))
+        store.set('1004', 'session', 100.0)
+        self.assertEqual(store.get('1004'), ('session', 100.0))
+
+    def test_clients_sharing_a_file_create_one_session(self):
+        with MockSmiteServer(latency=0.05, daily_limit=10 ** 7, session_cap=10 ** 6) as server:
+            clients = [server.client(session_store=FileSessionStore(self.path)) for _ in range(4)]
+            barrier = threading.Barrier(len(clients))
+
+            def call(client):
+                barrier.wait()
+                client.get_player('player')
+
+            threads = [threading.Thread(target=call, args=(client,)) for client in clients]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(server.counts['createsession'], 1)
+            self.assertEqual(server.counts['getplayer'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
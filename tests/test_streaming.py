@@ -0,0 +1,113 @@
+import asyncio
+import json
+import random
+import unittest
+
+from smite import SessionError
+from smite.aio import AsyncSmiteClient
+from smite.mockserver import MockSmiteServer
+from smite.streaming import JSONArrayDecoder, aiter_json_array, iter_json_array
+
+_DOCUMENTS = [
+    '[]',
+    '[1]',
+    ' [ 1 , 22 , -3.5e2 ,"x,]", {"a": [1, 2]}, null, true ] ',
+    '[{"é": "ü€"}, 10000000000000, "\\"]"]',
+    json.dumps([{'Match': i, 'Name': 'ñ' * (i % 7), 'Value': i / 7} for i in range(300)]),
+]
+
+
+def _split(data, cuts):
+    cuts = sorted(cuts)
+    return [data[i:j] for i, j in zip([0] + cuts, cuts + [len(data)])]
+
+
+class JSONArrayDecoderTest(unittest.TestCase):
+
+    def check_chunks(self, document, chunks):
+        expected = json.loads(document)
+        self.assertEqual(list(iter_json_array(chunks)), expected)
+
+        async def collect():
+            async def aiter_chunks():
+                for chunk in chunks:
+                    yield chunk
+            return [element async for element in aiter_json_array(aiter_chunks())]
+
+        self.assertEqual(asyncio.run(collect()), expected)
+
+    def test_one_byte_chunks(self):
+        for document in _DOCUMENTS:
+            data = document.encode('utf-8')
+            self.check_chunks(document, [data[i:i + 1] for i in range(len(data))])
+
+    def test_random_chunks(self):
+        rng = random.Random(0)
+        for document in _DOCUMENTS:
+            data = document.encode('utf-8')
+            for _ in range(50):
+                self.check_chunks(document, _split(data, rng.sample(range(len(data) + 1), min(len(data), 6))))
+
+    def test_elements_are_handed_out_as_they_complete(self):
+        decoder = JSONArrayDecoder()
+        self.assertEqual(decoder.feed(b'[{"a": 1}, 12'), [{'a': 1}])
+        # The number may go on in the next chunk
+        self.assertEqual(decoder.feed(b'3, '), [123])
+        self.assertEqual(decoder.feed(b'"x"]'), ['x'])
+        self.assertTrue(decoder.done)
+
+    def test_other_documents_are_a_single_element(self):
+        for document in ('{"ret_msg": "error"}', '"text"', '12345'):
+            data = document.encode('utf-8')
+            self.assertEqual(list(iter_json_array([data[:3], data[3:]])), [json.loads(document)])
+        self.assertEqual(list(iter_json_array([b''])), [])
+
+    def test_reading_stops_at_the_end_of_the_array(self):
+        def chunks():
+            yield b'[1, 2]'
+            raise AssertionError('read past the end of the array')
+
+        self.assertEqual(list(iter_json_array(chunks())), [1, 2])
+
+    def test_unterminated_array_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[1, 2']))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[1, {"a": ']))
+
+
+class StreamingClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_streamed_and_decoded_responses_match(self):
+        client = self.server.client()
+        self.assertEqual(list(client.iter_gods()), client.get_gods())
+
+    def test_session_rejected_twice_raises(self):
+        self.server._getgods = lambda lang: [{'ret_msg': 'Invalid session id.'}]
+        client = self.server.client()
+        with self.assertRaises(SessionError):
+            list(client.iter_gods())
+        self.assertEqual(self.server.counts['getgods'], 2)
+        with self.assertRaises(SessionError):
+            client.get_gods()
+
+        async def iterate():
+            async_client = self.server.client(AsyncSmiteClient)
+            try:
+                return [god async for god in async_client.iter_gods()]
+            finally:
+                async_client.close()
+
+        with self.assertRaises(SessionError):
+            asyncio.run(iterate())
+
+
+if __name__ == '__main__':
+    unittest.main()
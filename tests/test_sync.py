@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from smite.mockserver import MockSmiteServer
+from smite.sync import HistorySync, WatermarkStore
+
+
+class HistorySyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockSmiteServer(daily_limit=10 ** 7, session_cap=10 ** 6)
+        self.server.start()
+        self.histories = {'first': [101, 102, 103], 'second': [102, 104]}
+        self.server._getmatchhistory = lambda player: [{'Match': match_id, 'ret_msg': None}
+                                                       for match_id in self.histories[player]]
+        self.directory = tempfile.mkdtemp()
+        self.store = WatermarkStore(os.path.join(self.directory, 'watermarks.db'))
+        self.history_sync = HistorySync(self.server.client(), self.store, batch_size=1)
+
+    def tearDown(self):
+        self.store.close()
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def sync(self):
+        return {record.match_id: record.players for record in self.history_sync.sync(['first', 'second'])}
+
+    def test_only_new_matches_are_fetched(self):
+        self.assertEqual(self.sync(), {101: ['first'], 102: ['first'], 103: ['first'], 104: ['second']})
+        self.assertEqual(self.store.watermarks(self.server.url, ['first', 'second']), {'first': 103, 'second': 104})
+        self.histories['first'].append(105)
+        self.server.counts.clear()
+        self.assertEqual(self.sync(), {105: ['first']})
+        self.assertEqual(self.server.counts['getmatchdetailsbatch'], 1)
+        self.assertEqual(self.sync(), {})
+
+    def test_shared_matches_are_fetched_once(self):
+        self.history_sync.batch_size = 2
+        self.assertEqual(self.sync(), {101: ['first'], 102: ['first', 'second'], 103: ['first'], 104: ['second']})
+        self.assertEqual(self.history_sync.stats['fetched'], 4)
+
+    def test_matches_without_details_are_fetched_by_the_next_sync(self):
+        batch = self.server._getmatchdetailsbatch
+        self.server._getmatchdetailsbatch = lambda match_ids: [row for row in batch(match_ids) if row['Match'] != 102]
+        self.assertEqual(sorted(self.sync()), [101, 103, 104])
+        self.assertEqual(self.store.watermarks(self.server.url, ['first', 'second']), {'first': 101, 'second': 101})
+        self.server._getmatchdetailsbatch = batch
+        self.assertEqual(sorted(self.sync()), [102])
+
+    def test_stopped_batch_is_synced_again(self):
+        records = self.history_sync.sync(['first', 'second'])
+        next(records)
+        records.close()
+        self.assertEqual(sorted(self.sync()), [101, 102, 103, 104])
+
+
+if __name__ == '__main__':
+    unittest.main()
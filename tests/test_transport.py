@@ -0,0 +1,53 @@
+import threading
+import unittest
+import urllib.parse
+
+from smite import ConnectionPool
+from smite.mockserver import MockSmiteServer
+
+
+class ConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockSmiteServer(latency=0.05)
+        self.server.start()
+        parts = urllib.parse.urlsplit(self.server.url)
+        self.pool = ConnectionPool(parts.hostname, parts.port, maxsize=3)
+        self.connections = []
+        new_conn = self.pool._new_conn
+
+        def counting_new_conn():
+            conn = new_conn()
+            self.connections.append(conn)
+            return conn
+
+        self.pool._new_conn = counting_new_conn
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+
+    def test_connections_are_reused(self):
+        for _ in range(5):
+            self.assertEqual(self.pool.request('/smiteapi.svc/pingjson')[0], 200)
+        self.assertEqual(len(self.connections), 1)
+
+    def test_open_connections_are_bounded(self):
+        threads = [threading.Thread(target=self.pool.request, args=('/smiteapi.svc/pingjson',)) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.connections), 3)
+        self.assertEqual(self.server.counts['ping'], 12)
+
+    def test_unread_streams_release_their_connection(self):
+        for _ in range(5):
+            self.pool.stream('/smiteapi.svc/pingjson')
+        status, reason, headers, chunks = self.pool.stream('/smiteapi.svc/pingjson')
+        self.assertEqual(b''.join(chunks)[:1], b'"')
+        self.assertEqual(self.pool.request('/smiteapi.svc/pingjson')[0], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()